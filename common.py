@@ -21,10 +21,13 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from compiler.transformer import Transformer
 from errors import InspectError
-from os import listdir, makedirs, remove
+from heapq import heapify, heappop, heappush
+from os import listdir, makedirs, remove, rename, utime
 from os.path import exists, getmtime, isdir, join, split
 from results import ConstantValueRef, LiteralSequenceRef, NameRef
 import compiler.ast
+import cPickle
+import hashlib
 
 class CommonOutput:
 
@@ -79,9 +82,142 @@ class CommonOutput:
             else:
                 remove(path)
 
+class ParseCache:
+
+    """
+    A cache of parsed source files, storing syntax trees in a directory and
+    retaining them while the source files remain unchanged.
+    """
+
+    def __init__(self, cache):
+
+        """
+        Initialise the parse cache using the directory having the name given by
+        'cache'.
+        """
+
+        self.cache = cache
+
+        if not exists(self.cache):
+            makedirs(self.cache)
+
+    def parse(self, name, filename):
+
+        """
+        Return the syntax tree and encoding of the source file having the given
+        'filename' for the module with the given 'name', parsing the file only
+        if no cached tree corresponds to the file's current contents.
+        """
+
+        cache_filename = join(self.cache, name)
+        mtime = getmtime(filename)
+        details = self.get_details(cache_filename)
+
+        # Use the cached tree if the file has not been modified since the tree
+        # was stored.
+
+        if details and details[0] == filename and details[1] == mtime:
+            result = self.get_tree(cache_filename)
+            if result:
+                return result
+
+        # Otherwise, inspect the contents of the file, using any cached tree
+        # produced for the same contents.
+
+        s = readfile(filename)
+        digest = hashlib.sha1(s).hexdigest()
+        result = None
+
+        if details and details[0] == filename and details[2] == digest:
+            result = self.get_tree(cache_filename)
+
+        if not result:
+            result = parse_source(s)
+
+        self.set_tree(cache_filename, (filename, mtime, digest), result)
+        return result
+
+    def get_details(self, cache_filename):
+
+        """
+        Return the recorded filename, modification time and digest from the
+        given 'cache_filename' or None if no usable details are available.
+        """
+
+        if not exists(cache_filename):
+            return None
+
+        f = open(cache_filename, "rb")
+        try:
+            try:
+                return cPickle.load(f)
+            except (EOFError, ValueError, cPickle.UnpicklingError):
+                return None
+        finally:
+            f.close()
+
+    def get_tree(self, cache_filename):
+
+        """
+        Return the syntax tree and encoding stored in the given
+        'cache_filename' or None if no tree can be obtained.
+        """
+
+        f = open(cache_filename, "rb")
+        try:
+            try:
+                cPickle.load(f)
+                return cPickle.load(f)
+            except (EOFError, ValueError, cPickle.UnpicklingError):
+                return None
+        finally:
+            f.close()
+
+    def set_tree(self, cache_filename, details, result):
+
+        """
+        Store in the given 'cache_filename' the file 'details' together with
+        the 'result' of parsing the file.
+        """
+
+        # Write to a temporary file and then replace any existing file so that
+        # incomplete trees are never read.
+
+        temp_filename = "%s.tmp" % cache_filename
+
+        f = open(temp_filename, "wb")
+        try:
+            try:
+                cPickle.dump(details, f, 2)
+                cPickle.dump(result, f, 2)
+
+            # Very deep trees may not be stored.
+
+            except RuntimeError:
+                f.close()
+                remove(temp_filename)
+                return
+        finally:
+            f.close()
+
+        rename(temp_filename, cache_filename)
+
+def parse_source(s):
+
+    "Parse the source code 's', returning a syntax tree and encoding."
+
+    # Use the Transformer directly to obtain encoding information.
+
+    t = Transformer()
+    astnode = t.parsesuite(s + "\n")
+    return astnode, t.encoding
+
 def copy(source, target, only_if_newer=True):
 
-    "Copy a text file from 'source' to 'target'."
+    """
+    Copy a text file from 'source' to 'target', leaving any target file with
+    identical contents unchanged.
+    """
 
     if isdir(target):
         target = join(target, split(source)[-1])
@@ -90,21 +226,111 @@ def copy(source, target, only_if_newer=True):
         return
 
     infile = open(source)
-    outfile = open(target, "w")
+    outfile = UpdatedFile(target)
 
     try:
         outfile.write(infile.read())
+    except:
+        outfile.discard()
+        raise
     finally:
         outfile.close()
         infile.close()
 
+class UpdatedFile:
+
+    """
+    A file written to a temporary location that only replaces any existing file
+    when their contents differ, thus preserving the modification times of files
+    whose contents are unchanged and avoiding unnecessary recompilation. Where
+    the contents are unchanged, a stamp file is updated instead, recording that
+    the existing file is up-to-date.
+    """
+
+    def __init__(self, filename):
+
+        "Open a temporary file for eventual writing to 'filename'."
+
+        self.filename = filename
+        self.temp_filename = "%s.tmp" % filename
+        self.f = open(self.temp_filename, "w")
+        self.softspace = 0
+
+    def write(self, s):
+
+        "Write 's' to the temporary file."
+
+        self.f.write(s)
+
+    def close(self):
+
+        "Close the file, replacing the target file if its contents differ."
+
+        if self.f.closed:
+            return
+
+        self.f.close()
+
+        if exists(self.filename) and \
+           get_file_digest(self.filename) == get_file_digest(self.temp_filename):
+
+            remove(self.temp_filename)
+            touch(get_stamp_filename(self.filename))
+        else:
+            rename(self.temp_filename, self.filename)
+
+    def discard(self):
+
+        "Close and remove the temporary file, leaving any target file unchanged."
+
+        if self.f.closed:
+            return
+
+        self.f.close()
+        remove(self.temp_filename)
+
+def get_file_digest(filename):
+
+    "Return a digest of the contents of 'filename'."
+
+    f = open(filename, "rb")
+    try:
+        return hashlib.sha1(f.read()).digest()
+    finally:
+        f.close()
+
+def get_stamp_filename(filename):
+
+    """
+    Return the name of the stamp file recording that 'filename' was found to be
+    up-to-date when it was last written.
+    """
+
+    return "%s$stamp" % filename
+
+def touch(filename):
+
+    "Create 'filename' or update its modification time."
+
+    open(filename, "a").close()
+    utime(filename, None)
+
 def is_newer(source, target):
 
-    "Return whether 'source' is newer than 'target'."
+    """
+    Return whether 'source' is newer than 'target', also considering any stamp
+    file recording that 'target' was up-to-date.
+    """
 
     if exists(target):
         target_mtime = getmtime(target)
         source_mtime = getmtime(source)
+
+        stamp_filename = get_stamp_filename(target)
+
+        if exists(stamp_filename):
+            target_mtime = max(target_mtime, getmtime(stamp_filename))
+
         return source_mtime > target_mtime
 
     return True
@@ -127,6 +353,7 @@ class CommonModule:
         # Inspection-related attributes.
 
         self.astnode = None
+        self.bound_names = set()
         self.encoding = None
         self.temp = {}
         self.lambdas = {}
@@ -163,16 +390,20 @@ class CommonModule:
 
         self.filename = filename
 
-        # Use the Transformer directly to obtain encoding information.
+        # Employ any parse cache provided by the importer so that source files
+        # are parsed once for both inspection and translation.
 
-        t = Transformer()
-        f = open(filename)
+        cache = self.importer.parse_cache
 
-        try:
-            self.astnode = t.parsesuite(f.read() + "\n")
-            self.encoding = t.encoding
-        finally:
-            f.close()
+        if cache:
+            self.astnode, self.encoding = cache.parse(self.name, filename)
+        else:
+            self.astnode, self.encoding = parse_source(readfile(filename))
+
+        # Record the names bound anywhere in the module, these potentially
+        # hiding built-in names.
+
+        self.bound_names = get_bound_names(self.astnode)
 
     # Module-relative naming.
 
@@ -267,6 +498,13 @@ class CommonModule:
             except UnicodeDecodeError:
                 pass
 
+        # Represent integers not supported by programs as long integers.
+
+        elif isinstance(value, int) and \
+             not (program_minint <= value <= program_maxint):
+
+            return long(value), "long", None
+
         return value, value.__class__.__name__, None
 
     def get_constant_reference(self, ref, value, encoding=None):
@@ -551,9 +789,69 @@ class CommonModule:
 
     def process_for_node(self, n):
 
+        "Process the for loop node 'n' using a replacement node."
+
+        self.process_structure_node(self.get_for_node(n))
+
+    def get_for_node(self, n):
+
+        """
+        Return a replacement node for the for loop node 'n'. Loops over ranges
+        are replaced by counted loops, loops over enumerations are replaced by
+        loops maintaining a counter, and all other loops employ iterators.
+
+        Only the built-in range, xrange and enumerate functions are recognised,
+        with any binding of their names in the module preventing the
+        replacement of loops by counted loops.
         """
-        Generate attribute accesses for {n.list}.__iter__ and the next method on
-        the iterator, producing a replacement node for the original.
+
+        if self.is_builtin_call(n.list, ("range", "xrange"), 1, 3):
+            return self.get_range_for_node(n)
+
+        elif self.is_builtin_call(n.list, ("enumerate",), 1, 2) and \
+             isinstance(n.assign, (compiler.ast.AssList, compiler.ast.AssTuple)) and \
+             len(n.assign.nodes) == 2:
+
+            return self.get_enumerate_for_node(n)
+
+        else:
+            return self.get_iterator_for_node(n)
+
+    def is_builtin_call(self, n, names, min_args, max_args):
+
+        """
+        Return whether 'n' invokes a built-in function having one of the given
+        'names' with between 'min_args' and 'max_args' positional arguments and
+        no other arguments.
+
+        Since module-level names may be defined after the functions using them
+        are inspected, the built-in function is only considered to be invoked
+        if its name is not bound anywhere in the module, this making the
+        outcome the same for inspection and translation. Any star import may
+        bind the name and thus also prevents the built-in function from being
+        considered.
+        """
+
+        if not isinstance(n, compiler.ast.CallFunc) or \
+           not isinstance(n.node, compiler.ast.Name) or \
+           n.node.name not in names or n.node.name in self.bound_names or \
+           "*" in self.bound_names or n.star_args or n.dstar_args:
+
+            return False
+
+        for arg in n.args:
+            if isinstance(arg, compiler.ast.Keyword):
+                return False
+
+        return min_args <= len(n.args) <= max_args
+
+    def get_range_for_node(self, n):
+
+        """
+        Return a replacement node for the for loop node 'n' iterating over a
+        range. An xrange object is created to validate the range details, but
+        the loop itself maintains the current value and remaining item count,
+        avoiding the creation of a list or iterator.
         """
 
         t0 = self.get_temporary_name()
@@ -564,85 +862,309 @@ class CommonModule:
         self.next_temporary()
         t3 = self.get_temporary_name()
         self.next_temporary()
+        t4 = self.get_temporary_name()
+        self.next_temporary()
 
         node = compiler.ast.Stmt([
 
-            # <t0> = {n.list}
-            # <t1> = <t0>.__iter__()
+            # <t0> = xrange({n.list.args})
+            # <t1> = <t0>.start
+            # <t2> = <t0>.step
+            # <t3> = <t0>.__len__()
+            # <t4> = False
 
             compiler.ast.Assign(
                 [compiler.ast.AssName(t0, "OP_ASSIGN")],
-                n.list),
+                compiler.ast.CallFunc(
+                    compiler.ast.Name("xrange"),
+                    n.list.args)),
 
             compiler.ast.Assign(
                 [compiler.ast.AssName(t1, "OP_ASSIGN")],
+                compiler.ast.Getattr(compiler.ast.Name(t0), "start")),
+
+            compiler.ast.Assign(
+                [compiler.ast.AssName(t2, "OP_ASSIGN")],
+                compiler.ast.Getattr(compiler.ast.Name(t0), "step")),
+
+            compiler.ast.Assign(
+                [compiler.ast.AssName(t3, "OP_ASSIGN")],
                 compiler.ast.CallFunc(
-                    compiler.ast.Getattr(compiler.ast.Name(t0), "__iter__"),
+                    compiler.ast.Getattr(compiler.ast.Name(t0), "__len__"),
                     [])),
 
-            # <t2> = <t1>.next
-            # try:
-            #     while True:
-            #         try:
-            #             <t3> = <t2>()
-            #         except StopIteration:
-            #             raise LoopExit
-            #         <var>... = <t3>
-            #         {n.body}
-            # except LoopExit:
-            #     {n.else_}
-            #     pass
-
             compiler.ast.Assign(
-                [compiler.ast.AssName(t2, "OP_ASSIGN")],
-                compiler.ast.Getattr(compiler.ast.Name(t1), "next")),
+                [compiler.ast.AssName(t4, "OP_ASSIGN")],
+                compiler.ast.Name("False")),
+
+            # while True:
+            #     if not <t3>:
+            #         <t4> = True
+            #         break
+            #     <var>... = <t1>
+            #     <t1> = <t1> + <t2>
+            #     <t3> = <t3> - 1
+            #     {n.body}
+
+            compiler.ast.While(
+                compiler.ast.Name("True"),
+                compiler.ast.Stmt([
+                    compiler.ast.If([(
+                        compiler.ast.Not(compiler.ast.Name(t3)),
+                        compiler.ast.Stmt([
+                            compiler.ast.Assign(
+                                [compiler.ast.AssName(t4, "OP_ASSIGN")],
+                                compiler.ast.Name("True")),
+                            compiler.ast.Break()]))],
+                        None),
+
+                    compiler.ast.Assign(
+                        [n.assign],
+                        compiler.ast.Name(t1)),
+
+                    compiler.ast.Assign(
+                        [compiler.ast.AssName(t1, "OP_ASSIGN")],
+                        compiler.ast.Add((
+                            compiler.ast.Name(t1),
+                            compiler.ast.Name(t2)))),
+
+                    compiler.ast.Assign(
+                        [compiler.ast.AssName(t3, "OP_ASSIGN")],
+                        compiler.ast.Sub((
+                            compiler.ast.Name(t3),
+                            compiler.ast.Const(1)))),
+                    n.body]),
+                None)
+            ])
 
-            # try:
+        # if <t4>:
+        #     {n.else_}
 
-            compiler.ast.TryExcept(
+        if n.else_:
+            node.nodes.append(
+                compiler.ast.If([(
+                    compiler.ast.Name(t4),
+                    n.else_)],
+                    None))
 
-                # while True:
+        return node
 
-                compiler.ast.While(
-                    compiler.ast.Name("True"),
-                    compiler.ast.Stmt([
+    def get_enumerate_for_node(self, n):
 
-                        # try:
+        """
+        Return a replacement node for the for loop node 'n' iterating over an
+        enumeration. The enumerated collection is iterated over directly, with
+        the position being maintained by the loop.
+        """
 
-                        compiler.ast.TryExcept(
+        t0 = self.get_temporary_name()
+        self.next_temporary()
+        t1 = self.get_temporary_name()
+        self.next_temporary()
 
-                            # <t3> = <t2>()
+        position, item = n.assign.nodes
 
-                            compiler.ast.Assign(
-                                [compiler.ast.AssName(t3, "OP_ASSIGN")],
-                                compiler.ast.CallFunc(
-                                    compiler.ast.Name(t2),
-                                    [])),
+        # <t0> = {start} or 0
+
+        if len(n.list.args) > 1:
+            start = n.list.args[1]
+        else:
+            start = compiler.ast.Const(0)
+
+        # for <t1> in {n.list.args[0]}:
+        #     {position} = <t0>
+        #     <t0> = <t0> + 1
+        #     {item} = <t1>
+        #     {n.body}
+        # else:
+        #     {n.else_}
+
+        return compiler.ast.Stmt([
+            compiler.ast.Assign(
+                [compiler.ast.AssName(t0, "OP_ASSIGN")],
+                start),
+
+            self.get_for_node(compiler.ast.For(
+                compiler.ast.AssName(t1, "OP_ASSIGN"),
+                n.list.args[0],
+                compiler.ast.Stmt([
+                    compiler.ast.Assign(
+                        [position],
+                        compiler.ast.Name(t0)),
+
+                    compiler.ast.Assign(
+                        [compiler.ast.AssName(t0, "OP_ASSIGN")],
+                        compiler.ast.Add((
+                            compiler.ast.Name(t0),
+                            compiler.ast.Const(1)))),
+
+                    compiler.ast.Assign(
+                        [item],
+                        compiler.ast.Name(t1)),
+                    n.body]),
+                n.else_))
+            ])
+
+    def get_iterator_for_node(self, n):
+
+        """
+        Return a replacement node for the for loop node 'n', generating
+        attribute accesses for {n.list}.__iter__ and the next method on the
+        iterator.
+
+        Iterators providing a __hasnext__ method are advanced without handling
+        exceptions for each item, with only other iterators relying on the
+        StopIteration exception to indicate that no more items are available.
+        """
+
+        t0 = self.get_temporary_name()
+        self.next_temporary()
+        t1 = self.get_temporary_name()
+        self.next_temporary()
+        t2 = self.get_temporary_name()
+        self.next_temporary()
+        t3 = self.get_temporary_name()
+        self.next_temporary()
+        t4 = self.get_temporary_name()
+        self.next_temporary()
+        t5 = self.get_temporary_name()
+        self.next_temporary()
+
+        node = compiler.ast.Stmt([
 
-                        # except StopIteration:
-                        #     raise LoopExit
+            # <t0> = {n.list}
+            # <t1> = <t0>.__iter__()
+
+            compiler.ast.Assign(
+                [compiler.ast.AssName(t0, "OP_ASSIGN")],
+                n.list),
+
+            compiler.ast.Assign(
+                [compiler.ast.AssName(t1, "OP_ASSIGN")],
+                compiler.ast.CallFunc(
+                    compiler.ast.Getattr(compiler.ast.Name(t0), "__iter__"),
+                    [])),
 
-                            [(compiler.ast.Name("StopIteration"), None,
-                              compiler.ast.Raise(compiler.ast.Name("LoopExit")))],
-                            None),
+            # <t2> = <t1>.next
+            # <t3> = getattr(<t1>, "__hasnext__", None) is not None
+            # <t4> = False
 
-                        # <var>... = <t3>
+            compiler.ast.Assign(
+                [compiler.ast.AssName(t2, "OP_ASSIGN")],
+                compiler.ast.Getattr(compiler.ast.Name(t1), "next")),
 
-                        compiler.ast.Assign(
-                            [n.assign],
-                            compiler.ast.Name(t3)),
-                        n.body]),
-                    None),
+            compiler.ast.Assign(
+                [compiler.ast.AssName(t3, "OP_ASSIGN")],
+                compiler.ast.Compare(
+                    compiler.ast.CallFunc(
+                        compiler.ast.Name("getattr"),
+                        [compiler.ast.Name(t1), compiler.ast.Const("__hasnext__"),
+                         compiler.ast.Name("None")]),
+                    [("is not", compiler.ast.Name("None"))])),
 
-            # except LoopExit:
-            #     {n.else_}
-            #     pass
+            compiler.ast.Assign(
+                [compiler.ast.AssName(t4, "OP_ASSIGN")],
+                compiler.ast.Name("False")),
+
+            # while True:
+            #     if <t3>:
+            #         if not <t1>.__hasnext__():
+            #             <t4> = True
+            #             break
+            #         <t5> = <t2>()
+            #     else:
+            #         try:
+            #             <t5> = <t2>()
+            #         except StopIteration:
+            #             <t4> = True
+            #         if <t4>:
+            #             break
+            #     <var>... = <t5>
+            #     {n.body}
+
+            compiler.ast.While(
+                compiler.ast.Name("True"),
+                compiler.ast.Stmt([
+
+                    # if <t3>:
+
+                    compiler.ast.If([(
+                        compiler.ast.Name(t3),
+                        compiler.ast.Stmt([
+
+                            # if not <t1>.__hasnext__():
+                            #     <t4> = True
+                            #     break
+
+                            compiler.ast.If([(
+                                compiler.ast.Not(
+                                    compiler.ast.CallFunc(
+                                        compiler.ast.Getattr(compiler.ast.Name(t1), "__hasnext__"),
+                                        [])),
+                                compiler.ast.Stmt([
+                                    compiler.ast.Assign(
+                                        [compiler.ast.AssName(t4, "OP_ASSIGN")],
+                                        compiler.ast.Name("True")),
+                                    compiler.ast.Break()]))],
+                                None),
+
+                            # <t5> = <t2>()
 
-                [(compiler.ast.Name("LoopExit"), None, n.else_ or compiler.ast.Pass())],
+                            compiler.ast.Assign(
+                                [compiler.ast.AssName(t5, "OP_ASSIGN")],
+                                compiler.ast.CallFunc(
+                                    compiler.ast.Name(t2),
+                                    []))]))],
+
+                    # else:
+
+                        compiler.ast.Stmt([
+
+                            # try:
+                            #     <t5> = <t2>()
+                            # except StopIteration:
+                            #     <t4> = True
+
+                            compiler.ast.TryExcept(
+                                compiler.ast.Assign(
+                                    [compiler.ast.AssName(t5, "OP_ASSIGN")],
+                                    compiler.ast.CallFunc(
+                                        compiler.ast.Name(t2),
+                                        [])),
+                                [(compiler.ast.Name("StopIteration"), None,
+                                  compiler.ast.Assign(
+                                    [compiler.ast.AssName(t4, "OP_ASSIGN")],
+                                    compiler.ast.Name("True")))],
+                                None),
+
+                            # if <t4>:
+                            #     break
+
+                            compiler.ast.If([(
+                                compiler.ast.Name(t4),
+                                compiler.ast.Break())],
+                                None)])),
+
+                    # <var>... = <t5>
+
+                    compiler.ast.Assign(
+                        [n.assign],
+                        compiler.ast.Name(t5)),
+                    n.body]),
                 None)
             ])
 
-        self.process_structure_node(node)
+        # if <t4>:
+        #     {n.else_}
+
+        if n.else_:
+            node.nodes.append(
+                compiler.ast.If([(
+                    compiler.ast.Name(t4),
+                    n.else_)],
+                    None))
+
+        return node
 
     def process_literal_sequence_node(self, n, name, ref, cls):
 
@@ -953,6 +1475,38 @@ def get_argnames(args):
             l.append(arg)
     return l
 
+def get_bound_names(node, names=None):
+
+    """
+    Return the names bound anywhere within 'node', these being assigned names,
+    definition names, parameter names and imported names. Star imports, which
+    may bind any name, are indicated by the special name "*".
+    """
+
+    if names is None:
+        names = set()
+
+    if isinstance(node, compiler.ast.AssName):
+        names.add(node.name)
+
+    elif isinstance(node, (compiler.ast.Class, compiler.ast.Function)):
+        names.add(node.name)
+
+    elif isinstance(node, (compiler.ast.From, compiler.ast.Import)):
+        for name, alias in node.names:
+            if name == "*":
+                names.add(name)
+            else:
+                names.add(alias or name.split(".")[0])
+
+    if isinstance(node, (compiler.ast.Function, compiler.ast.Lambda)):
+        names.update(get_argnames(node.argnames))
+
+    for child in node.getChildNodes():
+        get_bound_names(child, names)
+
+    return names
+
 def get_names_from_nodes(nodes):
 
     """
@@ -1130,21 +1684,12 @@ def order_dependencies(all_depends):
     # processed) and putting them at the start of the list.
 
     ordered = []
+    remove_dependencies(get_exposed_items(usage), all_depends, usage, ordered)
 
-    while usage:
-        have_next = False
-
-        for key, n in usage.items():
-
-            # Add items needed by no other items to the ordering.
-
-            if not n:
-                remove_dependency(key, all_depends, usage, ordered)
-                have_next = True
-
-        if not have_next:
-            raise ValueError, usage
+    if usage:
+        raise ValueError, usage
 
+    ordered.reverse()
     return ordered
 
 def order_dependencies_partial(all_depends):
@@ -1155,42 +1700,44 @@ def order_dependencies_partial(all_depends):
     on. Where cycles exist, they will be broken and a partial ordering returned.
     """
 
-    usage = init_reverse_dependencies(all_depends)
-
-    # Duplicate the dependencies for subsequent modification.
+    # Duplicate the dependencies for subsequent modification, ignoring items
+    # that depend on themselves.
 
     new_depends = {}
     for key, values in all_depends.items():
         new_depends[key] = set(values)
+        new_depends[key].discard(key)
 
     all_depends = new_depends
+    usage = init_reverse_dependencies(all_depends)
 
     # Produce an ordering by obtaining exposed items (required by items already
     # processed) and putting them at the start of the list.
 
     ordered = []
+    exposed = get_exposed_items(usage)
 
-    while usage:
-        least = None
-        least_key = None
+    while True:
+        remove_dependencies(exposed, all_depends, usage, ordered)
 
-        for key, n in usage.items():
+        if not usage:
+            break
 
-            # Add items needed by no other items to the ordering.
+        # When breaking cycles, choose the least used item involved in a cycle,
+        # employing the first such item in a consistent order.
 
-            if not n:
-                remove_dependency(key, all_depends, usage, ordered)
-                least = 0
-
-            # When breaking cycles, note the least used items.
+        least_key = None
+        least = None
 
-            elif least is None or len(n) < least:
-                least_key = key
-                least = len(n)
+        for cycle in get_cycles(all_depends, usage):
+            for key in cycle:
+                if least is None or len(usage[key]) < least:
+                    least_key = key
+                    least = len(usage[key])
 
-        if least:
-            transfer_dependencies(least_key, all_depends, usage, ordered)
+        exposed = transfer_dependencies(least_key, all_depends, usage, ordered)
 
+    ordered.reverse()
     return ordered
 
 def init_reverse_dependencies(all_depends):
@@ -1215,12 +1762,144 @@ def init_reverse_dependencies(all_depends):
 
     return usage
 
+def get_exposed_items(usage):
+
+    "Return the items in 'usage' needed by no other items, in order."
+
+    exposed = []
+
+    for key, n in usage.items():
+        if not n:
+            exposed.append(key)
+
+    exposed.sort()
+    return exposed
+
+def get_cycles(all_depends, usage=None):
+
+    """
+    Return the cycles in the 'all_depends' mapping, each cycle being a sorted
+    list of items, with the cycles themselves sorted. If 'usage' is specified,
+    only items recorded in 'usage' are considered.
+
+    Cycles are found as the strongly connected components of the dependency
+    graph, with items only depending on themselves also forming cycles.
+    """
+
+    if usage is None:
+        usage = init_reverse_dependencies(all_depends)
+
+    def get_depends(key):
+        depends = []
+        for depend in all_depends.get(key) or []:
+            if depend in usage:
+                depends.append(depend)
+        depends.sort()
+        return depends
+
+    keys = usage.keys()
+    keys.sort()
+
+    # Record the visiting order of each item and the earliest item reachable
+    # from it, visiting the dependencies of each item using an explicit stack.
+
+    indexes = {}
+    lowlinks = {}
+    visited = []
+    on_visited = set()
+    cycles = []
+
+    for root in keys:
+        if indexes.has_key(root):
+            continue
+
+        indexes[root] = lowlinks[root] = len(indexes)
+        visited.append(root)
+        on_visited.add(root)
+        stack = [(root, iter(get_depends(root)))]
+
+        while stack:
+            key, depends = stack[-1]
+            descended = False
+
+            for depend in depends:
+                if not indexes.has_key(depend):
+                    indexes[depend] = lowlinks[depend] = len(indexes)
+                    visited.append(depend)
+                    on_visited.add(depend)
+                    stack.append((depend, iter(get_depends(depend))))
+                    descended = True
+                    break
+
+                elif depend in on_visited:
+                    lowlinks[key] = min(lowlinks[key], indexes[depend])
+
+            if descended:
+                continue
+
+            stack.pop()
+
+            if stack:
+                parent = stack[-1][0]
+                lowlinks[parent] = min(lowlinks[parent], lowlinks[key])
+
+            # Collect the items of any component rooted at this item.
+
+            if lowlinks[key] == indexes[key]:
+                component = []
+
+                while True:
+                    item = visited.pop()
+                    on_visited.remove(item)
+                    component.append(item)
+                    if item == key:
+                        break
+
+                if len(component) > 1 or key in (all_depends.get(key) or []):
+                    component.sort()
+                    cycles.append(component)
+
+    cycles.sort()
+    return cycles
+
+def remove_dependencies(exposed, all_depends, usage, ordered):
+
+    """
+    Remove the 'exposed' items, found in 'all_depends', from 'usage', adding
+    them to the 'ordered' collection of dependencies together with any items
+    exposed as a consequence.
+
+    Items are removed in a consistent order, visiting items in sorted order and
+    visiting newly exposed items in the same pass if they follow the removed
+    item in this order, or in a subsequent pass otherwise.
+    """
+
+    current = list(exposed)
+    heapify(current)
+    following = []
+
+    while current:
+        key = heappop(current)
+
+        for depend in remove_dependency(key, all_depends, usage, ordered):
+            if depend > key:
+                heappush(current, depend)
+            else:
+                following.append(depend)
+
+        # Start a new pass with any items preceding those removed.
+
+        if not current:
+            current = following
+            heapify(current)
+            following = []
+
 def transfer_dependencies(key, all_depends, usage, ordered):
 
     """
     Transfer items needed by 'key' to those items needing 'key', found using
-    'all_depends', and updating 'usage'. Insert 'key' into the 'ordered'
-    collection of dependencies.
+    'all_depends', and updating 'usage'. Add 'key' to the 'ordered' collection
+    of dependencies, returning any items exposed as a consequence.
 
     If "A is needed by X" and "B is needed by A", then transferring items needed
     by A will cause "B is needed by X" to be recorded as a consequence.
@@ -1230,50 +1909,52 @@ def transfer_dependencies(key, all_depends, usage, ordered):
     "X needs B".
     """
 
-    ordered.insert(0, key)
+    ordered.append(key)
 
-    needing = usage[key]                        # A is needed by X
-    needed = all_depends.get(key)               # A needs B
+    needing = usage.pop(key)                    # A is needed by X
+    needed = all_depends.pop(key, None) or set() # A needs B
 
-    if needing:
-        for depend in needing:
-            l = all_depends.get(depend)
-            if not l:
-                continue
+    needing.discard(key)
+    needed.discard(key)
 
-            l.remove(key)                       # X needs (A)
+    for depend in needing:
+        l = all_depends.get(depend)
+        if l is None:
+            continue
 
-            if needed:
-                l.update(needed)                # X needs B...
+        l.discard(key)                          # X needs (A)
+        l.update(needed)                        # X needs B...
 
-                # Prevent self references.
+        # Prevent self references.
 
-                if depend in needed:
-                    l.remove(depend)
+        l.discard(depend)
 
-    if needed:
-        for depend in needed:
-            l = usage.get(depend)
-            if not l:
-                continue
+    exposed = []
 
-            l.remove(key)                       # B is needed by (A)
-            l.update(needing)                   # B is needed by X...
+    for depend in needed:
+        l = usage.get(depend)
+        if l is None:
+            continue
 
-            # Prevent self references.
+        l.discard(key)                          # B is needed by (A)
+        l.update(needing)                       # B is needed by X...
 
-            if depend in needing:
-                l.remove(depend)
+        # Prevent self references.
 
-    if needed:
-        del all_depends[key]
-    del usage[key]
+        l.discard(depend)
+
+        if not l:
+            exposed.append(depend)
+
+    exposed.sort()
+    return exposed
 
 def remove_dependency(key, all_depends, usage, ordered):
 
     """
-    Remove 'key', found in 'all_depends', from 'usage', inserting it into the
-    'ordered' collection of dependencies.
+    Remove 'key', found in 'all_depends', from 'usage', adding it to the
+    'ordered' collection of dependencies, and returning any items exposed as a
+    consequence.
 
     Given that 'usage' for a given key A would indicate that "A needs <nothing>"
     upon removing A from 'usage', the outcome is that all keys needing A will
@@ -1283,17 +1964,22 @@ def remove_dependency(key, all_depends, usage, ordered):
     as a consequence.
     """
 
-    ordered.insert(0, key)
+    ordered.append(key)
 
     depends = all_depends.get(key)
+    exposed = []
 
     # Reduce usage of the referenced items.
 
     if depends:
         for depend in depends:
-            usage[depend].remove(key)
+            n = usage[depend]
+            n.remove(key)
+            if not n:
+                exposed.append(depend)
 
     del usage[key]
+    return exposed
 
 # General input/output.
 
@@ -1327,6 +2013,20 @@ def sorted_output(x):
     x.sort()
     return ", ".join(x)
 
+def get_string_hash(s):
+
+    """
+    Return the hash value of the byte string 's', matching the value computed
+    for strings by the native str_hash function.
+    """
+
+    h = 2166136261
+
+    for c in s:
+        h = ((h ^ ord(c)) * 16777619) & 0xffffffff
+
+    return h & 0x1fffffff
+
 def get_string_details(literals, encoding):
 
     """
@@ -1619,6 +2319,12 @@ def get_builtin_class(name):
 
 predefined_constants = "False", "None", "NotImplemented", "True"
 
+# The limits of integers represented directly by programs, these employing
+# tagged 64-bit values. Other integers are represented by long integers.
+
+program_maxint = 2 ** 61 - 1
+program_minint = -2 ** 61
+
 privileged_attributes = [
     "__get_single_item_unchecked__",
     ]
@@ -28,9 +28,19 @@ from encoders import encode_access_location, encode_alias_location, \
                      encode_usage, get_kinds, \
                      test_label_for_kind, test_label_for_type
 from errors import DeduceError
-from os.path import join
-from referencing import combine_types, is_single_class_type, separate_types, \
-                        Reference
+from os import rename
+from os.path import exists, getmtime, join
+from referencing import combine_types, decode_reference_record, \
+                        encode_reference_record, is_single_class_type, \
+                        separate_types, Reference
+import hashlib
+import marshal
+
+# The schema version of the recorded deductions, to be incremented when the
+# format of the deductions changes.
+
+deductions_schema = 1
+deductions_header = "LPLD%04d" % deductions_schema
 
 class Deducer(CommonOutput):
 
@@ -55,6 +65,27 @@ class Deducer(CommonOutput):
         self.init_descendants()
         self.init_special_attributes()
 
+        # Numbers for class and module names, with sets of types represented as
+        # integers having the bits for each type's number set.
+
+        self.type_numbers = {}
+        self.type_names = []
+        self.descendant_bits = {}
+        self.init_type_numbers()
+
+        # Deductions recorded for each module by a previous run, the modules
+        # affected by program changes since that run, and the modules selected
+        # for deduction. Where all modules are to be deduced, no modules are
+        # indicated as affected or selected.
+
+        self.previous = {}
+        self.affected = None
+        self.selected = None
+
+        # Map paths to modules.
+
+        self.path_modules = {}
+
         # Map locations to usage in order to determine specific types.
 
         self.location_index = {}
@@ -89,7 +120,7 @@ class Deducer(CommonOutput):
 
         self.assigned_attrs = {}
 
-        # Map usage observations to objects.
+        # Map usage observations to objects, recorded as type bits.
 
         self.attr_class_types = {}
         self.attr_instance_types = {}
@@ -152,14 +183,28 @@ class Deducer(CommonOutput):
         self.reference_test_types = {}
         self.reference_test_accessor_type = {}
 
+        # Access locations supplied by return values from unselected modules.
+
+        self.external_alias_accesses = set()
+
+        # Dependencies introduced by each module.
+
+        self.module_dependencies = {}
+
+        # Output produced for each location.
+
+        self.outputs = {}
+
         # The processing workflow itself.
 
+        self.init_previous_deductions()
         self.init_usage_index()
         self.init_attr_type_indexes()
         self.init_combined_attribute_index()
         self.init_accessors()
         self.init_accesses()
         self.init_aliases()
+        self.merge_previous_deductions()
         self.modify_mutated_attributes()
         self.identify_references()
         self.classify_accessors()
@@ -178,6 +223,8 @@ class Deducer(CommonOutput):
         self.write_accessors()
         self.write_accesses()
         self.write_access_plans()
+        self.write_outputs()
+        self.write_deductions()
 
     def write_mutations(self):
 
@@ -252,91 +299,82 @@ class Deducer(CommonOutput):
         location " " locations
         """
 
-        f_type_summary = open(join(self.output, "type_summary"), "w")
-        f_types = open(join(self.output, "types"), "w")
-        f_warnings = open(join(self.output, "type_warnings"), "w")
-        f_guards = open(join(self.output, "guards"), "w")
-        f_aliases = open(join(self.output, "aliases"), "w")
+        f_type_summary = self.get_output("type_summary")
+        f_types = self.get_output("types")
+        f_warnings = self.get_output("type_warnings")
+        f_guards = self.get_output("guards")
+        f_aliases = self.get_output("aliases")
 
-        try:
-            locations = self.accessor_class_types.keys()
-            locations.sort()
+        for location in self.get_selected_locations(self.accessor_class_types):
+            for f in (f_type_summary, f_types, f_warnings, f_guards):
+                f.set_location(location)
 
-            for location in locations:
-                constrained = location in self.accessor_constrained
-
-                # Accessor information.
+            constrained = location in self.accessor_constrained
 
-                class_types = self.accessor_class_types[location]
-                instance_types = self.accessor_instance_types[location]
-                module_types = self.accessor_module_types[location]
+            # Accessor information.
 
-                general_class_types = self.accessor_general_class_types[location]
-                general_instance_types = self.accessor_general_instance_types[location]
-                general_module_types = self.accessor_general_module_types[location]
+            class_types = self.accessor_class_types[location]
+            instance_types = self.accessor_instance_types[location]
+            module_types = self.accessor_module_types[location]
 
-                all_types = self.accessor_all_types[location]
-                all_general_types = self.accessor_all_general_types[location]
+            general_class_types = self.accessor_general_class_types[location]
+            general_instance_types = self.accessor_general_instance_types[location]
+            general_module_types = self.accessor_general_module_types[location]
 
-                if class_types:
-                    print >>f_types, encode_location(location), encode_constrained(constrained), "<class>", \
-                        sorted_output(general_class_types), len(class_types)
+            all_types = self.accessor_all_types[location]
+            all_general_types = self.accessor_all_general_types[location]
 
-                if instance_types:
-                    print >>f_types, encode_location(location), encode_constrained(constrained), "<instance>", \
-                        sorted_output(general_instance_types), len(instance_types)
+            if class_types:
+                print >>f_types, encode_location(location), encode_constrained(constrained), "<class>", \
+                    sorted_output(general_class_types), len(class_types)
 
-                if module_types:
-                    print >>f_types, encode_location(location), encode_constrained(constrained), "<module>", \
-                        sorted_output(general_module_types), len(module_types)
+            if instance_types:
+                print >>f_types, encode_location(location), encode_constrained(constrained), "<instance>", \
+                    sorted_output(general_instance_types), len(instance_types)
 
-                if not all_types:
-                    print >>f_types, encode_location(location), "deduced", "<>", 0
-                    attrnames = list(self.location_index[location])
-                    attrnames.sort()
-                    print >>f_warnings, encode_location(location), "; ".join(map(encode_usage, attrnames))
+            if module_types:
+                print >>f_types, encode_location(location), encode_constrained(constrained), "<module>", \
+                    sorted_output(general_module_types), len(module_types)
 
-                guard_test = self.accessor_guard_tests.get(location)
-                if guard_test:
-                    guard_test_type, guard_test_arg = guard_test
+            if not all_types:
+                print >>f_types, encode_location(location), "deduced", "<>", 0
+                attrnames = list(self.location_index[location])
+                attrnames.sort()
+                print >>f_warnings, encode_location(location), "; ".join(map(encode_usage, attrnames))
 
-                # Write specific type guard details.
+            guard_test = self.accessor_guard_tests.get(location)
+            if guard_test:
+                guard_test_type, guard_test_arg = guard_test
 
-                if guard_test and guard_test_type == "specific":
-                    print >>f_guards, encode_location(location), "-".join(guard_test), \
-                        first(get_kinds(all_types)), \
-                        sorted_output(all_types)
+            # Write specific type guard details.
 
-                # Write common type guard details.
+            if guard_test and guard_test_type == "specific":
+                print >>f_guards, encode_location(location), "-".join(guard_test), \
+                    first(get_kinds(all_types)), \
+                    sorted_output(all_types)
 
-                elif guard_test and guard_test_type == "common":
-                    print >>f_guards, encode_location(location), "-".join(guard_test), \
-                        first(get_kinds(all_general_types)), \
-                        sorted_output(all_general_types)
+            # Write common type guard details.
 
-                print >>f_type_summary, encode_location(location), encode_constrained(constrained), \
-                    guard_test and "-".join(guard_test) or "unguarded", sorted_output(all_general_types), len(all_types)
+            elif guard_test and guard_test_type == "common":
+                print >>f_guards, encode_location(location), "-".join(guard_test), \
+                    first(get_kinds(all_general_types)), \
+                    sorted_output(all_general_types)
 
-            # Aliases are visited separately from accessors, even though they
-            # are often the same thing.
+            print >>f_type_summary, encode_location(location), encode_constrained(constrained), \
+                guard_test and "-".join(guard_test) or "unguarded", sorted_output(all_general_types), len(all_types)
 
-            locations = self.alias_index.keys()
-            locations.sort()
+        # Aliases are visited separately from accessors, even though they are
+        # often the same thing.
 
-            for location in locations:
-                accesses = []
-                for access_location in self.alias_index[location]:
-                    invocation = access_location in self.reference_invocations
-                    accesses.append(encode_alias_location(access_location, invocation))
-                invocation = location in self.reference_invocations
-                print >>f_aliases, encode_alias_location(location, invocation), ", ".join(accesses)
+        for location in self.get_selected_locations(self.alias_index):
+            f_aliases.set_location(location)
 
-        finally:
-            f_type_summary.close()
-            f_types.close()
-            f_warnings.close()
-            f_guards.close()
-            f_aliases.close()
+            accesses = []
+            for access_location in self.alias_index[location]:
+                invocation = access_location in self.reference_invocations
+                accesses.append(encode_alias_location(access_location, invocation))
+            invocation = location in self.reference_invocations
+            print >>f_aliases, encode_alias_location(location, invocation), ", ".join(accesses)
 
     def write_accesses(self):
 
@@ -388,67 +426,59 @@ class Deducer(CommonOutput):
         location
         """
 
-        f_attr_summary = open(join(self.output, "attribute_summary"), "w")
-        f_attrs = open(join(self.output, "attributes"), "w")
-        f_tests = open(join(self.output, "tests"), "w")
-        f_warnings = open(join(self.output, "attribute_warnings"), "w")
-        f_unsuitable = open(join(self.output, "invocation_warnings"), "w")
+        f_attr_summary = self.get_output("attribute_summary")
+        f_attrs = self.get_output("attributes")
+        f_tests = self.get_output("tests")
+        f_warnings = self.get_output("attribute_warnings")
+        f_unsuitable = self.get_output("invocation_warnings")
 
-        try:
-            locations = self.referenced_attrs.keys()
-            locations.sort()
-
-            for location in locations:
-                constrained = location in self.access_constrained
+        for location in self.get_selected_locations(self.referenced_attrs):
+            for f in (f_attr_summary, f_attrs, f_tests, f_warnings, f_unsuitable):
+                f.set_location(location)
 
-                # Attribute information, both name-based and anonymous.
+            constrained = location in self.access_constrained
 
-                referenced_attrs = self.referenced_attrs[location]
+            # Attribute information, both name-based and anonymous.
 
-                if referenced_attrs:
-                    attrname = location.get_attrname()
+            referenced_attrs = self.referenced_attrs[location]
 
-                    all_accessed_attrs = list(set(self.reference_all_attrs[location]))
-                    all_accessed_attrs.sort()
+            if referenced_attrs:
+                attrname = location.get_attrname()
 
-                    for attrtype, attrs in self.get_referenced_attrs(location):
-                        print >>f_attrs, encode_access_location(location), encode_constrained(constrained), attrtype, sorted_output(attrs)
+                all_accessed_attrs = list(set(self.reference_all_attrs[location]))
+                all_accessed_attrs.sort()
 
-                    test_type = self.reference_test_types.get(location)
+                for attrtype, attrs in self.get_referenced_attrs(location):
+                    print >>f_attrs, encode_access_location(location), encode_constrained(constrained), attrtype, sorted_output(attrs)
 
-                    # Write the need to test at run time.
+                test_type = self.reference_test_types.get(location)
 
-                    if test_type[0] == "validate":
-                        print >>f_tests, encode_access_location(location), "-".join(test_type)
+                # Write the need to test at run time.
 
-                    # Write any type checks for anonymous accesses.
+                if test_type[0] == "validate":
+                    print >>f_tests, encode_access_location(location), "-".join(test_type)
 
-                    elif test_type and self.reference_test_accessor_type.get(location):
-                        print >>f_tests, encode_access_location(location), "-".join(test_type), \
-                            sorted_output(all_accessed_attrs), \
-                            self.reference_test_accessor_type[location]
+                # Write any type checks for anonymous accesses.
 
-                    print >>f_attr_summary, encode_access_location(location), encode_constrained(constrained), \
-                        test_type and "-".join(test_type) or "untested", sorted_output(all_accessed_attrs)
+                elif test_type and self.reference_test_accessor_type.get(location):
+                    print >>f_tests, encode_access_location(location), "-".join(test_type), \
+                        sorted_output(all_accessed_attrs), \
+                        self.reference_test_accessor_type[location]
 
-                    # Write details of potentially unsuitable invocation
-                    # occurrences.
+                print >>f_attr_summary, encode_access_location(location), encode_constrained(constrained), \
+                    test_type and "-".join(test_type) or "untested", sorted_output(all_accessed_attrs)
 
-                    unsuitable = self.reference_invocations_unsuitable.get(location)
-                    if unsuitable:
-                        unsuitable = map(str, unsuitable)
-                        unsuitable.sort()
-                        print >>f_unsuitable, encode_access_location(location), ", ".join(unsuitable)
+                # Write details of potentially unsuitable invocation
+                # occurrences.
 
-                else:
-                    print >>f_warnings, encode_access_location(location)
+                unsuitable = self.reference_invocations_unsuitable.get(location)
+                if unsuitable:
+                    unsuitable = map(str, unsuitable)
+                    unsuitable.sort()
+                    print >>f_unsuitable, encode_access_location(location), ", ".join(unsuitable)
 
-        finally:
-            f_attr_summary.close()
-            f_attrs.close()
-            f_tests.close()
-            f_warnings.close()
-            f_unsuitable.close()
+            else:
+                print >>f_warnings, encode_access_location(location)
 
     def write_access_plans(self):
 
@@ -470,47 +500,38 @@ class Deducer(CommonOutput):
         access attribute) or "object" (obtain attribute directly from accessor).
         """
 
-        f_attrs = open(join(self.output, "attribute_plans"), "w")
-
-        try:
-            locations = self.access_plans.keys()
-            locations.sort()
-
-            for location in locations:
-                name, test, test_type, base, \
-                    traversed, traversal_modes, attrnames, \
-                    context, context_test, \
-                    first_method, final_method, \
-                    attr, accessor_kinds = self.access_plans[location]
-
-                print >>f_attrs, encode_access_location(location), \
-                                 name or "{}", \
-                                 test and "-".join(test) or "{}", \
-                                 test_type or "{}", \
-                                 base or "{}", \
-                                 ".".join(traversed) or "{}", \
-                                 ".".join(traversal_modes) or "{}", \
-                                 ".".join(attrnames) or "{}", \
-                                 context, context_test, \
-                                 first_method, final_method, attr or "{}", \
-                                 ",".join(accessor_kinds)
-
-        finally:
-            f_attrs.close()
-
-        f = open(join(self.output, "instruction_plans"), "w")
-        try:
-            access_instructions = self.access_instructions.items()
-            access_instructions.sort()
+        f_attrs = self.get_output("attribute_plans")
 
-            for location, instructions in access_instructions:
-                print >>f, encode_access_location(location), "..."
-                for instruction in instructions:
-                    print >>f, encode_instruction(instruction)
-                print >>f
+        for location in self.get_selected_locations(self.access_plans):
+            f_attrs.set_location(location)
 
-        finally:
-            f.close()
+            name, test, test_type, base, \
+                traversed, traversal_modes, attrnames, \
+                context, context_test, \
+                first_method, final_method, \
+                attr, accessor_kinds = self.access_plans[location]
+
+            print >>f_attrs, encode_access_location(location), \
+                             name or "{}", \
+                             test and "-".join(test) or "{}", \
+                             test_type or "{}", \
+                             base or "{}", \
+                             ".".join(traversed) or "{}", \
+                             ".".join(traversal_modes) or "{}", \
+                             ".".join(attrnames) or "{}", \
+                             context, context_test, \
+                             first_method, final_method, attr or "{}", \
+                             ",".join(accessor_kinds)
+
+        f = self.get_output("instruction_plans")
+
+        for location in self.get_selected_locations(self.access_instructions):
+            f.set_location(location)
+
+            print >>f, encode_access_location(location), "..."
+            for instruction in self.access_instructions[location]:
+                print >>f, encode_instruction(instruction)
+            print >>f
 
     def classify_accessors(self):
 
@@ -519,7 +540,7 @@ class Deducer(CommonOutput):
         # Where instance and module types are defined, class types are also
         # defined. See: init_definition_details
 
-        locations = self.accessor_class_types.keys()
+        locations = self.get_selected_locations(self.accessor_class_types)
 
         for location in locations:
             constrained = location in self.accessor_constrained
@@ -600,7 +621,7 @@ class Deducer(CommonOutput):
         # Attribute accesses use potentially different locations to those of
         # accessors.
 
-        locations = self.referenced_attrs.keys()
+        locations = self.get_selected_locations(self.referenced_attrs)
 
         for location in locations:
             constrained = location in self.access_constrained
@@ -754,7 +775,7 @@ class Deducer(CommonOutput):
 
         "Define attribute access plans."
 
-        for location in self.referenced_attrs.keys():
+        for location in self.get_selected_locations(self.referenced_attrs):
             original_location = self.const_accesses_rev.get(location)
             self.access_plans[original_location or location] = self.get_access_plan(location)
 
@@ -762,12 +783,24 @@ class Deducer(CommonOutput):
 
         "Introduce more module dependencies to the importer."
 
-        for location, referenced_attrs in self.referenced_attrs.items():
+        for location in self.get_selected_locations(self.referenced_attrs):
+            module_name = self.get_path_module(location.path)
+            dependencies = init_item(self.module_dependencies, module_name, set)
 
             # Identify references providing dependencies.
 
-            for attrtype, objtype, attr in referenced_attrs:
-                self.importer.add_dependency(location.path, attr.get_origin())
+            for attrtype, objtype, attr in self.referenced_attrs[location]:
+                dependencies.add((location.path, attr.get_origin()))
+
+        # Incorporate dependencies recorded for unselected modules.
+
+        for module_name in self.get_unselected_module_names():
+            self.module_dependencies[module_name] = \
+                set(map(tuple, self.previous[module_name]["dependencies"]))
+
+        for dependencies in self.module_dependencies.values():
+            for path, origin in dependencies:
+                self.importer.add_dependency(path, origin)
 
     def get_referenced_attrs(self, location):
 
@@ -784,6 +817,449 @@ class Deducer(CommonOutput):
         l.sort() # class, module, instance
         return l
 
+    # Incremental deduction.
+
+    def init_previous_deductions(self):
+
+        """
+        Obtain any deductions recorded by a previous run, selecting only the
+        modules affected by program changes for deduction. Where the program
+        structure has changed, all modules will be deduced.
+        """
+
+        self.check_output()
+
+        self.structure = self.get_structure_digest()
+
+        if not self.importer.cache:
+            return
+
+        previous = self.read_deductions()
+
+        if not previous or previous["structure"] != self.structure:
+            return
+
+        self.previous = previous["modules"]
+
+        # Modules inspected since the deductions were made are affected. Other
+        # modules may have been invalidated by the importer, but any structural
+        # changes they might reflect will have been detected above.
+
+        affected = set()
+        dependents = {}
+
+        for module_name in self.importer.modules.keys():
+            record = self.previous.get(module_name)
+
+            if not record or record["stamp"] != self.get_module_stamp(module_name):
+
+                affected.add(module_name)
+
+            # Record the modules whose return values were employed by each
+            # unchanged module.
+
+            else:
+                for provider in record["providers"]:
+                    init_item(dependents, provider, set)
+                    dependents[provider].add(module_name)
+
+        # Modules employing return values from affected modules are also
+        # affected.
+
+        to_visit = list(affected)
+
+        while to_visit:
+            for module_name in dependents.get(to_visit.pop(), []):
+                if module_name not in affected:
+                    affected.add(module_name)
+                    to_visit.append(module_name)
+
+        self.affected = affected
+        self.selected = set(affected)
+
+    def merge_previous_deductions(self):
+
+        """
+        Where modules have been selected for deduction, compare their attribute
+        assignments with those previously recorded, selecting all remaining
+        modules if any assignments differ. Otherwise, incorporate the recorded
+        details of the unselected modules.
+        """
+
+        if self.affected is None:
+            return
+
+        # Assignments influence attribute mutation and thus deductions in all
+        # modules.
+
+        assignments = self.get_module_assignments()
+
+        for module_name in self.affected:
+            record = self.previous.get(module_name)
+
+            if assignments.get(module_name, []) != (record and record["assignments"] or []):
+                self.selected = set(self.get_unselected_module_names())
+                self.affected = None
+
+                self.init_usage_index()
+                self.init_accessors()
+                self.init_accesses()
+                self.init_aliases()
+
+                self.selected = None
+                return
+
+        # Incorporate the assignments and return value details for unselected
+        # modules.
+
+        for module_name in self.get_unselected_module_names():
+            record = self.previous[module_name]
+
+            for usage, path, name, attrname in record["assignments"]:
+                init_item(self.assigned_attrs, usage, set)
+                self.assigned_attrs[usage].add((path, name, attrname))
+
+            self.set_return_value_details(record["returns"])
+
+    def deduce_modules(self, module_names):
+
+        """
+        Deduce the modules having the given 'module_names' if they were not
+        deduced for the program, this being necessary when their details are
+        needed for translation.
+        """
+
+        if self.affected is None:
+            return
+
+        module_names = set(module_names).difference(self.affected)
+
+        if not module_names:
+            return
+
+        # Discard the return value details incorporated for the modules.
+
+        for attrname in self.return_value_attributes:
+            d = getattr(self, attrname)
+            for location in d.keys():
+                if self.get_path_module(location.path) in module_names:
+                    del d[location]
+
+        self.affected.update(module_names)
+        self.selected = module_names
+
+        self.init_usage_index()
+        self.init_accessors()
+        self.init_accesses()
+        self.init_aliases()
+        self.identify_references()
+        self.classify_accessors()
+        self.classify_accesses()
+        self.initialise_access_plans()
+        self.initialise_access_instructions()
+
+        self.selected = self.affected
+
+    def get_structure_digest(self):
+
+        """
+        Return a digest of the program structure, changes to which require all
+        modules to be deduced.
+        """
+
+        importer = self.importer
+
+        structure = map(get_comparable_form, [
+            importer.modules.keys(),
+            importer.objects,
+            importer.classes,
+            importer.subclasses,
+            importer.all_class_attrs,
+            importer.all_instance_attrs,
+            importer.all_combined_attrs,
+            importer.all_module_attrs,
+            importer.function_parameters,
+            importer.function_defaults,
+            ])
+
+        return hashlib.sha1(repr(structure)).hexdigest()
+
+    def get_module_stamp(self, module_name):
+
+        "Return the modification time of the cached module with 'module_name'."
+
+        return getmtime(join(self.importer.cache, module_name))
+
+    def get_path_module(self, path):
+
+        "Return the name of the module providing 'path'."
+
+        module_name = self.path_modules.get(path)
+
+        if module_name is None:
+            module_name = path
+            while module_name not in self.importer.modules and "." in module_name:
+                module_name = module_name.rsplit(".", 1)[0]
+
+            self.path_modules[path] = module_name
+
+        return module_name
+
+    def is_selected(self, path):
+
+        "Return whether 'path' is provided by a module selected for deduction."
+
+        return self.selected is None or self.get_path_module(path) in self.selected
+
+    def get_selected_modules(self):
+
+        "Return the modules selected for deduction."
+
+        if self.selected is None:
+            return self.importer.get_modules()
+
+        modules = []
+        for module_name in self.selected:
+            modules.append(self.importer.modules[module_name])
+        return modules
+
+    def get_selected_locations(self, d):
+
+        "Return the locations in 'd' provided by modules selected for deduction."
+
+        if self.selected is None:
+            return d.keys()
+
+        locations = []
+        for location in d.keys():
+            if self.is_selected(location.path):
+                locations.append(location)
+        return locations
+
+    def get_unselected_module_names(self):
+
+        "Return the names of modules whose previous deductions are retained."
+
+        if self.affected is None:
+            return []
+
+        return set(self.importer.modules.keys()).difference(self.affected)
+
+    def get_module_assignments(self):
+
+        """
+        Return a mapping from module names to sorted lists of attribute
+        assignments, each of the form (usage, path, name, attribute name).
+        """
+
+        assignments = {}
+
+        for usage, all_attrnames in self.assigned_attrs.items():
+            for path, name, attrname in all_attrnames:
+                if self.is_selected(path):
+                    l = init_item(assignments, self.get_path_module(path), list)
+                    l.append((usage, path, name, attrname))
+
+        for l in assignments.values():
+            l.sort()
+
+        return assignments
+
+    # Return value details may be employed by other modules, being retained
+    # for unselected modules.
+
+    return_value_attributes = (
+        "initialised_names", "initialised_accesses", "reference_invocations",
+        "provider_class_types", "provider_instance_types", "provider_module_types",
+        "accessor_class_types", "accessor_instance_types", "accessor_module_types",
+        )
+
+    def get_return_value_details(self, module_names):
+
+        """
+        Return a mapping from the given 'module_names' to details of return
+        value locations in each module.
+        """
+
+        details = {}
+
+        for module_name in module_names:
+            details[module_name] = {}
+
+        for attrname in self.return_value_attributes:
+            for location, value in getattr(self, attrname).items():
+                if location.name != "$return":
+                    continue
+
+                module_details = details.get(self.get_path_module(location.path))
+
+                if module_details is None:
+                    continue
+
+                # Encode references and collections of types and references.
+
+                if isinstance(value, Reference):
+                    value = encode_reference_record(value)
+                elif isinstance(value, (list, set)):
+                    value = map(encode_detail, value)
+
+                l = init_item(module_details, attrname, list)
+                l.append((location.as_tuple(), value))
+
+        return details
+
+    def set_return_value_details(self, details):
+
+        "Incorporate the given return value 'details' for a module."
+
+        for attrname, items in details.items():
+            d = getattr(self, attrname)
+
+            for t, value in items:
+                if attrname == "initialised_names":
+                    value = decode_reference_record(value)
+                elif attrname != "reference_invocations":
+                    value = set(map(decode_detail, value))
+
+                d[Location(*t)] = value
+
+    def get_output(self, name):
+
+        "Return an object recording output for the file having the given 'name'."
+
+        output = self.outputs.get(name)
+
+        if not output:
+            output = self.outputs[name] = LocationOutput()
+
+        return output
+
+    def write_outputs(self):
+
+        """
+        Write the output recorded for selected modules together with any output
+        previously recorded for unselected modules.
+        """
+
+        unselected = self.get_unselected_module_names()
+
+        for name, output in self.outputs.items():
+            output.flush()
+            records = output.records[:]
+
+            for module_name in unselected:
+                records += self.previous[module_name]["outputs"].get(name, [])
+
+            # Order the output by location, retaining the order of records for
+            # each location.
+
+            records.sort(key=lambda record: record[0])
+
+            f = open(join(self.output, name), "w")
+            try:
+                for key, text in records:
+                    f.write(text)
+            finally:
+                f.close()
+
+    def get_deductions_filename(self):
+
+        "Return the filename for the recorded deductions."
+
+        return join(self.output, "$deductions")
+
+    def read_deductions(self):
+
+        "Return the recorded deductions or None if none can be obtained."
+
+        filename = self.get_deductions_filename()
+
+        if not exists(filename):
+            return None
+
+        f = open(filename, "rb")
+        try:
+            s = f.read()
+        finally:
+            f.close()
+
+        if not s.startswith(deductions_header):
+            return None
+
+        try:
+            return marshal.loads(buffer(s, len(deductions_header)))
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def write_deductions(self):
+
+        """
+        Record details of each module's deductions so that a subsequent run may
+        deduce only those modules affected by program changes.
+        """
+
+        if not self.importer.cache:
+            return
+
+        # Retain the details of unselected modules.
+
+        modules = {}
+
+        for module_name in self.get_unselected_module_names():
+            modules[module_name] = self.previous[module_name]
+
+        # Record details of the selected modules.
+
+        if self.affected is None:
+            module_names = self.importer.modules.keys()
+        else:
+            module_names = self.affected
+
+        assignments = self.get_module_assignments()
+        returns = self.get_return_value_details(module_names)
+
+        outputs = {}
+        providers = {}
+
+        for name, output in self.outputs.items():
+            for record in output.records:
+                module_outputs = init_item(outputs, self.get_path_module(record[0][0]), dict)
+                l = init_item(module_outputs, name, list)
+                l.append(record)
+
+        for location in self.get_selected_locations(self.alias_index):
+            module_name = self.get_path_module(location.path)
+
+            for access_location in self.alias_index[location]:
+                provider = self.get_path_module(access_location.path)
+                if provider != module_name:
+                    init_item(providers, module_name, set).add(provider)
+
+        for module_name in module_names:
+            modules[module_name] = {
+                "stamp" : self.get_module_stamp(module_name),
+                "assignments" : assignments.get(module_name, []),
+                "dependencies" : list(self.module_dependencies.get(module_name, [])),
+                "providers" : list(providers.get(module_name, [])),
+                "returns" : returns[module_name],
+                "outputs" : outputs.get(module_name, {}),
+                }
+
+        # Write to a temporary file and then replace any existing file so that
+        # incomplete deductions are never read.
+
+        filename = self.get_deductions_filename()
+        temp_filename = "%s.tmp" % filename
+
+        f = open(temp_filename, "wb")
+        try:
+            f.write(deductions_header)
+            marshal.dump({"structure" : self.structure, "modules" : modules}, f, 2)
+        finally:
+            f.close()
+
+        rename(temp_filename, filename)
+
     # Initialisation methods.
 
     def init_descendants(self):
@@ -811,6 +1287,45 @@ class Deducer(CommonOutput):
 
         return self.descendants[name]
 
+    def init_type_numbers(self):
+
+        """
+        Number each class and module, also recording the descendants of each
+        class as type bits.
+        """
+
+        names = self.importer.classes.keys() + self.importer.modules.keys()
+        names.sort()
+
+        for name in names:
+            self.type_numbers[name] = len(self.type_names)
+            self.type_names.append(name)
+
+        for name, descendants in self.descendants.items():
+            self.descendant_bits[name] = self.get_type_bits(descendants)
+
+    def get_type_bits(self, types):
+
+        "Return an integer having the bits set for the given 'types'."
+
+        bits = 0
+        for type in types:
+            bits |= 1L << self.type_numbers[type]
+        return bits
+
+    def get_types_from_bits(self, bits):
+
+        "Return a set of the type names indicated by the given type 'bits'."
+
+        types = set()
+
+        while bits:
+            bit = bits & -bits
+            types.add(self.type_names[bit.bit_length() - 1])
+            bits ^= bit
+
+        return types
+
     def init_special_attributes(self):
 
         "Add special attributes to the classes for inheritance-related tests."
@@ -831,11 +1346,14 @@ class Deducer(CommonOutput):
         accesses.
         """
 
-        for module in self.importer.get_modules():
+        for module in self.get_selected_modules():
             for path, assignments in module.attr_usage.items():
                 self.add_usage(assignments, path)
 
         for path, all_attrnames in self.importer.all_attr_accesses.items():
+            if not self.is_selected(path):
+                continue
+
             for attrnames in all_attrnames:
                 attrname = get_attrnames(attrnames)[-1]
                 access_location = AccessLocation(path, None, attrnames, 0)
@@ -871,7 +1389,7 @@ class Deducer(CommonOutput):
 
         "Create indexes for module and function accessor information."
 
-        for module in self.importer.get_modules():
+        for module in self.get_selected_modules():
             for path, all_accesses in module.attr_accessors.items():
                 self.add_accessors(all_accesses, path)
 
@@ -928,6 +1446,8 @@ class Deducer(CommonOutput):
         # For each scope, obtain access details.
 
         for path, all_accesses in self.importer.all_attr_access_modifiers.items():
+            if not self.is_selected(path):
+                continue
 
             # For each combination of name and attribute names, obtain
             # applicable modifiers.
@@ -996,6 +1516,8 @@ class Deducer(CommonOutput):
         # Get aliased names with details of their accesses.
 
         for (path, name), all_aliases in self.importer.all_aliased_names.items():
+            if not self.is_selected(path):
+                continue
 
             # For each version of the name, obtain the access locations.
 
@@ -1009,6 +1531,9 @@ class Deducer(CommonOutput):
         # Get initialised name information for accessors and accesses.
 
         for (path, name), versions in self.importer.all_initialised_names.items():
+            if not self.is_selected(path):
+                continue
+
             for version, ref in versions.items():
                 location = Location(path, name, None, version)
 
@@ -1022,8 +1547,8 @@ class Deducer(CommonOutput):
 
         # Get a mapping from accesses to affected aliases.
 
-        for accessor_location, access_locations in self.alias_index.items():
-            for access_location in access_locations:
+        for accessor_location in self.get_selected_locations(self.alias_index):
+            for access_location in self.alias_index[accessor_location]:
                 init_item(self.alias_index_rev, access_location, set)
                 self.alias_index_rev[access_location].add(accessor_location)
 
@@ -1095,16 +1620,23 @@ class Deducer(CommonOutput):
         "Return the most general types for the given 'class_types'."
 
         class_types = set(class_types)
-        to_remove = set()
+        class_bits = self.get_type_bits(class_types)
+        to_remove = 0
 
         for class_type in class_types:
             for base in self.importer.classes[class_type]:
                 base = base.get_origin()
-                descendants = self.descendants[base]
-                if base in class_types and descendants.issubset(class_types):
-                    to_remove.update(descendants)
+                descendants = self.descendant_bits[base]
+
+                # Where the base and all of its descendants are present, the
+                # descendants can be removed.
+
+                if base in class_types and not descendants & ~class_bits:
+                    to_remove |= descendants
+
+        if to_remove:
+            class_types.difference_update(self.get_types_from_bits(to_remove))
 
-        class_types.difference_update(to_remove)
         return class_types
 
     def get_most_general_module_types(self, module_types):
@@ -1134,25 +1666,26 @@ class Deducer(CommonOutput):
 
         """
         Initialise the 'attr_types' attribute-to-types mapping using the given
-        'attrs' type-to-attributes mapping.
+        'attrs' type-to-attributes mapping. The types for each attribute are
+        recorded as type bits.
         """
 
         for name, attrnames in attrs.items():
+            bit = 1L << self.type_numbers[name]
+
             for attrname in attrnames:
 
                 # Permit general access for certain kinds of object.
 
                 if assignment is None:
-                    init_item(attr_types, (attrname, False), set)
-                    init_item(attr_types, (attrname, True), set)
-                    attr_types[(attrname, False)].add(name)
-                    attr_types[(attrname, True)].add(name)
+                    for key in ((attrname, False), (attrname, True)):
+                        attr_types[key] = attr_types.get(key, 0) | bit
 
                 # Restrict attribute assignment for instances.
 
                 else:
-                    init_item(attr_types, (attrname, assignment), set)
-                    attr_types[(attrname, assignment)].add(name)
+                    key = (attrname, assignment)
+                    attr_types[key] = attr_types.get(key, 0) | bit
 
     def get_class_types_for_usage(self, usage):
 
@@ -1195,15 +1728,17 @@ class Deducer(CommonOutput):
 
         # Obtain types supporting the first (attribute name, assignment) key...
 
-        types = set(attr_types.get(keys[0]) or [])
+        types = attr_types.get(keys[0], 0)
 
         for key in keys[1:]:
-            
+            if not types:
+                break
+
             # Record types that support all of the other attributes as well.
 
-            types.intersection_update(attr_types.get(key) or [])
+            types &= attr_types.get(key, 0)
 
-        return types
+        return self.get_types_from_bits(types)
 
     def init_combined_attribute_index(self):
 
@@ -1222,7 +1757,8 @@ class Deducer(CommonOutput):
 
         # Names with associated attribute usage.
 
-        for location, usages in self.location_index.items():
+        for location in self.get_selected_locations(self.location_index):
+            usages = self.location_index[location]
 
             # Obtain attribute usage associated with a name, deducing the nature
             # of the name. Obtain types only for branches involving attribute
@@ -1250,12 +1786,14 @@ class Deducer(CommonOutput):
 
         # Specific name-based attribute accesses.
 
-        for access_location, accessor_locations in self.access_index.items():
-            self.record_types_for_access(access_location, accessor_locations)
+        for access_location in self.get_selected_locations(self.access_index):
+            self.record_types_for_access(access_location, self.access_index[access_location])
 
         # Anonymous references with attribute chains.
 
         for path, accesses in self.importer.all_attr_accesses.items():
+            if not self.is_selected(path):
+                continue
 
             # Get distinct attribute names.
 
@@ -1273,6 +1811,8 @@ class Deducer(CommonOutput):
         # References via constant/identified objects.
 
         for path, name_accesses in self.importer.all_const_accesses.items():
+            if not self.is_selected(path):
+                continue
 
             # A mapping from the original name and attributes to resolved access
             # details.
@@ -1358,7 +1898,7 @@ class Deducer(CommonOutput):
 
         # Propagate alias-related information.
 
-        affected_aliases = set(self.alias_index.keys())
+        affected_aliases = set(self.get_selected_locations(self.alias_index))
 
         while True:
 
@@ -1402,6 +1942,12 @@ class Deducer(CommonOutput):
                 if self.alias_index_rev.has_key(access_location):
                     affected_aliases.update(self.alias_index_rev[access_location])
 
+            # Accesses now supplied by return values from unselected modules,
+            # these having been completely deduced, are also affected.
+
+            affected_aliases.update(self.external_alias_accesses)
+            self.external_alias_accesses = set()
+
             if not affected_aliases:
                 break
 
@@ -1919,6 +2465,10 @@ class Deducer(CommonOutput):
         for version in versions.keys():
             location = Location(path, name, None, version)
             l = init_item(self.alias_index_rev, location, set)
+
+            if access_location not in l and not self.is_selected(path):
+                self.external_alias_accesses.add(access_location)
+
             l.add(access_location)
 
             l = init_item(self.alias_index, access_location, set)
@@ -2647,7 +3197,8 @@ class Deducer(CommonOutput):
 
         "Expand access plans into instruction sequences."
 
-        for access_location, access_plan in self.access_plans.items():
+        for access_location in self.get_selected_locations(self.access_plans):
+            access_plan = self.access_plans[access_location]
 
             # Obtain the access details.
 
@@ -2966,4 +3517,77 @@ class Deducer(CommonOutput):
             self.access_instructions[access_location] = instructions
             self.accessor_kinds[access_location] = accessor_kinds
 
+class LocationOutput:
+
+    "Output recorded for each program location."
+
+    def __init__(self):
+        self.records = []
+        self.key = None
+        self.text = []
+        self.softspace = 0
+
+    def set_location(self, location):
+
+        "Record subsequent output for 'location'."
+
+        self.flush()
+        self.key = location.as_tuple()
+
+    def write(self, s):
+        self.text.append(s)
+
+    def flush(self):
+
+        "Record any output written for the current location."
+
+        if self.text:
+            self.records.append((self.key, "".join(self.text)))
+            self.text = []
+
+# Utility functions.
+
+def get_comparable_form(value):
+
+    """
+    Return a form of 'value' that does not depend on the ordering of any
+    collections it contains, with references reduced to their kinds and
+    origins.
+    """
+
+    if isinstance(value, dict):
+        l = []
+        for key, item in value.items():
+            l.append((key, get_comparable_form(item)))
+        l.sort()
+        return l
+    elif isinstance(value, (set, frozenset)):
+        l = map(get_comparable_form, value)
+        l.sort()
+        return l
+    elif isinstance(value, (list, tuple)):
+        return map(get_comparable_form, value)
+    elif isinstance(value, Reference):
+        return value.get_kind(), value.get_origin()
+    else:
+        return value
+
+def encode_detail(value):
+
+    "Encode 'value' as a record if it is a reference."
+
+    if isinstance(value, Reference):
+        return encode_reference_record(value)
+    else:
+        return value
+
+def decode_detail(value):
+
+    "Decode 'value' as a reference if it is a record."
+
+    if isinstance(value, tuple):
+        return decode_reference_record(value)
+    else:
+        return value
+
 # vim: tabstop=4 expandtab shiftwidth=4
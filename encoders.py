@@ -474,14 +474,41 @@ def encode_literal_constant_member(value):
 
     "Encode the member name for the 'value' in the final program."
 
+    # Long integers employ separate data.
+
+    if isinstance(value, long):
+        return "datavalue"
+
     return "%svalue" % value.__class__.__name__
 
 def encode_literal_constant_value(value):
 
     "Encode the given 'value' in the final program."
 
-    if isinstance(value, (int, float)):
+    if isinstance(value, int):
         return str(value)
+
+    # Encode long integers as digit structures, as employed by the native
+    # long integer functions.
+
+    elif isinstance(value, long):
+        digits = []
+        magnitude = abs(value)
+
+        while magnitude:
+            digits.append("0x%x" % (magnitude & 0xffffffff))
+            magnitude >>= 32
+
+        size = value < 0 and -len(digits) or len(digits)
+
+        return "(void *) &(struct {__int size; uint32_t digits[%d];}) {%d, {%s}}" % (
+               len(digits) or 1, size, ", ".join(digits or ["0"]))
+
+    # Employ a representation that reproduces floating point values exactly.
+
+    elif isinstance(value, float):
+        return repr(value)
+
     else:
         l = []
 
@@ -19,7 +19,7 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from common import CommonOutput, copy
+from common import CommonOutput, UpdatedFile, copy, get_string_hash
 from encoders import encode_code, \
                      encode_function_pointer, \
                      encode_instantiator_pointer, \
@@ -42,9 +42,11 @@ class Generator(CommonOutput):
     # NOTE: These must be synchronised with the library.
 
     dict_type = "__builtins__.dict.dict"
+    float_type = "__builtins__.float.float"
     function_type = "__builtins__.core.function"
     int_type = "__builtins__.int.int"
     list_type = "__builtins__.list.list"
+    long_type = "__builtins__.long.long"
     none_type = "__builtins__.none.NoneType"
     string_type = "__builtins__.str.str"
     tuple_type = "__builtins__.tuple.tuple"
@@ -79,13 +81,18 @@ class Generator(CommonOutput):
 
         self.instancepos = self.optimiser.attr_locations["__class__"]
 
-    def to_output(self, reset=False, debug=False, gc_sections=False):
+    def to_output(self, reset=False, debug=False, gc_sections=False, lto=False,
+                  pgo=False, compact_tables=False):
 
-        "Write the generated code."
+        """
+        Write the generated code, employing compact attribute tables if
+        'compact_tables' is set to a true value.
+        """
 
-        self.check_output("debug=%r gc_sections=%r" % (debug, gc_sections))
-        self.write_structures()
-        self.write_scripts(debug, gc_sections)
+        self.check_output("debug=%r gc_sections=%r lto=%r pgo=%r compact_tables=%r" % (
+                          debug, gc_sections, lto, pgo, compact_tables))
+        self.write_structures(compact_tables)
+        self.write_scripts(debug, gc_sections, lto, pgo)
         self.copy_templates(reset)
 
     def copy_templates(self, reset=False):
@@ -141,17 +148,22 @@ class Generator(CommonOutput):
                 for filename in superfluous:
                     remove(join(target, filename))
 
-    def write_structures(self):
+    def write_structures(self, compact_tables=False):
 
-        "Write structures used by the program."
+        """
+        Write structures used by the program, only replacing existing files
+        whose contents have changed. If 'compact_tables' is set to a true value,
+        attribute tables are combined in a single list of attribute codes.
+        """
 
-        f_consts = open(join(self.output, "progconsts.h"), "w")
-        f_defs = open(join(self.output, "progtypes.c"), "w")
-        f_decls = open(join(self.output, "progtypes.h"), "w")
-        f_signatures = open(join(self.output, "main.h"), "w")
-        f_code = open(join(self.output, "main.c"), "w")
-        f_calls = open(join(self.output, "calls.c"), "w")
-        f_call_macros = open(join(self.output, "calls.h"), "w")
+        f_consts = UpdatedFile(join(self.output, "progconsts.h"))
+        f_defs = UpdatedFile(join(self.output, "progtypes.c"))
+        f_decls = UpdatedFile(join(self.output, "progtypes.h"))
+        f_signatures = UpdatedFile(join(self.output, "main.h"))
+        f_code = UpdatedFile(join(self.output, "main.c"))
+        f_calls = UpdatedFile(join(self.output, "calls.c"))
+        f_call_macros = UpdatedFile(join(self.output, "calls.h"))
+        f_codetypes = UpdatedFile(join(self.output, "codetypes.h"))
 
         try:
             # Output boilerplate.
@@ -209,6 +221,10 @@ class Generator(CommonOutput):
 
             self.callables = {}
 
+            # Record the tables for any compact representation.
+
+            tables = {}
+
             for ref, attrnames in objects:
                 kind = ref.get_kind()
                 path = ref.get_origin()
@@ -262,11 +278,18 @@ class Generator(CommonOutput):
 
                         self.callables[path] = path
 
-                # Write a table for all objects.
+                # Write a table for all objects or record it for the compact
+                # representation.
 
-                table = []
-                self.populate_table(Reference(kind, path), table)
-                self.write_table(f_decls, f_defs, table_name, structure_size, table)
+                if compact_tables:
+                    tables[table_name] = Reference(kind, path)
+                else:
+                    table = []
+                    self.populate_table(Reference(kind, path), table)
+                    self.write_table(f_decls, f_defs, table_name, structure_size, table)
+
+            if compact_tables:
+                self.write_compact_tables(f_decls, f_defs, tables)
 
             # Generate function instances.
 
@@ -353,6 +376,12 @@ class Generator(CommonOutput):
 
             # Generate parameter tables for distinct function signatures.
 
+            # Generate the tables in a stable order so that the output only
+            # changes when the program changes.
+
+            parameter_tables = list(parameter_tables)
+            parameter_tables.sort()
+
             for argmin, parameters in parameter_tables:
                 self.make_parameter_table(f_decls, f_defs, argmin, parameters)
 
@@ -363,7 +392,12 @@ class Generator(CommonOutput):
 
             # Generate literal constants.
 
+            constants = []
             for constant, n in self.optimiser.constants.items():
+                constants.append((n, constant))
+            constants.sort()
+
+            for n, constant in constants:
                 self.make_literal_constant(f_decls, f_defs, n, constant)
 
             # Generate a common integer instance object, referenced when integer
@@ -410,6 +444,11 @@ class Generator(CommonOutput):
                                       self.optimiser.locations,
                                       "code", "pos", encode_code, encode_pos)
 
+            # Generate types able to hold the codes and positions.
+
+            self.write_code_types(f_codetypes, compact_tables,
+                                  max(all_max_parameters) + 1)
+
             # Generate macros for calls.
 
             all_max_parameters = list(all_max_parameters)
@@ -476,6 +515,11 @@ __attr __call_with_args(__attr (*fn)(), __attr args[], unsigned int n)
 
 #endif /* __CALLS_H__ */"""
 
+        except:
+            for f in (f_consts, f_defs, f_decls, f_signatures, f_code, f_calls,
+                      f_call_macros, f_codetypes):
+                f.discard()
+            raise
         finally:
             f_consts.close()
             f_defs.close()
@@ -484,14 +528,20 @@ __attr __call_with_args(__attr (*fn)(), __attr args[], unsigned int n)
             f_code.close()
             f_calls.close()
             f_call_macros.close()
+            f_codetypes.close()
 
-    def write_scripts(self, debug, gc_sections):
+    def write_scripts(self, debug, gc_sections, lto=False, pgo=False):
 
-        "Write scripts used to build the program."
+        """
+        Write scripts used to build the program, with 'debug' and 'gc_sections'
+        affecting the compiler and linker options, 'lto' enabling link-time
+        optimisation, and 'pgo' permitting profile-guided optimisation using the
+        PGO variable when building.
+        """
 
         # Options affect compiling and linking.
 
-        f_options = open(join(self.output, "options.mk"), "w")
+        f_options = UpdatedFile(join(self.output, "options.mk"))
         try:
             if debug:
                 print >>f_options, "CFLAGS = -g"
@@ -501,21 +551,33 @@ __attr __call_with_args(__attr (*fn)(), __attr args[], unsigned int n)
             if gc_sections:
                 print >>f_options, "include gc_sections.mk"
 
+            if lto:
+                print >>f_options, "include lto.mk"
+
+            if pgo:
+                print >>f_options, "include pgo.mk"
+
+        except:
+            f_options.discard()
+            raise
         finally:
             f_options.close()
 
         # Native and module definitions divide the program modules into native
         # and generated code.
 
-        f_native = open(join(self.output, "native.mk"), "w")
-        f_modules = open(join(self.output, "modules.mk"), "w")
+        f_native = UpdatedFile(join(self.output, "native.mk"))
+        f_modules = UpdatedFile(join(self.output, "modules.mk"))
         try:
             # Identify modules used by the program.
 
             native_modules = [join("native", "common.c")]
             modules = []
 
-            for name in self.importer.modules.keys():
+            names = self.importer.modules.keys()
+            names.sort()
+
+            for name in names:
                 parts = name.split(".", 1)
 
                 # Identify source files to be built.
@@ -528,6 +590,10 @@ __attr __call_with_args(__attr (*fn)(), __attr args[], unsigned int n)
             print >>f_native, "SRC =", " ".join(native_modules)
             print >>f_modules, "SRC +=", " ".join(modules)
 
+        except:
+            f_native.discard()
+            f_modules.discard()
+            raise
         finally:
             f_native.close()
             f_modules.close()
@@ -538,13 +604,16 @@ __attr __call_with_args(__attr (*fn)(), __attr args[], unsigned int n)
         # positioned elsewhere and thus cannot be in the same location as the
         # __class__ attribute.
 
-        f_instancepos = open(join(self.output, "instancepos.h"), "w")
+        f_instancepos = UpdatedFile(join(self.output, "instancepos.h"))
         try:
             print >>f_instancepos, """\
 #ifndef __INSTANCEPOS
 #define __INSTANCEPOS %d
 #endif
 """ % self.instancepos
+        except:
+            f_instancepos.discard()
+            raise
         finally:
             f_instancepos.close()
 
@@ -631,6 +700,11 @@ __attr __call_with_args(__attr (*fn)(), __attr args[], unsigned int n)
             if attrs.has_key("__size__"):
                 attrs["__size__"] = len(data)
 
+            # Precompute the hash value, if a string.
+
+            if attrs.has_key("__hashvalue__"):
+                attrs["__hashvalue__"] = get_string_hash(str(data))
+
         # Define Unicode constant encoding details.
 
         if cls == self.unicode_type:
@@ -718,8 +792,11 @@ __attr __call_with_args(__attr (*fn)(), __attr args[], unsigned int n)
         """
 
         print >>f_consts, "enum %s {" % encode_size(size_prefix)
+        sizes = sizes.items()
+        sizes.sort()
+
         first = True
-        for path, size in sizes.items():
+        for path, size in sizes:
             if not first:
                 print >>f_consts, ","
             else:
@@ -748,6 +825,9 @@ __attr __call_with_args(__attr (*fn)(), __attr args[], unsigned int n)
         print >>f_consts, "enum %s {" % encode_symbol(pos_prefix)
         first = True
         for i, attrnames in enumerate(locations):
+            attrnames = list(attrnames)
+            attrnames.sort()
+
             for attrname in attrnames:
                 if not first:
                     print >>f_consts, ","
@@ -756,6 +836,128 @@ __attr __call_with_args(__attr (*fn)(), __attr args[], unsigned int n)
                 f_consts.write("    %s = %d" % (pos_encoder(attrname), i))
         print >>f_consts, "\n    };"
 
+    def write_code_types(self, f_codetypes, compact_tables, max_parameters):
+
+        """
+        Write to 'f_codetypes' the definitions of types able to hold the codes
+        and positions employed by tables, also indicating whether
+        'compact_tables' are employed. The given 'max_parameters' indicates the
+        largest parameter position that may appear in parameter tables.
+        """
+
+        # Attribute codes include an extra code for empty table entries.
+        # Position types also hold table sizes and parameter counts, which may
+        # equal the number of positions, and so must accommodate that number.
+
+        limits = [
+            ("__code", len(self.optimiser.all_attrnames) + 1),
+            ("__pos", len(self.optimiser.locations) + 1),
+            ("__pcode", len(self.optimiser.all_paramnames)),
+            ("__ppos", max(len(self.optimiser.arg_locations), max_parameters) + 1),
+            ]
+
+        print >>f_codetypes, """\
+#ifndef __CODETYPES_H__
+#define __CODETYPES_H__
+
+#include <stdint.h>
+"""
+
+        for name, limit in limits:
+            print >>f_codetypes, "typedef %s %s;" % (get_code_type(limit), name)
+
+        if compact_tables:
+            print >>f_codetypes, """
+#define __COMPACT_TABLES
+#define __TABLE_EMPTY %d""" % len(self.optimiser.all_attrnames)
+
+        print >>f_codetypes, "\n#endif /* __CODETYPES_H__ */"
+
+    def write_compact_tables(self, f_decls, f_defs, tables):
+
+        """
+        Write the declarations to 'f_decls' and definitions to 'f_defs' for the
+        given 'tables', mapping table names to object references, combining them
+        in a single list of attribute codes.
+
+        Each table is displaced within the list so that its codes do not occupy
+        entries already occupied by other tables, with each table having a
+        distinct starting position. Since attribute codes each have a single
+        location, the presence of a code at its location relative to the start
+        of a table can then only indicate that the table provides the code.
+        """
+
+        # Consider tables with the most entries first.
+
+        entries = []
+
+        for table_name, ref in tables.items():
+            bits = 0
+            count = 0
+
+            for i, attrname in enumerate(self.optimiser.structures[ref]):
+                if attrname is not None:
+                    bits |= 1 << i
+                    count += 1
+
+            entries.append((-count, table_name, bits))
+
+        entries.sort()
+
+        # Find the first available position for each table.
+
+        occupied = 0
+        bases = set()
+        table_bases = []
+        attrtable = []
+
+        for count, table_name, bits in entries:
+            base = 0
+            while base in bases or (bits << base) & occupied:
+                base += 1
+
+            occupied |= bits << base
+            bases.add(base)
+            table_bases.append((table_name, base))
+
+            # Populate the list, employing a code not used by any attribute for
+            # empty entries.
+
+            table = []
+            self.populate_table(tables[table_name], table, "__TABLE_EMPTY")
+
+            end = base + len(table)
+            if end > len(attrtable):
+                attrtable.extend(["__TABLE_EMPTY"] * (end - len(attrtable)))
+
+            for i, code in enumerate(table):
+                if code != "__TABLE_EMPTY":
+                    attrtable[i + base] = code
+
+        # Permit the testing of all locations for each table.
+
+        end = max(bases) + len(self.optimiser.locations)
+        attrtable.extend(["__TABLE_EMPTY"] * (end - len(attrtable)))
+
+        # Write each table as a position within the list.
+
+        print >>f_decls, "extern const __code __attrtable[];\n"
+
+        table_bases.sort()
+
+        for table_name, base in table_bases:
+            print >>f_decls, "#define %s (__attrtable[%d])" % (table_name, base)
+
+        print >>f_decls
+
+        # Write the list.
+
+        print >>f_defs, """\
+const __code __attrtable[] = {
+    %s
+};
+""" % ",\n    ".join(attrtable)
+
     def write_table(self, f_decls, f_defs, table_name, structure_size, table):
 
         """
@@ -912,11 +1114,12 @@ __obj %s = {
             attrs[attrname] = const or Reference("<var>", "%s.%s" % (name, attrname))
         return attrs
 
-    def populate_table(self, path, table):
+    def populate_table(self, path, table, empty="0"):
 
         """
         Traverse the attributes in the determined order for the structure having
-        the given 'path', adding entries to the attribute 'table'.
+        the given 'path', adding entries to the attribute 'table', using 'empty'
+        for gaps in the structure.
         """
 
         for attrname in self.optimiser.structures[path]:
@@ -924,7 +1127,7 @@ __obj %s = {
             # Handle gaps in the structure.
 
             if attrname is None:
-                table.append("0")
+                table.append(empty)
             else:
                 table.append(encode_code(attrname))
 
@@ -1021,6 +1224,12 @@ __obj %s = {
                     structure.append("{.sizevalue=%d}" % attr)
                     continue
 
+                # Special internal hash value member.
+
+                elif attrname == "__hashvalue__":
+                    structure.append("__INTVALUE(%d)" % attr)
+                    continue
+
                 # Special internal key member.
 
                 elif attrname == "__key__":
@@ -1211,6 +1420,36 @@ __attr %s(__attr __self, __attr number_or_string, __attr base)
 {
     return __fn___builtins___int_new_int(__NULL, number_or_string, base);
 }
+""" % (
+                encode_instantiator_pointer(path),
+                )
+
+        # Special-case the float type.
+
+        # Here, the __builtins__.float.new_float function is called with the
+        # initialiser's parameter.
+
+        elif path == self.float_type:
+            print >>f_code, """\
+__attr %s(__attr __self, __attr number_or_string)
+{
+    return __fn___builtins___float_new_float(__NULL, number_or_string);
+}
+""" % (
+                encode_instantiator_pointer(path),
+                )
+
+        # Special-case the long type.
+
+        # Here, the __builtins__.long.new_long function is called with the
+        # initialiser's parameters.
+
+        elif path == self.long_type:
+            print >>f_code, """\
+__attr %s(__attr __self, __attr number_or_string, __attr base)
+{
+    return __fn___builtins___long_new_long(__NULL, number_or_string, base);
+}
 """ % (
                 encode_instantiator_pointer(path),
                 )
@@ -1302,4 +1541,14 @@ int main(int argc, char *argv[])
 }
 """ % encode_instantiator_pointer("__builtins__.str.str")
 
+def get_code_type(limit):
+
+    "Return the smallest integer type able to hold values below 'limit'."
+
+    for bits in (8, 16, 32):
+        if limit <= 1 << bits:
+            return "uint%d_t" % bits
+
+    return "uint64_t"
+
 # vim: tabstop=4 expandtab shiftwidth=4
@@ -23,8 +23,9 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 from errors import ProgramError
 from os.path import exists, extsep, getmtime, join
 from os import listdir, makedirs, remove
-from common import init_item, order_dependencies, readfile, writefile
-from modules import CachedModule
+from common import get_cycles, init_item, order_dependencies, readfile, \
+                   writefile, ParseCache
+from modules import CachedModule, cache_header
 from referencing import Reference
 import inspector
 import sys
@@ -35,7 +36,8 @@ class Importer:
 
     special_attributes = ("__args__", "__file__", "__fn__", "__name__", "__parent__")
 
-    def __init__(self, path, cache=None, verbose=False, warnings=None):
+    def __init__(self, path, cache=None, verbose=False, warnings=None,
+                 parse_cache=None):
 
         """
         Initialise the importer with the given search 'path' - a list of
@@ -49,12 +51,16 @@ class Importer:
 
         The optional 'warnings' parameter may indicate classes of warnings to be
         produced.
+
+        The optional 'parse_cache' should be the name of a directory used to
+        store the parsed forms of source files.
         """
 
         self.path = path
         self.cache = cache
         self.verbose = verbose
         self.warnings = warnings
+        self.parse_cache = parse_cache and ParseCache(parse_cache) or None
 
         # Module importing queue, required modules, removed modules and active
         # modules in the final program.
@@ -348,7 +354,10 @@ class Importer:
 
         if reset:
             self.remove_cache()
-        self.check_cache(filename)
+
+        # Invalidate the cache for a different program or cache format.
+
+        self.check_cache("%s %s" % (filename, cache_header))
 
         # Load the program itself.
 
@@ -603,8 +612,14 @@ class Importer:
         initialisation.
         """
 
+        # Visit the dependencies in a consistent order since the condensed
+        # dependencies of previously visited paths are employed.
+
+        items = self.depends.items()
+        items.sort()
+
         d = {}
-        for path, depends in self.depends.items():
+        for path, depends in items:
             d[path] = {}
             d[path] = self.condense_dependency_entry(depends, d)
 
@@ -680,8 +695,13 @@ class Importer:
 
         try:
             ordered = order_dependencies(self.depends)
-        except ValueError, exc:
-            raise ProgramError("Modules with unresolvable dependencies exist: %s" % ", ".join(exc.args[0].keys()))
+        except ValueError:
+
+            # Report the cycles preventing the ordering.
+
+            cycles = get_cycles(self.depends)
+            raise ProgramError("Modules with unresolvable dependencies exist: %s" %
+                               "; ".join(map(", ".join, cycles)))
 
         if "__main__" in ordered:
             ordered.remove("__main__")
@@ -696,7 +716,10 @@ class Importer:
         ordered = self.order_objects()
         filtered = []
 
-        for module_name in self.modules.keys():
+        module_names = self.modules.keys()
+        module_names.sort()
+
+        for module_name in module_names:
             if module_name not in ordered:
                 filtered.append(module_name)
 
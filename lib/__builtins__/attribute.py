@@ -41,10 +41,11 @@ def getattr(obj, name, default=_default):
     try:
         result = object_getattr(obj, name, default)
 
-    # Handle exceptions when the access operation fails.
+    # Handle exceptions when the access operation fails, employing any
+    # supplied default.
 
     except TypeError:
-        result = _default
+        result = default
 
     # Check the result and, if it is the placeholder value, raise an exception.
 
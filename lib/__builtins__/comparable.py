@@ -19,7 +19,16 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-def cmp(x, y): pass
+def cmp(x, y):
+
+    "Compare 'x' and 'y', returning a negative, zero or positive integer."
+
+    if x == y:
+        return 0
+    elif x < y:
+        return -1
+    else:
+        return 1
 
 def hash(obj):
 
@@ -19,8 +19,10 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from __builtins__.mapping import hashtable
+from __builtins__.mapping import hashtable, _eq
 from __builtins__.iteration.iterator import itemiterator
+from native import mapping_get, mapping_items, mapping_keys, mapping_set, \
+                   mapping_values
 
 class dict(hashtable):
 
@@ -38,52 +40,6 @@ class dict(hashtable):
             for key, value in iterable:
                 self.__setitem__(key, value)
 
-    # Implementation methods.
-
-    def _find_entry(self, buckets, key, index):
-
-        """
-        Search in 'buckets' for 'key', using an 'index' identifying the bucket
-        involved.
-        """
-
-        i = 0
-
-        for found, value in buckets[index]:
-            if found == key:
-                return i
-            i += 1
-
-        return None
-
-    def _resize(self, capacity):
-
-        "Resize the hashtable to have the given 'capacity'."
-
-        buckets = self._get_buckets(capacity)
-
-        for key, value in self._items():
-            self._setitem(buckets, key, value)
-
-        self.buckets = buckets
-
-    def _setitem(self, buckets, key, value):
-
-        "Set in the 'buckets' an item having the given 'key' and 'value'."
-
-        index, i = self._get_entry(buckets, key)
-
-        # With no existing entry, append to the bucket.
-
-        if i is None:
-            buckets[index].append((key, value))
-            self.size += 1
-
-        # With an existing entry, replace the item.
-
-        else:
-            buckets[index][i] = key, value
-
     # String representations.
 
     def __str__(self):
@@ -95,7 +51,7 @@ class dict(hashtable):
 
         first = True
 
-        for key, value in self._items():
+        for key, value in self.items():
             if first:
                 first = False
             else:
@@ -121,7 +77,13 @@ class dict(hashtable):
 
         "Return the value associated with 'key' from the dictionary."
 
-        return self.get(key, self.MISSING)
+        value = mapping_get(self.__data__, key, self._get_hash(key), _eq,
+                            self.MISSING)
+
+        if value is self.MISSING:
+            raise KeyError, key
+
+        return value
 
     def __iter__(self):
 
@@ -133,12 +95,7 @@ class dict(hashtable):
 
         "Set a mapping from 'key' to 'value' in the dictionary."
 
-        capacity = len(self.buckets)
-
-        if self.size > capacity:
-            self._resize(capacity * 2)
-
-        self._setitem(self.buckets, key, value)
+        mapping_set(self.__data__, key, self._get_hash(key), value, _eq)
 
     # Public conventional methods.
 
@@ -149,41 +106,26 @@ class dict(hashtable):
         the dictionary, 'default' will be returned instead.
         """
 
-        index, i = self._get_entry(self.buckets, key)
-
-        # With no entry index, either raise an exception or return the default.
-
-        if i is None:
-            if default is self.MISSING:
-                raise KeyError, key
-            else:
-                return default
-
-        # With a valid entry index, obtain the corresponding value.
-
-        else:
-            return self.buckets[index][i][1]
+        return mapping_get(self.__data__, key, self._get_hash(key), _eq,
+                           default)
 
     def has_key(self, key):
 
         "Return whether the given 'key' is used with this dictionary."
 
-        return self.get(key) and True or False
+        return self.__contains__(key)
 
     def keys(self):
 
         "Return the keys for this dictionary."
 
-        l = []
-        for key, value in self._items():
-            l.append(key)
-        return l
+        return mapping_keys(self.__data__)
 
     def items(self):
 
         "Return the items, each being a (key, value) tuple, in this dictionary."
 
-        return self._items()
+        return mapping_items(self.__data__)
 
     def setdefault(self, key, value):
 
@@ -209,9 +151,6 @@ class dict(hashtable):
 
         "Return the values in this dictionary."
 
-        l = []
-        for key, value in self._items():
-            l.append(value)
-        return l
+        return mapping_values(self.__data__)
 
 # vim: tabstop=4 expandtab shiftwidth=4
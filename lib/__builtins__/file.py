@@ -20,7 +20,7 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from __builtins__.stream import filestream
-from native import fopen, fread
+from native import fopen
 
 class file(filestream):
 
@@ -35,43 +35,5 @@ class file(filestream):
 
         get_using(filestream.__init__, self)(encoding, bufsize)
         self.__data__ = fopen(filename, mode)
-        self.buffered = ""
-
-    def _get_data(self):
-
-        "Get data from the file."
-
-        if self.buffered:
-            s = self.buffered
-            self.buffered = ""
-        else:
-            s = fread(self.__data__, self.bufsize)
-
-        return s
-
-    def _read_data(self, l):
-
-        "Read data into 'l'."
-
-        s = self._get_data()
-        l.append(s)
-
-    def _read_until_newline(self, l):
-
-        "Read data into 'l', returning whether a newline has been read."
-
-        s = self._get_data()
-
-        # NOTE: Only POSIX newlines are supported currently.
-
-        i = s.find("\n")
-
-        if i != -1:
-            l.append(s[:i+1])
-            self.buffered = s[i+1:]
-            return True
-
-        l.append(s)
-        return False
 
 # vim: tabstop=4 expandtab shiftwidth=4
@@ -3,7 +3,7 @@
 """
 Floating point objects.
 
-Copyright (C) 2015, 2016 Paul Boddie <paul@boddie.org.uk>
+Copyright (C) 2015, 2016, 2021 Paul Boddie <paul@boddie.org.uk>
 
 This program is free software; you can redistribute it and/or modify it under
 the terms of the GNU General Public License as published by the Free Software
@@ -19,36 +19,219 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from __builtins__.long import long
+from __builtins__.str import basestring
+from __builtins__.unicode import unicode
+from native import is_int, isinstance as _isinstance, long_float, \
+                   float_add, float_div, float_eq, float_floordiv, float_ge, \
+                   float_gt, float_hash, float_le, float_lt, float_mod, \
+                   float_mul, float_ne, float_neg, float_parse, float_pow, \
+                   float_repr, float_str, float_sub
+
+def new_float(number_or_string=None):
+
+    "Return a float for the given 'number_or_string'."
+
+    if number_or_string is None:
+        return 0.0
+    elif _isinstance(number_or_string, float):
+        return number_or_string
+    elif is_int(number_or_string):
+        return float_add(number_or_string, 0.0)
+    elif _isinstance(number_or_string, long):
+        return long_float(number_or_string)
+    elif _isinstance(number_or_string, basestring):
+        return float_parse(number_or_string)
+    else:
+        raise TypeError
+
 class float:
+
+    "A floating point number abstraction."
+
     def __init__(self, number_or_string=None):
+
+        "Initialise the float with the given 'number_or_string'."
+
+        # Implemented by new_float above, invoked specially by the translator.
         # Note member.
+
         self.__data__ = 0.0
 
-    def __iadd__(self, other): pass
-    def __isub__(self, other): pass
-    def __add__(self, other): pass
-    def __radd__(self, other): pass
-    def __sub__(self, other): pass
-    def __rsub__(self, other): pass
-    def __mul__(self, other): pass
-    def __rmul__(self, other): pass
-    def __div__(self, other): pass
-    def __rdiv__(self, other): pass
-    def __floordiv__(self, other): pass
-    def __rfloordiv__(self, other): pass
-    def __mod__(self, other): pass
-    def __rmod__(self, other): pass
-    def __pow__(self, other): pass
-    def __rpow__(self, other): pass
-    def __lt__(self, other): pass
-    def __gt__(self, other): pass
-    def __le__(self, other): pass
-    def __ge__(self, other): pass
-    def __eq__(self, other): pass
-    def __ne__(self, other): pass
-    def __neg__(self): pass
-    def __pos__(self): pass
-    def __str__(self): pass
-    def __bool__(self): pass
+    def __hash__(self):
+
+        "Return a value for hashing purposes."
+
+        return float_hash(self)
+
+    def _binary_op(self, op, other):
+
+        "Perform 'op' on this float and 'other' if appropriate."
+
+        if _isinstance(other, float) or is_int(other) or \
+           _isinstance(other, long):
+            return op(self, other)
+        else:
+            return NotImplemented
+
+    def _binary_op_rev(self, op, other):
+
+        "Perform 'op' on 'other' and this float if appropriate."
+
+        if _isinstance(other, float) or is_int(other) or \
+           _isinstance(other, long):
+            return op(other, self)
+        else:
+            return NotImplemented
+
+    def __iadd__(self, other):
+
+        "Return a new float for the addition of this float and 'other'."
+
+        return self._binary_op(float_add, other)
+
+    def __isub__(self, other):
+
+        "Return a new float for the subtraction of 'other' from this float."
+
+        return self._binary_op(float_sub, other)
+
+    def __imul__(self, other):
+
+        "Return a new float for the multiplication of this float and 'other'."
+
+        return self._binary_op(float_mul, other)
+
+    def __idiv__(self, other):
+
+        "Return a new float for the division of this float by 'other'."
+
+        return self._binary_op(float_div, other)
+
+    def __ifloordiv__(self, other):
+
+        "Return a new float for the floor division of this float by 'other'."
+
+        return self._binary_op(float_floordiv, other)
+
+    def __imod__(self, other):
+
+        "Return a new float for the modulo of this float by 'other'."
+
+        return self._binary_op(float_mod, other)
+
+    def __ipow__(self, other):
+
+        "Return a new float for the exponentiation of this float by 'other'."
+
+        return self._binary_op(float_pow, other)
+
+    __add__ = __radd__ = __iadd__
+    __sub__ = __isub__
+
+    def __rsub__(self, other):
+
+        "Return a new float for the subtraction of this float from 'other'."
+
+        return self._binary_op_rev(float_sub, other)
+
+    __mul__ = __rmul__ = __imul__
+    __div__ = __idiv__
+
+    def __rdiv__(self, other):
+
+        "Return a new float for the division of 'other' by this float."
+
+        return self._binary_op_rev(float_div, other)
+
+    __floordiv__ = __ifloordiv__
+
+    def __rfloordiv__(self, other):
+
+        "Return a new float for the floor division of 'other' by this float."
+
+        return self._binary_op_rev(float_floordiv, other)
+
+    __mod__ = __imod__
+
+    def __rmod__(self, other):
+
+        "Return a new float for the modulo of 'other' by this float."
+
+        return self._binary_op_rev(float_mod, other)
+
+    __pow__ = __ipow__
+
+    def __rpow__(self, other):
+
+        "Return a new float for the exponentiation of 'other' by this float."
+
+        return self._binary_op_rev(float_pow, other)
+
+    def __lt__(self, other):
+
+        "Return whether this float is less than 'other'."
+
+        return self._binary_op(float_lt, other)
+
+    def __gt__(self, other):
+
+        "Return whether this float is greater than 'other'."
+
+        return self._binary_op(float_gt, other)
+
+    def __le__(self, other):
+
+        "Return whether this float is less than or equal to 'other'."
+
+        return self._binary_op(float_le, other)
+
+    def __ge__(self, other):
+
+        "Return whether this float is greater than or equal to 'other'."
+
+        return self._binary_op(float_ge, other)
+
+    def __eq__(self, other):
+
+        "Return whether this float is equal to 'other'."
+
+        return self._binary_op(float_eq, other)
+
+    def __ne__(self, other):
+
+        "Return whether this float is not equal to 'other'."
+
+        return self._binary_op(float_ne, other)
+
+    def __neg__(self):
+
+        "Apply the unary negation operator."
+
+        return float_neg(self)
+
+    def __pos__(self):
+
+        "Apply the unary positive operator."
+
+        return self
+
+    def __str__(self):
+
+        "Return a string representation."
+
+        return unicode(float_str(self))
+
+    def __repr__(self):
+
+        "Return a program representation."
+
+        return unicode(float_repr(self))
+
+    def __bool__(self):
+
+        "Return whether this float is non-zero."
+
+        return float_ne(self, 0)
 
 # vim: tabstop=4 expandtab shiftwidth=4
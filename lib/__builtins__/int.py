@@ -19,13 +19,15 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from __builtins__.float import float
+from __builtins__.long import long
 from __builtins__.str import basestring
 from __builtins__.unicode import unicode
 from native import get_maxint, get_minint, is_int, \
-                   int_add, int_and, int_div, int_eq, int_ge, int_gt, \
-                   int_lshift, int_le, int_lt, int_mod, int_mul, int_ne, \
-                   int_neg, int_not, int_or, int_pow, int_rshift, int_str, \
-                   int_sub, int_xor
+                   int_add, int_and, int_div, int_eq, int_floordiv, int_ge, \
+                   int_gt, int_lshift, int_le, int_lt, int_mod, int_mul, \
+                   int_ne, int_neg, int_not, int_or, int_pow, int_rshift, \
+                   int_str, int_sub, int_xor, float_int, long_add
 
 def new_int(number_or_string, base=10):
 
@@ -33,6 +35,10 @@ def new_int(number_or_string, base=10):
 
     if is_int(number_or_string):
         return number_or_string
+    elif isinstance(number_or_string, float):
+        return float_int(number_or_string)
+    elif isinstance(number_or_string, long):
+        return long_add(number_or_string, 0)
     elif isinstance(number_or_string, basestring):
         return str_to_int(number_or_string, base)
     else:
@@ -119,6 +125,12 @@ class int:
 
         return self._binary_op(int_div, other)
 
+    def __ifloordiv__(self, other):
+
+        "Return a new int for the floor division of this int by 'other'."
+
+        return self._binary_op(int_floordiv, other)
+
     def __imod__(self, other):
 
         "Return a new int for the modulo of this int by 'other'."
@@ -173,11 +185,13 @@ class int:
 
         return self._binary_op_rev(int_div, other)
 
-    # NOTE: To be implemented.
+    __floordiv__ = __ifloordiv__
+
+    def __rfloordiv__(self, other):
+
+        "Return a new int for the floor division of 'other' by this int."
 
-    def __floordiv__(self, other): pass
-    def __rfloordiv__(self, other): pass
-    def __ifloordiv__(self, other): pass
+        return self._binary_op_rev(int_floordiv, other)
 
     __mod__ = __imod__
 
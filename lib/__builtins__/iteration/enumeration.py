@@ -19,23 +19,35 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-def enumerate(iterable, start=0):
+class enumerate:
 
     """
-    Iterate over 'iterable', obtaining items and combining them with position
-    information, producing a sequence containing tuples of the form
-    (position, item). The first position is indicated by 'start' (which is zero
-    by default) and each subsequent positions is incremented from the one
-    preceding it.
+    An iterator over 'iterable', obtaining items and combining them with
+    position information, producing tuples of the form (position, item). The
+    first position is indicated by 'start' (which is zero by default) and each
+    subsequent position is incremented from the one preceding it.
     """
 
-    l = []
-    pos = start
+    def __init__(self, iterable, start=0):
 
-    for i in iterable:
-        l.append((pos, i))
-        pos += 1
+        "Initialise the iterator with the given 'iterable' and 'start'."
 
-    return l
+        self.iterator = iterable.__iter__()
+        self.pos = start
+
+    def __iter__(self):
+
+        "Return an iterator, currently self."
+
+        return self
+
+    def next(self):
+
+        "Return the next item or raise a StopIteration exception."
+
+        item = self.iterator.next()
+        pos = self.pos
+        self.pos = pos.__add__(1)
+        return pos, item
 
 # vim: tabstop=4 expandtab shiftwidth=4
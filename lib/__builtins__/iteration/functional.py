@@ -74,28 +74,44 @@ def reduce(function, sequence, initial=_reduce_default):
 def zip(args):
 
     """
-    Zip the given 'args' together, producing for each index position tuples
+    Zip the given 'args' together, producing for each position tuples
     containing the values for that position from each of the 'args'.
     """
 
+    # Obtain iterators for the arguments, since not all of them need provide
+    # a length or access to elements by position, noting which iterators can
+    # indicate whether they have more elements.
+
+    iterators = []
+
+    for arg in args:
+        iterator = arg.__iter__()
+        iterators.append((iterator, getattr(iterator, "__hasnext__", None) is not None))
+
     result = []
-    pos = 0
 
-    # Repeat until one of the arguments runs out of elements.
+    if not iterators:
+        return result
+
+    # Repeat until one of the arguments runs out of elements, visiting each
+    # argument in turn and collecting its next element. Only iterators unable
+    # to indicate whether they have more elements are advanced with the
+    # handling of StopIteration.
 
     while True:
         l = []
 
-        # Visit each argument in turn, collecting elements in the given
-        # position.
-
-        for arg in args:
-            try:
-                l.append(arg[pos])
-            except IndexError:
-                return result
+        for iterator, hasnext in iterators:
+            if hasnext:
+                if not iterator.__hasnext__():
+                    return result
+                l.append(iterator.next())
+            else:
+                try:
+                    l.append(iterator.next())
+                except StopIteration:
+                    return result
 
         result.append(tuple(l))
-        pos += 1
 
 # vim: tabstop=4 expandtab shiftwidth=4
@@ -19,9 +19,11 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from native import list_element, list_len
+
 class itemiterator:
 
-    "An iterator for objects providing item access."
+    "An iterator for lists and tuples."
 
     def __init__(self, l):
 
@@ -30,15 +32,21 @@ class itemiterator:
         self.l = l
         self.i = 0
 
+    def __hasnext__(self):
+
+        "Return whether another item is available."
+
+        return self.i < list_len(self.l.__data__)
+
     def next(self):
 
-        "Return the next item."
+        "Return the next item or raise a StopIteration exception."
 
-        try:
-            value = self.l[self.i]
-            self.i += 1
-            return value
-        except IndexError:
+        if not self.__hasnext__():
             raise StopIteration, self
 
+        value = list_element(self.l.__data__, self.i)
+        self.i += 1
+        return value
+
 # vim: tabstop=4 expandtab shiftwidth=4
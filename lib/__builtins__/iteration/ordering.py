@@ -27,8 +27,13 @@ def reversed(sequence):
 
 def sorted(iterable, cmp=None, key=None, reverse=False):
 
-    # NOTE: To be implemented.
-
-    pass
+    """
+    Return a sorted list of the items in 'iterable', with 'cmp', 'key' and
+    'reverse' having the same meaning as in the list.sort method.
+    """
+
+    l = list(iterable)
+    l.sort(cmp, key, reverse)
+    return l
 
 # vim: tabstop=4 expandtab shiftwidth=4
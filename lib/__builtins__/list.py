@@ -20,9 +20,21 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from __builtins__.iteration.iterator import itemiterator
-from __builtins__.sequence import unpackable, _get_absolute_index
-from native import list_append, list_concat, list_element, list_init, \
-                   list_len, list_nonempty, list_setelement, list_setsize
+from __builtins__.sequence import unpackable, _get_absolute_index, \
+                                  _get_range_indexes
+from native import isinstance as _isinstance, is_int, \
+                   list_append, list_concat, list_delete, list_element, \
+                   list_init, list_insert, list_len, list_nonempty, \
+                   list_replace, list_setelement, list_sort
+
+def _lt(a, b):
+
+    """
+    Return whether 'a' is less than 'b', employed by the native sort operation
+    to compare items that it cannot compare itself.
+    """
+
+    return a < b
 
 class list(unpackable):
 
@@ -33,31 +45,180 @@ class list(unpackable):
         "Initialise the list."
 
         # Reserve an attribute for a fragment reference along with some space
-        # for elements.
+        # for elements, where the number of elements is known from a list or
+        # tuple. Other objects, such as iterators, can provide elements without
+        # a known length.
+
+        if _isinstance(args, list) or _isinstance(args, tuple):
+            size = args.__len__()
+        else:
+            size = 0
 
-        self.__data__ = list_init(args is not None and len(args) or 0)
+        self.__data__ = list_init(size)
 
         if args is not None:
             self.extend(args)
 
     def __delitem__(self, index):
 
-        "Delete the item at 'index'."
+        "Delete the item or slice specified by 'index'."
+
+        # Normalise any integer indexes, converting negative indexes to positive
+        # ones.
+
+        if is_int(index):
+            index = _get_absolute_index(index, self.__len__())
+            self._check_index(index)
+            list_delete(self, index, index + 1)
+
+        # Handle slices separately.
+
+        elif _isinstance(index, slice):
+            if index.step == 1:
+                self.__delslice__(index.start, index.end)
+            else:
+                self._delete_stepped(index.start, index.end, index.step)
+
+        # No other kinds of objects are supported as indexes.
+
+        else:
+            raise TypeError()
+
+    def __setitem__(self, index, value):
+
+        "Set at 'index' the given 'value'."
+
+        # Normalise any integer indexes, converting negative indexes to positive
+        # ones.
+
+        if is_int(index):
+            index = _get_absolute_index(index, self.__len__())
+            return self.__set_single_item__(index, value)
+
+        # Handle slices separately.
+
+        elif _isinstance(index, slice):
+            if index.step == 1:
+                self.__setslice__(index.start, index.end, value)
+            else:
+                self._set_stepped(index.start, index.end, index.step, value)
+
+        # No other kinds of objects are supported as indexes.
+
+        else:
+            raise TypeError()
+
+    def _get_stepped_positions(self, start, end, step):
+
+        """
+        Return the positions of the items from 'start' until (but excluding)
+        'end' at 'step' intervals, in the order in which they would appear in a
+        slice.
+        """
+
+        if step == 0:
+            raise ValueError(step)
 
         length = self.__len__()
-        index = _get_absolute_index(index, length)
-        last = length - 1
 
-        while index < last:
-            self[index] = self[index + 1]
-            index += 1
+        # Normalise the indexes as done when obtaining slices, limiting them to
+        # the positions within the list.
+
+        if start is None:
+            if step > 0:
+                start = 0
+            else:
+                start = length - 1
+        else:
+            start = _get_absolute_index(start, length)
+
+        if end is None:
+            if step > 0:
+                end = length
+            else:
+                end = -1
+        else:
+            end = _get_absolute_index(end, length)
+
+        if step > 0:
+            if start < 0:
+                start = 0
+            if end > length:
+                end = length
+        else:
+            if start >= length:
+                start = length - 1
+            if end < -1:
+                end = -1
 
-        # NOTE: Should truncate the allocated list after several pops.
+        positions = []
 
-        list_setsize(self.__data__, last)
+        while step > 0 and start < end or step < 0 and start > end:
+            positions.append(start)
+            start += step
 
-    def __setslice__(self, start, end, slice): pass
-    def __delslice__(self, start, end): pass
+        return positions
+
+    def _delete_stepped(self, start, end, step):
+
+        """
+        Delete the items from 'start' until (but excluding) 'end' at 'step'
+        intervals.
+        """
+
+        positions = self._get_stepped_positions(start, end, step)
+
+        # Delete items from the end of the list so that the positions of the
+        # remaining items to be deleted are unaffected.
+
+        if step > 0:
+            positions.reverse()
+
+        for i in positions:
+            list_delete(self, i, i + 1)
+
+    def _set_stepped(self, start, end, step, slice):
+
+        """
+        Replace the items from 'start' until (but excluding) 'end' at 'step'
+        intervals with those provided by 'slice', which must provide the same
+        number of items as are replaced.
+        """
+
+        positions = self._get_stepped_positions(start, end, step)
+
+        if not isinstance(slice, list):
+            slice = list(slice)
+
+        if slice.__len__() != positions.__len__():
+            raise ValueError(slice)
+
+        j = 0
+
+        for i in positions:
+            list_setelement(self.__data__, i, list_element(slice.__data__, j))
+            j += 1
+
+    def __setslice__(self, start, end, slice):
+
+        """
+        Replace the items from 'start' until (but excluding) 'end' with those
+        provided by 'slice'.
+        """
+
+        start, end = _get_range_indexes(start, end, self.__len__())
+
+        if not isinstance(slice, list):
+            slice = list(slice)
+
+        list_replace(self, start, end, slice.__data__)
+
+    def __delslice__(self, start, end):
+
+        "Delete the items from 'start' until (but excluding) 'end'."
+
+        start, end = _get_range_indexes(start, end, self.__len__())
+        list_delete(self, start, end)
 
     def append(self, value):
 
@@ -72,20 +233,10 @@ class list(unpackable):
         length = self.__len__()
         index = _get_absolute_index(index, length)
 
-        if index == length:
-            self.append(value)
-            return
-        elif index > length:
+        if index < 0 or index > length:
             raise IndexError, index
 
-        i = length - 1
-        self.append(self.__getitem__(i))
-
-        while i > index:
-            self.__setitem__(i, self.__getitem__(i - 1))
-            i -= 1
-
-        self.__setitem__(index, value)
+        list_insert(self, index, value)
 
     def extend(self, iterable):
 
@@ -94,16 +245,19 @@ class list(unpackable):
         for i in iterable:
             self.append(i)
 
-    def pop(self):
+    def pop(self, index=-1):
 
-        "Remove the last item from the list, returning the item."
+        """
+        Remove the item at 'index' from the list, returning the item. By
+        default, the last item is removed.
+        """
 
-        i = self[-1]
-
-        # NOTE: Should truncate the allocated list after several pops.
+        index = _get_absolute_index(index, self.__len__())
+        self._check_index(index)
 
-        list_setsize(self.__data__, self.__len__() - 1)
-        return i
+        value = list_element(self.__data__, index)
+        list_delete(self, index, index + 1)
+        return value
 
     def reverse(self):
 
@@ -120,7 +274,28 @@ class list(unpackable):
             i += 1
             j -= 1
 
-    def sort(self, cmp=None, key=None, reverse=0): pass
+    def sort(self, cmp=None, key=None, reverse=0):
+
+        """
+        Sort the list in-place, comparing items using any given 'cmp' function
+        or the less-than operator otherwise. Any given 'key' function is applied
+        once to each item, with the results being compared instead of the items.
+        If 'reverse' is a true value, the items are sorted in descending order,
+        with equal items retaining their original order.
+        """
+
+        if key is None:
+            keys = self
+        else:
+            keys = []
+            for item in self:
+                keys.append(key(item))
+
+        # Changes to the list made by the comparisons prevent the sorted items
+        # from being stored.
+
+        if not list_sort(self, keys, cmp, _lt, reverse):
+            raise ValueError("list modified during sort")
 
     def __len__(self):
 
@@ -3,7 +3,7 @@
 """
 Long objects.
 
-Copyright (C) 2015 Paul Boddie <paul@boddie.org.uk>
+Copyright (C) 2015, 2021 Paul Boddie <paul@boddie.org.uk>
 
 This program is free software; you can redistribute it and/or modify it under
 the terms of the GNU General Public License as published by the Free Software
@@ -19,35 +19,258 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from __builtins__.str import basestring
+from __builtins__.unicode import unicode
+from native import is_int, isinstance as _isinstance, float_int, \
+                   long_add, long_and, long_div, long_eq, long_ge, long_gt, \
+                   long_hash, long_le, long_lshift, long_lt, long_mod, \
+                   long_mul, long_ne, long_neg, long_new, long_not, long_or, \
+                   long_parse, long_pow, long_rshift, long_str, long_sub, \
+                   long_xor
+
+def new_long(number_or_string=None, base=10):
+
+    "Return a long integer for the given 'number_or_string'."
+
+    if number_or_string is None:
+        return long_new(0)
+    elif is_int(number_or_string) or _isinstance(number_or_string, long):
+        return long_new(number_or_string)
+    elif _isinstance(number_or_string, basestring):
+        return long_new(long_parse(number_or_string, base))
+    else:
+        return long_new(float_int(number_or_string))
+
 class long:
-    def __init__(self, number_or_string=None): pass
-    def __iadd__(self, other): pass
-    def __isub__(self, other): pass
-    def __add__(self, other): pass
-    def __radd__(self, other): pass
-    def __sub__(self, other): pass
-    def __rsub__(self, other): pass
-    def __mul__(self, other): pass
-    def __rmul__(self, other): pass
-    def __div__(self, other): pass
-    def __rdiv__(self, other): pass
-    def __floordiv__(self, other): pass
-    def __rfloordiv__(self, other): pass
-    def __and__(self, other): pass
-    def __rand__(self, other): pass
-    def __or__(self, other): pass
-    def __ror__(self, other): pass
-    def __xor__(self, other): pass
-    def __rxor__(self, other): pass
-    def __lt__(self, other): pass
-    def __gt__(self, other): pass
-    def __le__(self, other): pass
-    def __ge__(self, other): pass
-    def __eq__(self, other): pass
-    def __ne__(self, other): pass
-    def __neg__(self): pass
-    def __pos__(self): pass
-    def __str__(self): pass
-    def __bool__(self): pass
+
+    """
+    A long integer abstraction. Operations producing results that can be
+    represented as integers produce integers instead of long integers.
+    """
+
+    def __init__(self, number_or_string=None, base=10):
+
+        "Initialise the long integer with the given 'number_or_string'."
+
+        # Implemented by new_long above, invoked specially by the translator.
+        # Note member.
+
+        self.__data__ = None
+
+    def __hash__(self):
+
+        "Return a value for hashing purposes."
+
+        return long_hash(self)
+
+    def _binary_op(self, op, other):
+
+        "Perform 'op' on this long and 'other' if appropriate."
+
+        if _isinstance(other, long) or is_int(other):
+            return op(self, other)
+        else:
+            return NotImplemented
+
+    def _binary_op_rev(self, op, other):
+
+        "Perform 'op' on 'other' and this long if appropriate."
+
+        if _isinstance(other, long) or is_int(other):
+            return op(other, self)
+        else:
+            return NotImplemented
+
+    def __iadd__(self, other):
+
+        "Return a new long for the addition of this long and 'other'."
+
+        return self._binary_op(long_add, other)
+
+    def __isub__(self, other):
+
+        "Return a new long for the subtraction of 'other' from this long."
+
+        return self._binary_op(long_sub, other)
+
+    def __imul__(self, other):
+
+        "Return a new long for the multiplication of this long and 'other'."
+
+        return self._binary_op(long_mul, other)
+
+    def __idiv__(self, other):
+
+        "Return a new long for the division of this long by 'other'."
+
+        return self._binary_op(long_div, other)
+
+    def __imod__(self, other):
+
+        "Return a new long for the modulo of this long by 'other'."
+
+        return self._binary_op(long_mod, other)
+
+    def __ipow__(self, other):
+
+        "Return a new long for the exponentiation of this long by 'other'."
+
+        return self._binary_op(long_pow, other)
+
+    def __iand__(self, other):
+
+        "Return a new long for the binary-and of this long and 'other'."
+
+        return self._binary_op(long_and, other)
+
+    def __ior__(self, other):
+
+        "Return a new long for the binary-or of this long and 'other'."
+
+        return self._binary_op(long_or, other)
+
+    def __ixor__(self, other):
+
+        "Return a new long for the exclusive-or of this long and 'other'."
+
+        return self._binary_op(long_xor, other)
+
+    def __invert__(self):
+
+        "Return the inversion of this long."
+
+        return long_not(self)
+
+    __add__ = __radd__ = __iadd__
+    __sub__ = __isub__
+
+    def __rsub__(self, other):
+
+        "Return a new long for the subtraction of this long from 'other'."
+
+        return self._binary_op_rev(long_sub, other)
+
+    __mul__ = __rmul__ = __imul__
+    __div__ = __floordiv__ = __ifloordiv__ = __idiv__
+
+    def __rdiv__(self, other):
+
+        "Return a new long for the division of 'other' by this long."
+
+        return self._binary_op_rev(long_div, other)
+
+    __rfloordiv__ = __rdiv__
+    __mod__ = __imod__
+
+    def __rmod__(self, other):
+
+        "Return a new long for the modulo of 'other' by this long."
+
+        return self._binary_op_rev(long_mod, other)
+
+    __pow__ = __ipow__
+
+    def __rpow__(self, other):
+
+        "Return a new long for the exponentiation of 'other' by this long."
+
+        return self._binary_op_rev(long_pow, other)
+
+    __and__ = __rand__ = __iand__
+    __or__ = __ror__ = __ior__
+    __xor__ = __rxor__ = __ixor__
+
+    def __lshift__(self, other):
+
+        "Return a new long left-shifted by 'other'."
+
+        return self._binary_op(long_lshift, other)
+
+    def __rlshift__(self, other):
+
+        "Return a new long for 'other' left-shifted by this long."
+
+        return self._binary_op_rev(long_lshift, other)
+
+    def __rshift__(self, other):
+
+        "Return a new long right-shifted by 'other'."
+
+        return self._binary_op(long_rshift, other)
+
+    def __rrshift__(self, other):
+
+        "Return a new long for 'other' right-shifted by this long."
+
+        return self._binary_op_rev(long_rshift, other)
+
+    __ilshift__ = __lshift__
+    __irshift__ = __rshift__
+
+    def __lt__(self, other):
+
+        "Return whether this long is less than 'other'."
+
+        return self._binary_op(long_lt, other)
+
+    def __gt__(self, other):
+
+        "Return whether this long is greater than 'other'."
+
+        return self._binary_op(long_gt, other)
+
+    def __le__(self, other):
+
+        "Return whether this long is less than or equal to 'other'."
+
+        return self._binary_op(long_le, other)
+
+    def __ge__(self, other):
+
+        "Return whether this long is greater than or equal to 'other'."
+
+        return self._binary_op(long_ge, other)
+
+    def __eq__(self, other):
+
+        "Return whether this long is equal to 'other'."
+
+        return self._binary_op(long_eq, other)
+
+    def __ne__(self, other):
+
+        "Return whether this long is not equal to 'other'."
+
+        return self._binary_op(long_ne, other)
+
+    def __neg__(self):
+
+        "Apply the unary negation operator."
+
+        return long_neg(self)
+
+    def __pos__(self):
+
+        "Apply the unary positive operator."
+
+        return self
+
+    def __str__(self):
+
+        "Return a string representation."
+
+        return unicode(long_str(self))
+
+    def __repr__(self):
+
+        "Return a program representation."
+
+        return unicode(long_str(self) + "L")
+
+    def __bool__(self):
+
+        "Return whether this long is non-zero."
+
+        return long_ne(self, 0)
 
 # vim: tabstop=4 expandtab shiftwidth=4
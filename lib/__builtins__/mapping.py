@@ -19,102 +19,66 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from __builtins__.span import _max
-from native import is_int
+from native import is_int, mapping_contains, mapping_init, mapping_len, \
+                   mapping_remove
 
-class hashtable:
-
-    "A dictionary representation mapping keys to values."
-
-    def _get_buckets(self, capacity):
-
-        """
-        Reserve an attribute for a hashtable reference along with some space
-        for elements.
-        """
-
-        buckets = []
-        capacity = _max(capacity, 5)
-        i = 0
-
-        while i < capacity:
-            buckets.append([])
-            i += 1
-
-        return buckets
-
-    def _get_entry(self, buckets, key):
+def _eq(a, b):
 
-        "Return the index and entry index as a tuple in 'buckets' for 'key'."
+    """
+    Return whether 'a' and 'b' are equal, employed by the native mapping
+    operations to compare keys that they cannot compare themselves.
+    """
 
-        # Find an index identifying the bucket involved.
+    return a == b
 
-        index = self._get_index(buckets, key)
-
-        # Find the entry index within the bucket of the key.
+class hashtable:
 
-        i = self._find_entry(buckets, key, index)
+    """
+    A hashtable representation retaining items in insertion order, with the
+    native __data__ member referencing the table of items.
+    """
 
-        return index, i
+    def _get_hash(self, key):
 
-    def _get_index(self, buckets, key):
+        "Return the hash value for 'key' or raise TypeError."
 
-        """
-        Find in 'buckets' the given 'key', returning an index or raising
-        TypeError.
-        """
+        if is_int(key):
+            return key
 
-        index = key.__hash__()
+        hash = key.__hash__()
 
-        if not is_int(index):
+        if not is_int(hash):
             raise TypeError
 
-        return index % len(self.buckets)
-
-    def _items(self):
-
-        "Return the values stored in all buckets."
-
-        l = []
-        for bucket in self.buckets:
-            l += bucket
-        return l
+        return hash
 
     def _remove_entry(self, key):
 
         "Remove the entry associated with the given 'key'."
 
-        index, i = self._get_entry(self.buckets, key)
-
-        if index is None or i is None:
+        if not mapping_remove(self.__data__, key, self._get_hash(key), _eq):
             raise KeyError, key
 
-        del self.buckets[index][i]
-        self.size -= 1
+    # Public special methods.
 
-    # Methods implemented by subclasses:
+    def __contains__(self, key):
 
-    # _find_entry(self, buckets, key, index)
-    # _resize(self, capacity)
+        "Return whether 'key' is in the mapping."
 
-    # Public special methods.
+        return mapping_contains(self.__data__, key, self._get_hash(key), _eq)
 
     def __len__(self):
 
         "Return the number of items in the mapping."
 
-        n = 0
-        for bucket in self.buckets:
-            n += bucket.__len__()
-        return n
+        return mapping_len(self.__data__)
 
     # Public conventional methods.
 
     def clear(self):
 
-        "Reset the dictionary to an empty state."
+        "Reset the mapping to an empty state."
 
-        self.size = 0
-        self.buckets = self._get_buckets(0)
+        self.__data__ = mapping_init(0)
 
 # vim: tabstop=4 expandtab shiftwidth=4
@@ -283,6 +283,35 @@ def _get_absolute_index(index, length):
     else:
         return index
 
+def _get_range_indexes(start, end, length):
+
+    """
+    Return the absolute indexes for 'start' and 'end' given a collection having
+    the specified 'length', with null indexes indicating the start and end of
+    the collection, and with the indexes limited to those within the
+    collection.
+    """
+
+    if start is None:
+        start = 0
+    else:
+        start = _get_absolute_index(start, length)
+        if start < 0:
+            start = 0
+        elif start > length:
+            start = length
+
+    if end is None:
+        end = length
+    else:
+        end = _get_absolute_index(end, length)
+        if end < start:
+            end = start
+        elif end > length:
+            end = length
+
+    return start, end
+
 def _test_length(seq, length):
 
     "Helper function for asserting that 'seq' is of the given 'length'."
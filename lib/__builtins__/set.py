@@ -19,7 +19,9 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from __builtins__.mapping import hashtable
+from __builtins__.mapping import hashtable, _eq
+from native import mapping_key, mapping_keys, mapping_len, mapping_next, \
+                   mapping_pop, mapping_set
 
 class frozenset(hashtable):
 
@@ -33,53 +35,8 @@ class frozenset(hashtable):
 
         if iterable is not None:
             for value in iterable:
-                self._setitem(self.buckets, value)
-
-    # Implementation methods.
-
-    def _find_entry(self, buckets, value, index):
-
-        """
-        Search in 'buckets' for 'value', using an 'index' identifying the bucket
-        involved.
-        """
-
-        i = 0
-
-        for found in buckets[index]:
-            if found == value:
-                return i
-            i += 1
-
-        return None
-
-    def _resize(self, capacity):
-
-        "Resize the hashtable to have the given 'capacity'."
-
-        buckets = self._get_buckets(capacity)
-
-        for value in self._items():
-            self._setitem(buckets, value)
-
-        self.buckets = buckets
-
-    def _setitem(self, buckets, value):
-
-        "Set in the 'buckets' an item having the given 'value'."
-
-        index, i = self._get_entry(buckets, value)
-
-        # With no existing entry, append to the bucket.
-
-        if i is None:
-            buckets[index].append(value)
-            self.size += 1
-
-        # With an existing entry, replace the item.
-
-        else:
-            buckets[index][i] = value
+                mapping_set(self.__data__, value, self._get_hash(value),
+                            None, _eq)
 
     # String representations.
 
@@ -90,7 +47,7 @@ class frozenset(hashtable):
         b = buffer()
         b.append(name)
         b.append("(")
-        b.append(self._items().__repr__())
+        b.append(mapping_keys(self.__data__).__repr__())
         b.append(")")
         return str(b)
 
@@ -104,13 +61,6 @@ class frozenset(hashtable):
 
     # Public special methods.
 
-    def __contains__(self, value):
-
-        "Return whether 'value' is in the set."
-
-        index, i = self._get_entry(self.buckets, value)
-        return i is not None
-
     def __iter__(self):
 
         "Return an iterator."
@@ -227,12 +177,7 @@ class set(frozenset):
 
         "Add the given 'value' to the set."
 
-        capacity = len(self.buckets)
-
-        if self.size > capacity:
-            self._resize(capacity * 2)
-
-        self._setitem(self.buckets, value)
+        mapping_set(self.__data__, value, self._get_hash(value), None, _eq)
 
     def difference_update(self, other):
 
@@ -267,14 +212,12 @@ class set(frozenset):
 
         "Remove and return an arbitrary value."
 
-        # Get the last element from the first non-empty bucket.
+        # Remove the most recently added value.
 
-        for bucket in self.buckets:
-            if bucket:
-                self.size -= 1
-                return bucket.pop()
+        if not mapping_len(self.__data__):
+            raise KeyError
 
-        raise KeyError
+        return mapping_pop(self.__data__)
 
     def remove(self, value):
 
@@ -310,31 +253,31 @@ class setiterator:
 
         self.mapping = mapping
         self.index = 0
-        self.i = 0
 
-    def next(self):
+    def __hasnext__(self):
 
-        "Return the next value."
+        """
+        Return whether another value is available, advancing to the entry
+        providing any such value.
+        """
 
-        while True:
+        index = mapping_next(self.mapping.__data__, self.index)
 
-            # Access the current bucket. If no such bucket exists, stop.
+        if index == -1:
+            return False
 
-            try:
-                bucket = self.mapping.buckets[self.index]
-            except IndexError:
-                raise StopIteration, self
+        self.index = index
+        return True
+
+    def next(self):
 
-            # Access the current item. If no such item exists, get another
-            # bucket.
+        "Return the next value or raise a StopIteration exception."
 
-            try:
-                value = bucket[self.i]
-                self.i += 1
-                return value
+        if not self.__hasnext__():
+            raise StopIteration, self
 
-            except IndexError:
-                self.index += 1
-                self.i = 0
+        value = mapping_key(self.mapping.__data__, self.index)
+        self.index += 1
+        return value
 
 # vim: tabstop=4 expandtab shiftwidth=4
@@ -96,6 +96,12 @@ class xrangeiterator:
 
         self.current = start
 
+    def __hasnext__(self):
+
+        "Return a true value if another item is available."
+
+        return self.count
+
     def next(self):
 
         "Return the next item or raise a StopIteration exception."
@@ -108,7 +114,7 @@ class xrangeiterator:
         self.count = self.count.__sub__(1)
         return current
 
-def range(start_or_end, end=None, step=1):
+def range(start_or_end, end=slice.NO_END, step=1):
 
     "Implementation of range."
 
@@ -19,12 +19,16 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from __builtins__.character import _base
 from __builtins__.operator import _negate
-from __builtins__.sequence import hashable, itemaccess
+from __builtins__.sequence import hashable, itemaccess, _get_absolute_index, \
+                                  _get_range_indexes
 from __builtins__.types import check_int
-from native import isinstance as _isinstance, \
-                   str_add, str_lt, str_gt, str_eq, str_ord, \
-                   str_size, str_substr
+from native import isinstance as _isinstance, is_int, \
+                   str_add, str_lt, str_gt, str_eq, str_hash, str_ord, \
+                   str_size, str_substr, str_find, str_rfind, str_lower, \
+                   str_upper, str_replace, str_split, str_rsplit, \
+                   str_splitlines, str_strip, str_format, str_format_codes
 
 WHITESPACE = (" ", "\f", "\n", "\r", "\t")
 
@@ -44,6 +48,9 @@ class basestring(hashable):
         # a string is the same as an attribute name, the __key__ member contains
         # attribute position and code details.
 
+        # Note the __hashvalue__ member. This is also initialised statically
+        # for literals, being otherwise computed when first needed.
+
         # NOTE: Cannot perform "other and other.__data__ or None" since the
         # NOTE: __data__ attribute is not a normal attribute.
 
@@ -51,10 +58,12 @@ class basestring(hashable):
             self.__data__ = other.__data__
             self.__key__ = other.__key__
             self.__size__ = other.__size__
+            self.__hashvalue__ = other.__hashvalue__
         else:
             self.__data__ = None
             self.__key__ = None
             self.__size__ = None
+            self.__hashvalue__ = None
 
     # Internal methods.
 
@@ -178,7 +187,7 @@ class basestring(hashable):
 
         "Return a value for hashing purposes."
 
-        return self._hashvalue(ord)
+        return str_hash(self)
 
     __len__ = bytelength
 
@@ -405,7 +414,36 @@ class basestring(hashable):
 
         return self[i:]
 
-    def replace(self, old, new, count=None): pass
+    def replace(self, old, new, count=None):
+
+        """
+        Return a string with occurrences of 'old' replaced by 'new', replacing
+        at most 'count' occurrences (or all occurrences if omitted or specified
+        as None).
+        """
+
+        # Insert the replacement before each character and at the end of the
+        # string when replacing an empty string.
+
+        if not old:
+            length = self.__len__()
+
+            if count is None or count < 0 or count > length + 1:
+                count = length + 1
+            elif count == 0:
+                return self
+
+            l = [""]
+            i = 0
+
+            while i < count - 1:
+                l.append(self[i])
+                i += 1
+
+            l.append(self[i:])
+            return new.join(l)
+
+        return new.join(self.split(old, count))
 
     def rfind(self, sub, start=None, end=None):
 
@@ -607,6 +645,245 @@ class str(basestring):
         l = get_using(basestring.__get_multiple_items__, self)(start, end, step)
         return "".join(l)
 
+    def __mod__(self, other):
+
+        """
+        Format 'other' using this string. Each value is converted to the string
+        or number required by its conversion before the string is formatted
+        natively.
+        """
+
+        if not _isinstance(other, tuple):
+            other = (other,)
+
+        # Obtain a code for each value consumed by the format, this being the
+        # conversion character or "*" for a width or precision.
+
+        codes = str_format_codes(self)
+        n = codes.__len__()
+
+        if n != other.__len__():
+            raise TypeError
+
+        values = []
+        i = 0
+
+        while i < n:
+            code = codes[i]
+            value = other[i]
+
+            if code == "s":
+                value = str(value)
+
+            elif code == "r":
+                value = repr(value)
+
+            elif code == "c":
+                if is_int(value):
+                    value = chr(value)
+                elif not _isinstance(value, basestring) or value.__len__() != 1:
+                    raise TypeError
+
+            elif code in "eEfFgG":
+                value = float(value)
+
+            elif code == "*":
+                check_int(value)
+
+            # Integers are obtained for other conversions, with long integers
+            # being formatted from their digits in the appropriate base.
+
+            else:
+                if not is_int(value):
+                    value = int(value)
+
+                if _isinstance(value, long):
+                    if code == "o":
+                        value = _base(value, 8)
+                    elif code == "x":
+                        value = _base(value, 16)
+                    elif code == "X":
+                        value = _base(value, 16).upper()
+                    else:
+                        value = str(value)
+
+            values.append(value)
+            i += 1
+
+        return str_format(self, values.__data__)
+
+    def _get_limit(self, limit):
+
+        "Return 'limit' as an integer, with None indicating no limit."
+
+        if limit is None:
+            return -1
+
+        check_int(limit)
+        return limit
+
+    def _get_search_indexes(self, start, end):
+
+        """
+        Return the absolute indexes for 'start' and 'end' limited to those
+        within the string, or None for both if 'start' is beyond the end of the
+        string and thus no search can succeed.
+        """
+
+        length = self.__len__()
+
+        if start is not None and _get_absolute_index(start, length) > length:
+            return None, None
+
+        return _get_range_indexes(start, end, length)
+
+    # String-specific methods employing native operations on the string data.
+    # Non-string arguments are handled by the general methods.
+
+    def find(self, sub, start=None, end=None):
+
+        """
+        Find 'sub' in the string if it occurs from or after the 'start' position
+        (or 0, if omitted) and before the 'end' position (or the end of the
+        string, if omitted), returning the earliest occurrence or -1 if 'sub' is
+        not present.
+        """
+
+        if not _isinstance(sub, str):
+            return get_using(basestring.find, self)(sub, start, end)
+
+        start, end = self._get_search_indexes(start, end)
+
+        if start is None:
+            return -1
+
+        return str_find(self, sub, start, end)
+
+    def lower(self):
+
+        "Return a lower case version of the string."
+
+        return str_lower(self)
+
+    def lstrip(self, chars=None):
+
+        """
+        Strip any of the given 'chars' from the start of the string, or strip
+        whitespace characters is 'chars' is omitted or None.
+        """
+
+        if chars is not None and not _isinstance(chars, str):
+            return get_using(basestring.lstrip, self)(chars)
+
+        return str_strip(self, chars, 1)
+
+    def replace(self, old, new, count=None):
+
+        """
+        Return a string with occurrences of 'old' replaced by 'new', replacing
+        at most 'count' occurrences (or all occurrences if omitted or specified
+        as None).
+        """
+
+        if not _isinstance(old, str) or not _isinstance(new, str):
+            return get_using(basestring.replace, self)(old, new, count)
+
+        return str_replace(self, old, new, self._get_limit(count))
+
+    def rfind(self, sub, start=None, end=None):
+
+        """
+        Find 'sub' in the string if it occurs from or after the 'start' position
+        (or 0, if omitted) and before the 'end' position (or the end of the
+        string, if omitted), returning the latest occurrence or -1 if 'sub' is
+        not present.
+        """
+
+        if not _isinstance(sub, str):
+            return get_using(basestring.rfind, self)(sub, start, end)
+
+        start, end = self._get_search_indexes(start, end)
+
+        if start is None:
+            return -1
+
+        return str_rfind(self, sub, start, end)
+
+    def rsplit(self, sep=None, maxsplit=None):
+
+        """
+        Split the string using the given 'sep' as separator (or any whitespace
+        character if omitted or specified as None), splitting at most 'maxsplit'
+        times (or as many times as is possible if omitted or specified as None).
+        Where 'maxsplit' is given, the number of split points is counted from
+        the end of the string.
+        """
+
+        if sep is not None and not _isinstance(sep, str):
+            return get_using(basestring.rsplit, self)(sep, maxsplit)
+
+        if sep is not None and not sep:
+            raise ValueError, sep
+
+        return str_rsplit(self, sep, self._get_limit(maxsplit))
+
+    def rstrip(self, chars=None):
+
+        """
+        Strip any of the given 'chars' from the end of the string, or strip
+        whitespace characters is 'chars' is omitted or None.
+        """
+
+        if chars is not None and not _isinstance(chars, str):
+            return get_using(basestring.rstrip, self)(chars)
+
+        return str_strip(self, chars, 2)
+
+    def split(self, sep=None, maxsplit=None):
+
+        """
+        Split the string using the given 'sep' as separator (or any whitespace
+        character if omitted or specified as None), splitting at most 'maxsplit'
+        times (or as many times as is possible if omitted or specified as None).
+        Where 'maxsplit' is given, the number of split points is counted from
+        the start of the string.
+        """
+
+        if sep is not None and not _isinstance(sep, str):
+            return get_using(basestring.split, self)(sep, maxsplit)
+
+        if sep is not None and not sep:
+            raise ValueError, sep
+
+        return str_split(self, sep, self._get_limit(maxsplit))
+
+    def splitlines(self, keepends=False):
+
+        """
+        Split the string into lines, retaining line endings if 'keepends' is
+        specified as a true value.
+        """
+
+        return str_splitlines(self, keepends)
+
+    def strip(self, chars=None):
+
+        """
+        Strip any of the given 'chars' from the start and end of the string, or
+        strip whitespace characters is 'chars' is omitted or None.
+        """
+
+        if chars is not None and not _isinstance(chars, str):
+            return get_using(basestring.strip, self)(chars)
+
+        return str_strip(self, chars, 3)
+
+    def upper(self):
+
+        "Return an upper case version of the string."
+
+        return str_upper(self)
+
 def new_str(obj):
 
     "Return the string representation of 'obj'."
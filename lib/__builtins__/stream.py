@@ -20,7 +20,8 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from __builtins__.types import check_int, check_string
-from native import isinstance as _isinstance, fclose, fflush, fread, fwrite
+from native import isinstance as _isinstance, fclose, fflush, fread, \
+                   freadline, fwrite
 
 class filestream:
 
@@ -97,43 +98,40 @@ class filestream:
         if n > 0:
             s = fread(self.__data__, n)
 
-        # Read until an end-of-line indicator.
+        # Read until an end-of-line indicator or end-of-file.
 
         else:
-            l = []
-
-            # Read until end-of-line or end-of-file.
-
             try:
-                while not self._read_until_newline(l):
-                    pass
+                s = freadline(self.__data__)
 
             # Handle end-of-file reads.
 
             except EOFError:
-                pass
-
-            s = "".join(l)
+                s = ""
 
         return self._convert(s)
 
-    def _read_data(self, l):
+    def readlines(self, n=None):
 
-        "Read data into 'l'."
+        """
+        Read lines until end-of-file, returning them in a list. Any size hint
+        'n' is ignored.
+        """
 
-        l.append(fread(self.__data__, self.bufsize))
+        l = []
+        s = self.readline()
 
-    def _read_until_newline(self, l):
+        while s:
+            l.append(s)
+            s = self.readline()
 
-        "Read data into 'l', returning whether a newline has been read."
+        return l
 
-        # NOTE: Only POSIX newlines are supported currently.
+    def _read_data(self, l):
 
-        s = fread(self.__data__, 1)
-        l.append(s)
-        return s == "\n"
+        "Read data into 'l'."
 
-    def readlines(self, n=None): pass
+        l.append(fread(self.__data__, self.bufsize))
 
     def write(self, s):
 
@@ -149,6 +147,25 @@ class filestream:
 
         fwrite(self.__data__, s)
 
+    # Iteration over lines.
+
+    def __iter__(self):
+
+        "Return an iterator over the lines in the stream."
+
+        return self
+
+    def next(self):
+
+        "Return the next line or raise a StopIteration exception."
+
+        s = self.readline()
+
+        if not s:
+            raise StopIteration, self
+
+        return s
+
     def close(self):
 
         "Close the stream."
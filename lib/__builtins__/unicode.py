@@ -22,7 +22,8 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 from __builtins__.str import basestring
 from __builtins__.types import check_int
 from posix.iconv import Converter
-from native import str_add, unicode_len, unicode_ord, unicode_substr, \
+from native import str_add, str_size, str_substr, unicode_len, \
+                   unicode_offsets, unicode_ord, unicode_substr, \
                    isinstance as _isinstance
 
 class unicode(basestring):
@@ -40,7 +41,12 @@ class unicode(basestring):
         format, but where the original encoding needs to be communicated.
         """
 
+        # Cache the length, whether the string only employs ASCII characters,
+        # and an index of character positions, all computed when needed.
+
         self.length = None
+        self.ascii = None
+        self.offsets = None
 
         # Initialise using another Unicode object.
 
@@ -128,6 +134,30 @@ class unicode(basestring):
         else:
             return result
 
+    def _get_offsets(self):
+
+        "Return the index of character positions, computing it if necessary."
+
+        if self.offsets is None:
+            self.offsets = unicode_offsets(self.__data__, self.__size__)
+
+        return self.offsets
+
+    def _substr(self, start, end, step):
+
+        """
+        Return the characters from 'start' until (but excluding) 'end', at
+        'step' intervals, employing byte positions directly for ASCII strings.
+        """
+
+        if self.ascii:
+            s = str_substr(self.__data__, start, end, step)
+        else:
+            s = unicode_substr(self.__data__, self.__size__, start, end, step,
+                               self._get_offsets())
+
+        return unicode(s, None, self.encoding)
+
     def _quote_value(self, b, n):
 
         "Append to 'b' the quoted form of 'n'."
@@ -173,6 +203,7 @@ class unicode(basestring):
 
         if self.length is None:
             self.length = unicode_len(self.__data__, self.__size__)
+            self.ascii = self.length == str_size(self.__size__)
 
         return self.length
 
@@ -238,11 +269,11 @@ class unicode(basestring):
     # Special implementation methods.
 
     def __get_single_item__(self, index):
-    
+
         "Return the item at the normalised (positive) 'index'."
- 
+
         self._check_index(index)
-        return unicode(unicode_substr(self.__data__, self.__size__, index, index + 1, 1), None, self.encoding)
+        return self._substr(index, index + 1, 1)
 
     def __get_multiple_items__(self, start, end, step):
 
@@ -259,7 +290,21 @@ class unicode(basestring):
         if step == 0:
             raise ValueError(step)
 
-        l = get_using(basestring.__get_multiple_items__, self)(start, end, step)
-        return unicode("".join(l), None, self.encoding)
+        # Empty ranges produce empty strings.
+
+        if step > 0 and start > end or step < 0 and start < end:
+            return unicode("", None, self.encoding)
+
+        # Check the first and last characters in the range.
+
+        if step > 0:
+            last = start + (end - start - 1) / step * step
+        else:
+            last = start + (end - start + 1) / step * step
+
+        self._check_index(start)
+        self._check_index(last)
+
+        return self._substr(start, end, step)
 
 # vim: tabstop=4 expandtab shiftwidth=4
@@ -21,10 +21,16 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from native.buffer import buffer_str
 
+from native.float import float_add, float_div, float_floordiv, float_mod, \
+                         float_mul, float_neg, float_pow, float_sub, \
+                         float_eq, float_ge, float_gt, float_le, float_lt, \
+                         float_ne, float_hash, float_int, float_parse, \
+                         float_repr, float_str
+
 from native.identity import is_, is_not
 
-from native.int import int_add, int_div, int_mod, int_mul, int_neg, int_pow, \
-                       int_sub, int_and, int_not, int_or, int_xor, \
+from native.int import int_add, int_div, int_floordiv, int_mod, int_mul, \
+                       int_neg, int_pow, int_sub, int_and, int_not, int_or, int_xor, \
                        int_lshift, int_rshift, \
                        int_eq, int_ge, int_gt, int_le, int_lt, int_ne, \
                        int_str, is_int
@@ -33,24 +39,46 @@ from native.introspection import object_getattr, isinstance, issubclass
 
 from native.iconv import iconv, iconv_close, iconv_open, iconv_reset
 
-from native.io import fclose, fflush, fopen, fdopen, close, read, write, fread, fwrite
+from native.io import fclose, fflush, fopen, fdopen, close, read, write, fread, \
+                      freadline, fwrite
 
 from native.limits import get_maxint, get_minint
 
 from native.list import list_init, list_setsize, list_append, list_concat, \
-                        list_len, list_nonempty, list_element, list_setelement
+                        list_insert, list_delete, list_replace, \
+                        list_len, list_nonempty, list_element, list_setelement, \
+                        list_sort
+
+from native.long import long_add, long_div, long_mod, long_mul, long_neg, \
+                        long_pow, long_sub, long_and, long_not, long_or, \
+                        long_xor, long_lshift, long_rshift, \
+                        long_eq, long_ge, long_gt, long_le, long_lt, long_ne, \
+                        long_float, long_hash, long_new, long_parse, long_str
 
 from native.locale import getlocale, setlocale
 
+from native.mapping import mapping_init, mapping_len, mapping_contains, \
+                           mapping_get, mapping_set, mapping_remove, \
+                           mapping_pop, mapping_next, mapping_key, \
+                           mapping_keys, mapping_values, mapping_items
+
 from native.program import get_using
 
-from native.str import str_add, str_chr, str_eq, str_gt, str_lt, \
-                       str_ord, str_size, str_substr
+from native.str import str_add, str_chr, str_eq, str_find, str_format, \
+                       str_format_codes, str_gt, str_hash, \
+                       str_lower, str_lt, str_ord, str_replace, str_rfind, \
+                       str_rsplit, str_size, str_split, str_splitlines, \
+                       str_strip, str_substr, str_upper
 
 from native.system import exit, get_argv, get_path
 
+from native.thread import thread_start, thread_join, lock_init, lock_acquire, \
+                          lock_release, cond_init, cond_wait, cond_notify, \
+                          cond_notify_all
+
 from native.tuple import tuple_init
 
-from native.unicode import unicode_len, unicode_ord, unicode_substr, unicode_unichr
+from native.unicode import unicode_len, unicode_offsets, unicode_ord, \
+                           unicode_substr, unicode_unichr
 
 # vim: tabstop=4 expandtab shiftwidth=4
@@ -26,23 +26,24 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 
 def is_int(obj): return True or False
 
-# NOTE: Update return types when integers eventually get promoted to longs.
-# NOTE: Example values used to provide type information.
+# NOTE: Example values used to provide type information. Results that cannot
+# NOTE: be represented as integers are promoted to long integers.
 
-def int_add(self, other): return 0
-def int_div(self, other): return 0
+def int_add(self, other): return 0 or 0L
+def int_div(self, other): return 0 or 0L
+def int_floordiv(self, other): return 0 or 0L
 def int_mod(self, other): return 0
-def int_mul(self, other): return 0
-def int_neg(self): return 0
-def int_pow(self, other): return 0
-def int_sub(self, other): return 0
+def int_mul(self, other): return 0 or 0L
+def int_neg(self): return 0 or 0L
+def int_pow(self, other): return 0 or 0L or 0.0
+def int_sub(self, other): return 0 or 0L
 
 def int_and(self, other): return 0
 def int_not(self): return True or False
 def int_or(self, other): return 0
 def int_xor(self, other): return 0
 
-def int_lshift(self, other): return 0
+def int_lshift(self, other): return 0 or 0L
 def int_rshift(self, other): return 0
 
 def int_eq(self, other): return True or False
@@ -45,6 +45,11 @@ def fread(fp, n):
     EOFError
     return ""
 
+def freadline(fp):
+    IOError
+    EOFError
+    return ""
+
 def fwrite(fp, str):
     IOError
     EOFError
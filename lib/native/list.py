@@ -30,9 +30,13 @@ def list_init(size): pass
 def list_setsize(self, size): pass
 def list_append(self, value): pass
 def list_concat(self, other): pass
+def list_insert(self, index, value): pass
+def list_delete(self, start, end): pass
+def list_replace(self, start, end, other): pass
 def list_len(self): return 0
 def list_nonempty(self): return True or False
 def list_element(self, index): pass
 def list_setelement(self, index, value): pass
+def list_sort(self, keys, cmp, lt, reverse): pass
 
 # vim: tabstop=4 expandtab shiftwidth=4
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""
+Native library functions for long integers.
+
+None of these are actually defined here. Instead, native implementations are
+substituted when each program is built. It is, however, important to declare
+non-core exceptions used by the native functions because they need to be
+identified as being needed by the program.
+
+Copyright (C) 2021 Paul Boddie <paul@boddie.org.uk>
+
+This program is free software; you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation; either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+details.
+
+You should have received a copy of the GNU General Public License along with
+this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# NOTE: Example values used to provide type information. Results representable
+# NOTE: as integers are provided as integers.
+
+def long_new(number): return 0L
+def long_parse(value, base): return 0 or 0L
+
+def long_add(self, other): return 0 or 0L
+def long_div(self, other): return 0 or 0L
+def long_mod(self, other): return 0 or 0L
+def long_mul(self, other): return 0 or 0L
+def long_neg(self): return 0 or 0L
+def long_pow(self, other): return 0 or 0L or 0.0
+def long_sub(self, other): return 0 or 0L
+
+def long_and(self, other): return 0 or 0L
+def long_not(self): return 0 or 0L
+def long_or(self, other): return 0 or 0L
+def long_xor(self, other): return 0 or 0L
+
+def long_lshift(self, other): return 0 or 0L
+def long_rshift(self, other): return 0 or 0L
+
+def long_eq(self, other): return True or False
+def long_ge(self, other): return True or False
+def long_gt(self, other): return True or False
+def long_le(self, other): return True or False
+def long_lt(self, other): return True or False
+def long_ne(self, other): return True or False
+
+def long_float(self): return 0.0
+def long_hash(self): return 0
+def long_str(self): return ""
+
+# vim: tabstop=4 expandtab shiftwidth=4
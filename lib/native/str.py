@@ -30,9 +30,23 @@ def str_add(data, other_data, size, other_size): return ""
 def str_chr(data): return ""
 def str_eq(data, other_data): return True or False
 def str_gt(data, other_data): return True or False
+def str_hash(self): return 0
 def str_lt(data, other_data): return True or False
 def str_ord(data): return 0
 def str_size(size): return 0
 def str_substr(data, start, end, step): return ""
 
+def str_find(self, sub, start, end): return 0
+def str_rfind(self, sub, start, end): return 0
+def str_lower(self): return ""
+def str_upper(self): return ""
+def str_replace(self, old, new, count): return ""
+def str_split(self, sep, maxsplit): return [""]
+def str_rsplit(self, sep, maxsplit): return [""]
+def str_splitlines(self, keepends): return [""]
+def str_strip(self, chars, ends): return ""
+
+def str_format_codes(self): return ""
+def str_format(self, _data): return ""
+
 # vim: tabstop=4 expandtab shiftwidth=4
@@ -30,7 +30,8 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 
 def unicode_len(data, size): return 0
 def unicode_ord(data, size): return 0
-def unicode_substr(data, size, start, end, step): return ""
+def unicode_offsets(data, size): pass
+def unicode_substr(data, size, start, end, step, offsets): return ""
 def unicode_unichr(value): return ""
 
 # vim: tabstop=4 expandtab shiftwidth=4
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+"""
+Thread support.
+
+Threads run concurrently without any global interpreter lock, and so objects
+shared between threads must be protected by locks where they may be changed.
+
+Copyright (C) 2021 Paul Boddie <paul@boddie.org.uk>
+
+This program is free software; you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation; either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+details.
+
+You should have received a copy of the GNU General Public License along with
+this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from native import cond_init, cond_notify, cond_notify_all, cond_wait, \
+                   lock_acquire, lock_init, lock_release, \
+                   thread_join, thread_start
+
+class thread:
+
+    "A thread invoking a callable."
+
+    def __init__(self, function):
+
+        """
+        Start a thread invoking 'function' without any arguments. The result of
+        the function is made available when the thread is joined.
+        """
+
+        self.function = function
+        self.result = None
+        self.__data__ = thread_start(self._run)
+
+    def _run(self):
+
+        "Invoke the function, retaining its result."
+
+        function = self.function
+        self.result = function()
+
+    def join(self):
+
+        """
+        Wait for the thread to finish, returning the result of its function or
+        raising any exception raised by the function.
+        """
+
+        thread_join(self.__data__)
+        return self.result
+
+def start_new_thread(function):
+
+    "Start and return a thread invoking 'function' without any arguments."
+
+    return thread(function)
+
+class lock:
+
+    "A lock providing mutual exclusion between threads."
+
+    def __init__(self):
+
+        "Initialise the lock."
+
+        self.__data__ = lock_init()
+
+    def acquire(self, blocking=True):
+
+        """
+        Acquire the lock, waiting for it to become available if 'blocking' is
+        set. Return whether the lock was acquired.
+        """
+
+        return lock_acquire(self.__data__, blocking)
+
+    def release(self):
+
+        "Release the lock held by the current thread."
+
+        lock_release(self.__data__)
+
+allocate_lock = lock
+
+class condition:
+
+    "A condition variable employing a lock."
+
+    def __init__(self, lock=None):
+
+        "Initialise the condition with any given 'lock'."
+
+        if lock is None:
+            lock = allocate_lock()
+
+        self.lock = lock
+        self.__data__ = cond_init()
+
+    def acquire(self, blocking=True):
+
+        "Acquire the lock, waiting if 'blocking' is set."
+
+        return self.lock.acquire(blocking)
+
+    def release(self):
+
+        "Release the lock."
+
+        self.lock.release()
+
+    def wait(self):
+
+        """
+        Release the lock and wait for a notification, acquiring the lock again
+        before returning. The lock must be held by the current thread.
+        """
+
+        cond_wait(self.__data__, self.lock.__data__)
+
+    def notify(self):
+
+        "Wake a thread waiting on the condition."
+
+        cond_notify(self.__data__)
+
+    def notify_all(self):
+
+        "Wake all threads waiting on the condition."
+
+        cond_notify_all(self.__data__)
+
+# vim: tabstop=4 expandtab shiftwidth=4
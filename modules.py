@@ -22,11 +22,19 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from common import get_builtin_class, get_builtin_module, init_item, \
                    remove_items, CommonModule
-from encoders import decode_modifiers, decode_usage, encode_modifiers, encode_usage
-from referencing import decode_reference, Reference
+from encoders import encode_modifiers, encode_usage
+from errors import ProgramError
+from referencing import decode_reference, decode_reference_record, \
+                        encode_reference_record, Reference
 from results import ResolvedNameRef
+import marshal
 import sys
 
+# The cache schema version, to be incremented when the cache format changes.
+
+cache_schema = 1
+cache_header = "LPLC%04d" % cache_schema
+
 class BasicModule(CommonModule):
 
     "The basic module information."
@@ -371,314 +379,178 @@ class CachedModule(BasicModule):
 
         """
         Read a module's details from the file with the given 'filename' as
-        described in the to_cache method of InspectedModule.
+        described in the to_cache method of CacheWritingModule.
         """
 
-        f = open(filename)
+        f = open(filename, "rb")
         try:
-            self.filename = f.readline().rstrip()
-
-            f.readline() # (empty line)
-
-            self._get_imports(f)
-            self._get_deferred(f)
-            self._get_special(f)
-            self._get_members(f)
-            self._get_class_relationships(f)
-            self._get_instance_attrs(f)
-            self._get_instance_attr_constants(f)
-            self.from_lines(f, self.names_used)     # "names used:"
-            self._get_name_references(f)
-            self._get_initialised_names(f)
-            self._get_aliased_names(f)
-            self._get_function_parameters(f)
-            self._get_function_attr_initialisers(f)
-            self._get_function_defaults(f)
-            self._get_function_locals(f)
-            self.from_lines(f, self.scope_globals)  # "scope globals:"
-            self._get_attribute_usage(f)
-            self._get_attr_accesses(f)
-            self._get_const_accesses(f)
-            self._get_attr_accessors(f)
-            self._get_attr_access_modifiers(f)
-            self._get_constant_literals(f)
-            self._get_constant_values(f)
-            self._get_exception_namespaces(f)
-
+            s = f.read()
         finally:
             f.close()
 
+        # Check the header before reading the details in a single operation.
+
+        if not s.startswith(cache_header):
+            raise ProgramError("Cache file %s does not employ cache schema version %d." % (
+                filename, cache_schema))
+
+        details = marshal.loads(buffer(s, len(cache_header)))
+
+        self.filename = details["filename"]
+
+        self._get_imports(details)
+        self._get_deferred(details)
+        self._get_special(details)
+        self._get_members(details)
+        self._get_class_relationships(details)
+        self._get_instance_attrs(details)
+        self._get_instance_attr_constants(details)
+        self.from_sets(details["names used"], self.names_used)
+        self._get_name_references(details)
+        self._get_initialised_names(details)
+        self._get_aliased_names(details)
+        self._get_function_parameters(details)
+        self._get_function_attr_initialisers(details)
+        self._get_function_defaults(details)
+        self._get_function_locals(details)
+        self.from_sets(details["scope globals"], self.scope_globals)
+        self._get_attribute_usage(details)
+        self._get_attr_accesses(details)
+        self._get_const_accesses(details)
+        self._get_attr_accessors(details)
+        self._get_attr_access_modifiers(details)
+        self._get_constant_literals(details)
+        self._get_constant_values(details)
+        self._get_exception_namespaces(details)
+
     def complete(self):
         self.propagate()
 
-    def _get_imports(self, f):
-        f.readline() # "imports:"
-        line = f.readline().strip()
-        self.required = line != "{}" and set(line.split(", ")) or set()
-        line = f.readline().strip()
-        self.imports = line != "{}" and set(line.split(", ")) or set()
-        f.readline()
+    def _get_imports(self, details):
+        required, imports = details["imports"]
+        self.required = set(required)
+        self.imports = set(imports)
 
         for name in self.required:
             self.queue_module(name, True)
         for name in self.imports:
             self.queue_module(name)
 
-    def _get_deferred(self, f):
-        f.readline() # "deferred:"
-        line = f.readline().rstrip()
-        self.deferred = map(decode_reference, line.split(", "))
-        f.readline()
-
-    def _get_special(self, f):
-        f.readline() # "special:"
-        line = f.readline().rstrip()
-        while line:
-            name, ref, paths = self._get_fields(line, 3)
-            self.special[name] = decode_reference(ref), paths.split(", ")
-            line = f.readline().rstrip()
-
-    def _get_members(self, f):
-        f.readline() # "members:"
-        line = f.readline().rstrip()
-        while line:
-            name, ref = line.split(" ", 1)
-            self.set_object(name, ref)
-            line = f.readline().rstrip()
-
-    def _get_class_relationships(self, f):
-        f.readline() # "class relationships:"
-        line = f.readline().rstrip()
-        while line:
-            name, value = self._get_fields(line)
-            values = value and value.split(", ") or []
-            self.importer.classes[name] = self.classes[name] = map(decode_reference, values)
+    def _get_deferred(self, details):
+        self.deferred = map(decode_reference_record, details["deferred"])
+
+    def _get_special(self, details):
+        for name, ref, paths in details["special"]:
+            self.special[name] = decode_reference_record(ref), paths
+
+    def _get_members(self, details):
+        for name, ref in details["members"]:
+            self._set_object(name, decode_reference_record(ref, name))
+
+    def _get_class_relationships(self, details):
+        for name, bases in details["class relationships"]:
+            self.importer.classes[name] = self.classes[name] = map(decode_reference_record, bases)
             self.importer.subclasses[name] = set()
-            line = f.readline().rstrip()
-
-    def _get_instance_attrs(self, f):
-        f.readline() # "instance attributes:"
-        line = f.readline().rstrip()
-        while line:
-            name, value = self._get_fields(line)
-            self.importer.all_instance_attrs[name] = self.instance_attrs[name] = set(value and value.split(", ") or [])
-            line = f.readline().rstrip()
-
-    def _get_instance_attr_constants(self, f):
-        f.readline() # "instance attribute constants:"
-        line = f.readline().rstrip()
-        while line:
-            name, attrname, ref = self._get_fields(line, 3)
+
+    def _get_instance_attrs(self, details):
+        for name, attrnames in details["instance attributes"]:
+            self.importer.all_instance_attrs[name] = self.instance_attrs[name] = set(attrnames)
+
+    def _get_instance_attr_constants(self, details):
+        for name, attrname, ref in details["instance attribute constants"]:
             init_item(self.instance_attr_constants, name, dict)
-            self.instance_attr_constants[name][attrname] = decode_reference(ref)
-            line = f.readline().rstrip()
-
-    def _get_name_references(self, f):
-        f.readline() # "name references:"
-        line = f.readline().rstrip()
-        while line:
-            name, ref = self._get_fields(line)
-            self.importer.all_name_references[name] = self.name_references[name] = decode_reference(ref)
-            line = f.readline().rstrip()
-
-    def _get_initialised_names(self, f):
-        f.readline() # "initialised names:"
-        line = f.readline().rstrip()
-        while line:
-            path, name, version, value = self._get_fields(line, 4)
+            self.instance_attr_constants[name][attrname] = decode_reference_record(ref)
+
+    def _get_name_references(self, details):
+        for name, ref in details["name references"]:
+            self.importer.all_name_references[name] = self.name_references[name] = decode_reference_record(ref)
+
+    def _get_initialised_names(self, details):
+        for path, name, version, ref in details["initialised names"]:
             init_item(self.initialised_names, (path, name), dict)
-            self.initialised_names[(path, name)][int(version)] = decode_reference(value)
-            line = f.readline().rstrip()
-
-    def _get_aliased_names(self, f):
-        f.readline() # "aliased names:"
-        line = f.readline().rstrip()
-        while line:
-            path, name, version, original_path, original_name, attrnames, number = self._get_fields(line, 7)
+            self.initialised_names[(path, name)][version] = decode_reference_record(ref)
+
+    def _get_aliased_names(self, details):
+        for path, name, version, original_path, original_name, attrnames, number in details["aliased names"]:
             init_item(self.aliased_names, (path, name), dict)
-            if number == "{}": number = None
-            else: number = int(number)
             d = self.aliased_names[(path, name)]
-            init_item(d, int(version), list)
-            d[int(version)].append((original_path, original_name, attrnames != "{}" and attrnames or None, number))
-            line = f.readline().rstrip()
-
-    def _get_function_parameters(self, f):
-        f.readline() # "function parameters:"
-        line = f.readline().rstrip()
-        while line:
-            function, names = self._get_fields(line)
+            init_item(d, version, list)
+            d[version].append((original_path, original_name, attrnames, number))
+
+    def _get_function_parameters(self, details):
+        for function, names in details["function parameters"]:
             self.importer.function_parameters[function] = \
-                self.function_parameters[function] = names != "{}" and names.split(", ") or []
-            line = f.readline().rstrip()
-
-    def _get_function_attr_initialisers(self, f):
-        f.readline() # "function attribute initialisers:"
-        line = f.readline().rstrip()
-        while line:
-            function, names = self._get_fields(line)
+                self.function_parameters[function] = names
+
+    def _get_function_attr_initialisers(self, details):
+        for function, names in details["function attribute initialisers"]:
             self.importer.function_attr_initialisers[function] = \
-                self.function_attr_initialisers[function] = names != "{}" and names.split(", ") or []
-            line = f.readline().rstrip()
-
-    def _get_function_defaults(self, f):
-        f.readline() # "function default parameters:"
-        line = f.readline().rstrip()
-        while line:
-            function, defaults = self._get_fields(line)
+                self.function_attr_initialisers[function] = names
+
+    def _get_function_defaults(self, details):
+        for function, defaults in details["function default parameters"]:
             self.importer.function_defaults[function] = \
                 self.function_defaults[function] = l = []
-            if defaults != "{}":
-                for value in defaults.split(", "):
-                    name, default = value.split("=")
-                    default = decode_reference(default)
-                    l.append((name, default))
-            line = f.readline().rstrip()
-
-    def _get_function_locals(self, f):
-        f.readline() # "function locals:"
-        line = f.readline().rstrip()
-        while line:
-            function, name, value = self._get_fields(line, 3)
+            for name, default in defaults:
+                l.append((name, decode_reference_record(default)))
+
+    def _get_function_locals(self, details):
+        for function, names in details["function locals"]:
             init_item(self.function_locals, function, dict)
             init_item(self.importer.function_locals, function, dict)
-            if name != "{}":
+            for name, value in names:
                 self.importer.function_locals[function][name] = \
-                    self.function_locals[function][name] = decode_reference(value)
-            line = f.readline().rstrip()
-
-    def _get_attribute_usage(self, f):
-        f.readline() # "attribute usage:"
-        line = f.readline().rstrip()
-        while line:
-            unit, value = self._get_fields(line)
+                    self.function_locals[function][name] = decode_reference_record(value)
+
+    def _get_attribute_usage(self, details):
+        for unit, name, versions in details["attribute usage"]:
             init_item(self.attr_usage, unit, dict)
-            self.usage_from_cache(value, self.attr_usage[unit])
-            line = f.readline().rstrip()
-
-    def _get_attr_accesses(self, f):
-        f.readline() # "attribute accesses:"
-        line = f.readline().rstrip()
-        while line:
-            name, value = self._get_fields(line)
-            self.attr_accesses[name] = set(value.split(", "))
-            line = f.readline().rstrip()
-
-    def _get_const_accesses(self, f):
-        f.readline() # "constant accesses:"
-        line = f.readline().rstrip()
-        while line:
-            name, original_name, attrnames, objpath, ref, remaining = self._get_fields(line, 6)
-            if attrnames == "{}": attrnames = None
+            init_item(self.attr_usage[unit], name, list)
+            self.attr_usage[unit][name] += versions
+
+    def _get_attr_accesses(self, details):
+        for name, accesses in details["attribute accesses"]:
+            self.attr_accesses[name] = set(accesses)
+
+    def _get_const_accesses(self, details):
+        for name, original_name, attrnames, objpath, ref, remaining in details["constant accesses"]:
             init_item(self.const_accesses, name, dict)
-            self.const_accesses[name][(original_name, attrnames)] = (objpath, decode_reference(ref), remaining != "{}" and remaining or "")
-            line = f.readline().rstrip()
-
-    def _get_attr_accessors(self, f):
-        f.readline() # "attribute access usage:"
-        line = f.readline().rstrip()
-        while line:
-            objpath, name, attrname, value = self._get_fields(line, 4)
-            if attrname == "{}": attrname = None
+            self.const_accesses[name][(original_name, attrnames)] = (objpath, decode_reference_record(ref), remaining)
+
+    def _get_attr_accessors(self, details):
+        for objpath, name, attrname, positions in details["attribute access usage"]:
             access = name, attrname
             init_item(self.attr_accessors, objpath, dict)
             init_item(self.attr_accessors[objpath], access, list)
-            positions = map(int, value.split(", "))
             self.attr_accessors[objpath][access].append(positions)
-            line = f.readline().rstrip()
-
-    def _get_attr_access_modifiers(self, f):
-        f.readline() # "attribute access modifiers:"
-        line = f.readline().rstrip()
-        while line:
-            objpath, name, attrnames, value = self._get_fields(line, 4)
-            if name == "{}": name = None
-            if attrnames == "{}": attrnames = None
+
+    def _get_attr_access_modifiers(self, details):
+        for objpath, name, attrnames, modifiers in details["attribute access modifiers"]:
             access = name, attrnames
             init_item(self.attr_access_modifiers, objpath, dict)
-            init_item(self.attr_access_modifiers[objpath], access, list)
-            modifiers = decode_modifiers(value)
             self.attr_access_modifiers[objpath][access] = modifiers
-            line = f.readline().rstrip()
-
-    def _get_constant_literals(self, f):
-        f.readline() # "constant literals:"
-        line = f.readline().rstrip()
-        last_path = None
-        n = None
-        while line:
-            path, value_type, encoding, value = self._get_fields(line, 4)
-            if path != last_path:
-                n = 0
-                last_path = path
-            else:
-                n += 1
+
+    def _get_constant_literals(self, details):
+        for path, constants in details["constant literals"]:
             init_item(self.constants, path, dict)
-            value = eval(value)
-            encoding = encoding != "{}" and encoding or None
-            self.constants[path][(value, value_type, encoding)] = n
-            line = f.readline().rstrip()
-
-    def _get_constant_values(self, f):
-        f.readline() # "constant values:"
-        line = f.readline().rstrip()
-        while line:
-            name, value_type, encoding, value = self._get_fields(line, 4)
-            value = eval(value)
-            encoding = encoding != "{}" and encoding or None
-            self.constant_values[name] = value, value_type, encoding
-            line = f.readline().rstrip()
-
-    def _get_exception_namespaces(self, f):
-        f.readline() # "exception namespaces:"
-        value = f.readline().rstrip()
-        self.exception_namespaces = value and set(value.split(", ")) or set()
-        f.readline()
-
-    # Generic parsing methods.
-
-    def from_lines(self, f, d):
-
-        "Read lines from 'f', populating 'd'."
-
-        f.readline() # section heading
-        line = f.readline().rstrip()
-        while line:
-            name, value = self._get_fields(line)
-            d[name] = set(value and value.split(", ") or [])
-            line = f.readline().rstrip()
-
-    def usage_from_cache(self, value, mapping):
+            for n, constant in enumerate(constants):
+                self.constants[path][constant] = n
 
-        """
-        Interpret the given 'value' containing name and usage information,
-        storing the information in the given 'mapping'.
-        """
+    def _get_constant_values(self, details):
+        for name, constant in details["constant values"]:
+            self.constant_values[name] = constant
 
-        local, usage = self._get_fields(value)
-        init_item(mapping, local, list)
-        self._usage_from_cache(mapping[local], usage)
+    def _get_exception_namespaces(self, details):
+        self.exception_namespaces = set(details["exception namespaces"])
 
-    def _usage_from_cache(self, d, usage):
+    # Generic reading methods.
 
-        # Interpret descriptions of each version of the name.
+    def from_sets(self, l, d):
 
-        all_usages = set()
-        for attrnames in usage.split("; "):
-            if attrnames == "{}":
-                all_attrnames = ()
-            else:
-                all_attrnames = decode_usage(attrnames)
-            all_usages.add(all_attrnames)
+        "Populate 'd' with sets made from the name and value pairs in 'l'."
 
-        d.append(all_usages)
-
-    def _get_fields(self, s, n=2):
-        result = s.split(" ", n-1)
-        if len(result) == n:
-            return result
-        else:
-            return tuple(result) + tuple([""] * (n - len(result)))
+        for name, values in l:
+            d[name] = set(values)
 
 class CacheWritingModule:
 
@@ -691,221 +563,458 @@ class CacheWritingModule:
         """
         Write a cached representation of the inspected module to the file having
         the given 'filename'.
+
+        The file starts with a header indicating the schema version of the
+        cache, followed by a single marshalled dictionary mapping section names
+        to the details of each section. References are encoded as records, and
+        names are interned so that repeated names are stored only once.
         """
 
-        f = open(filename, "w")
+        details = intern_strings(self.get_cache_sections())
+
+        f = open(filename, "wb")
         try:
-            print >>f, self.filename
-
-            print >>f
-            print >>f, "imports:"
-            required = list(self.required)
-            required.sort()
-            print >>f, required and ", ".join(required) or "{}"
-            imports = list(self.imports)
-            imports.sort()
-            print >>f, imports and ", ".join(imports) or "{}"
-
-            print >>f
-            print >>f, "deferred:"
-            deferred = map(str, set(self.deferred))
-            deferred.sort()
-            print >>f, ", ".join(deferred)
-
-            print >>f
-            print >>f, "special:"
-            names = self.special.keys()
+            f.write(cache_header)
+            marshal.dump(details, f, 2)
+        finally:
+            f.close()
+
+    def get_cache_sections(self):
+
+        "Return a dictionary containing the sections of the cached module."
+
+        details = {}
+
+        details["filename"] = self.filename
+
+        required = list(self.required)
+        required.sort()
+        imports = list(self.imports)
+        imports.sort()
+        details["imports"] = required, imports
+
+        # Deferred references are ordered using their string forms.
+
+        deferred = []
+        for ref in set(self.deferred):
+            deferred.append((str(ref), encode_reference_record(ref)))
+        deferred.sort()
+        details["deferred"] = [record for (s, record) in deferred]
+
+        l = []
+        names = self.special.keys()
+        names.sort()
+        for name in names:
+            ref, paths = self.special[name]
+            l.append((name, encode_reference_record(ref), list(paths)))
+        details["special"] = l
+
+        l = []
+        objects = self.objects.keys()
+        objects.sort()
+        for name in objects:
+            l.append((name, encode_reference_record(self.objects[name])))
+        details["members"] = l
+
+        l = []
+        classes = self.classes.keys()
+        classes.sort()
+        for class_ in classes:
+            l.append((class_, map(encode_reference_record, self.classes[class_])))
+        details["class relationships"] = l
+
+        details["instance attributes"] = self.to_lists(self.instance_attrs)
+
+        l = []
+        classes = self.instance_attr_constants.items()
+        classes.sort()
+        for name, attrs in classes:
+            attrs = attrs.items()
+            attrs.sort()
+            for attrname, ref in attrs:
+                l.append((name, attrname, encode_reference_record(ref)))
+        details["instance attribute constants"] = l
+
+        details["names used"] = self.to_lists(self.names_used)
+
+        l = []
+        refs = self.name_references.items()
+        refs.sort()
+        for name, ref in refs:
+            l.append((name, encode_reference_record(ref)))
+        details["name references"] = l
+
+        l = []
+        assignments = self.initialised_names.items()
+        assignments.sort()
+        for (path, name), refs in assignments:
+            versions = refs.items()
+            versions.sort()
+            for version, ref in versions:
+                l.append((path, name, version, encode_reference_record(ref)))
+        details["initialised names"] = l
+
+        l = []
+        assignments = self.aliased_names.items()
+        assignments.sort()
+        for (path, name), aliases in assignments:
+            versions = aliases.items()
+            versions.sort()
+            for version, version_aliases in versions:
+                for alias in version_aliases:
+                    original_path, original_name, attrnames, number = alias
+                    l.append((path, name, version, original_path, original_name, attrnames or None, number))
+        details["aliased names"] = l
+
+        l = []
+        functions = self.function_parameters.keys()
+        functions.sort()
+        for function in functions:
+            l.append((function, list(self.function_parameters[function])))
+        details["function parameters"] = l
+
+        l = []
+        functions = self.function_attr_initialisers.keys()
+        functions.sort()
+        for function in functions:
+            l.append((function, list(self.function_attr_initialisers[function])))
+        details["function attribute initialisers"] = l
+
+        l = []
+        functions = self.function_defaults.keys()
+        functions.sort()
+        for function in functions:
+            defaults = []
+            for name, default in self.function_defaults[function]:
+                defaults.append((name, encode_reference_record(default)))
+            l.append((function, defaults))
+        details["function default parameters"] = l
+
+        l = []
+        functions = self.function_locals.keys()
+        functions.sort()
+        for function in functions:
+            names = self.function_locals[function].items()
             names.sort()
-            for name in names:
-                ref, paths = self.special[name]
-                print >>f, name, ref, ", ".join(paths)
-
-            print >>f
-            print >>f, "members:"
-            objects = self.objects.keys()
-            objects.sort()
-            for name in objects:
-                print >>f, name, self.objects[name]
-
-            print >>f
-            print >>f, "class relationships:"
-            classes = self.classes.keys()
-            classes.sort()
-            for class_ in classes:
-                bases = self.classes[class_]
-                if bases:
-                    print >>f, class_, ", ".join(map(str, bases))
-                else:
-                    print >>f, class_
-
-            self.to_lines(f, "instance attributes:", self.instance_attrs)
-
-            print >>f
-            print >>f, "instance attribute constants:"
-            classes = self.instance_attr_constants.items()
-            classes.sort()
-            for name, attrs in classes:
-                attrs = attrs.items()
-                attrs.sort()
-                for attrname, ref in attrs:
-                    print >>f, name, attrname, ref
-
-            self.to_lines(f, "names used:", self.names_used)
-
-            print >>f
-            print >>f, "name references:"
-            refs = self.name_references.items()
-            refs.sort()
-            for name, ref in refs:
-                print >>f, name, ref
-
-            print >>f
-            print >>f, "initialised names:"
-            assignments = self.initialised_names.items()
-            assignments.sort()
-            for (path, name), refs in assignments:
-                versions = refs.items()
-                versions.sort()
-                for version, ref in versions:
-                    print >>f, path, name, version, ref
-
-            print >>f
-            print >>f, "aliased names:"
-            assignments = self.aliased_names.items()
-            assignments.sort()
-            for (path, name), aliases in assignments:
-                versions = aliases.items()
-                versions.sort()
-                for version, version_aliases in versions:
-                    for alias in version_aliases:
-                        original_path, original_name, attrnames, number = alias
-                        print >>f, path, name, version, original_path, original_name, attrnames or "{}", number is None and "{}" or number
-
-            print >>f
-            print >>f, "function parameters:"
-            functions = self.function_parameters.keys()
-            functions.sort()
-            for function in functions:
-                parameters = self.function_parameters[function]
-                if parameters:
-                    print >>f, function, ", ".join(parameters)
-                else:
-                    print >>f, function, "{}"
-
-            print >>f
-            print >>f, "function attribute initialisers:"
-            functions = self.function_attr_initialisers.keys()
-            functions.sort()
-            for function in functions:
-                parameters = self.function_attr_initialisers[function]
-                if parameters:
-                    print >>f, function, ", ".join(parameters)
-                else:
-                    print >>f, function, "{}"
-
-            print >>f
-            print >>f, "function default parameters:"
-            functions = self.function_defaults.keys()
-            functions.sort()
-            for function in functions:
-                parameters = self.function_defaults[function]
-                if parameters:
-                    print >>f, function, ", ".join([("%s=%s" % (name, default)) for (name, default) in parameters])
-                else:
-                    print >>f, function, "{}"
-
-            print >>f
-            print >>f, "function locals:"
-            functions = self.function_locals.keys()
-            functions.sort()
-            for function in functions:
-                names = self.function_locals[function].items()
-                if names:
-                    names.sort()
-                    for name, value in names:
-                        print >>f, function, name, value
-                else:
-                    print >>f, function, "{}"
-
-            self.to_lines(f, "scope globals:", self.scope_globals)
-
-            print >>f
-            print >>f, "attribute usage:"
-            units = self.attr_usage.keys()
-            units.sort()
-            for unit in units:
-                d = self.attr_usage[unit]
-                self.usage_to_cache(d, f, unit)
-
-            print >>f
-            print >>f, "attribute accesses:"
-            paths = self.attr_accesses.keys()
-            paths.sort()
-            for path in paths:
-                accesses = list(self.attr_accesses[path])
-                accesses.sort()
-                print >>f, path, ", ".join(accesses)
-
-            print >>f
-            print >>f, "constant accesses:"
-            paths = self.const_accesses.keys()
-            paths.sort()
-            for path in paths:
-                accesses = self.const_accesses[path].items()
-                accesses.sort()
-                for (original_name, attrnames), (objpath, ref, remaining_attrnames) in accesses:
-                    print >>f, path, original_name, attrnames, objpath, ref, remaining_attrnames or "{}"
-
-            print >>f
-            print >>f, "attribute access usage:"
-            paths = self.attr_accessors.keys()
-            paths.sort()
-            for path in paths:
-                all_accesses = self.attr_accessors[path].items()
-                all_accesses.sort()
-                for (name, attrname), accesses in all_accesses:
-                    for positions in accesses:
-                        positions = map(str, positions)
-                        print >>f, path, name, attrname or "{}", ", ".join(positions)
-
-            print >>f
-            print >>f, "attribute access modifiers:"
-            paths = self.attr_access_modifiers.keys()
-            paths.sort()
-            for path in paths:
-                all_accesses = self.attr_access_modifiers[path].items()
-                all_accesses.sort()
-                for (name, attrnames), modifiers in all_accesses:
-                    print >>f, path, name or "{}", attrnames or "{}", encode_modifiers(modifiers)
-
-            print >>f
-            print >>f, "constant literals:"
-            paths = self.constants.keys()
-            paths.sort()
-            for path in paths:
-                constants = []
-                for (value, value_type, encoding), n in self.constants[path].items():
-                    constants.append((n, value_type, encoding, value))
-                constants.sort()
-                for n, value_type, encoding, value in constants:
-                    print >>f, path, value_type, encoding or "{}", repr(value)
-
-            print >>f
-            print >>f, "constant values:"
-            names = self.constant_values.keys()
+            locals = []
+            for name, value in names:
+                locals.append((name, encode_reference_record(value)))
+            l.append((function, locals))
+        details["function locals"] = l
+
+        details["scope globals"] = self.to_lists(self.scope_globals)
+
+        l = []
+        units = self.attr_usage.keys()
+        units.sort()
+        for unit in units:
+            d = self.attr_usage[unit]
+            names = d.keys()
             names.sort()
             for name in names:
-                value, value_type, encoding = self.constant_values[name]
-                print >>f, name, value_type, encoding or "{}", repr(value)
+                if d[name]:
+                    l.append((unit, name, map(normalise_usage_version, d[name])))
+        details["attribute usage"] = l
+
+        l = []
+        paths = self.attr_accesses.keys()
+        paths.sort()
+        for path in paths:
+            accesses = list(self.attr_accesses[path])
+            accesses.sort()
+            l.append((path, accesses))
+        details["attribute accesses"] = l
+
+        l = []
+        paths = self.const_accesses.keys()
+        paths.sort()
+        for path in paths:
+            accesses = self.const_accesses[path].items()
+            accesses.sort()
+            for (original_name, attrnames), (objpath, ref, remaining_attrnames) in accesses:
+                l.append((path, original_name, attrnames, objpath,
+                          encode_reference_record(ref), remaining_attrnames or ""))
+        details["constant accesses"] = l
+
+        l = []
+        paths = self.attr_accessors.keys()
+        paths.sort()
+        for path in paths:
+            all_accesses = self.attr_accessors[path].items()
+            all_accesses.sort()
+            for (name, attrname), accesses in all_accesses:
+                for positions in accesses:
+                    l.append((path, name, attrname or None, list(positions)))
+        details["attribute access usage"] = l
+
+        l = []
+        paths = self.attr_access_modifiers.keys()
+        paths.sort()
+        for path in paths:
+            all_accesses = self.attr_access_modifiers[path].items()
+            all_accesses.sort()
+            for (name, attrnames), modifiers in all_accesses:
+                l.append((path, name or None, attrnames or None,
+                          map(normalise_modifier, modifiers)))
+        details["attribute access modifiers"] = l
+
+        l = []
+        paths = self.constants.keys()
+        paths.sort()
+        for path in paths:
+            constants = []
+            for constant, n in self.constants[path].items():
+                constants.append((n, constant))
+            constants.sort()
+            l.append((path, [constant for (n, constant) in constants]))
+        details["constant literals"] = l
+
+        l = []
+        names = self.constant_values.keys()
+        names.sort()
+        for name in names:
+            l.append((name, self.constant_values[name]))
+        details["constant values"] = l
+
+        paths = list(self.exception_namespaces)
+        paths.sort()
+        details["exception namespaces"] = paths
+
+        return details
+
+    def to_lists(self, d):
 
-            print >>f
-            print >>f, "exception namespaces:"
-            paths = list(self.exception_namespaces)
-            paths.sort()
-            print >>f, ", ".join(paths)
+        """
+        Return a list of name and value list pairs for the non-empty collections
+        in 'd'.
+        """
 
-        finally:
-            f.close()
+        l = []
+        keys = d.keys()
+        keys.sort()
+        for key in keys:
+            attrs = list(d[key])
+            if attrs:
+                attrs.sort()
+                l.append((key, attrs))
+        return l
+
+    def to_text(self, f):
+
+        """
+        Write a textual representation of the inspected module to the stream
+        'f', this being a summary of the information otherwise written to the
+        cache.
+        """
+
+        print >>f, self.filename
+
+        print >>f
+        print >>f, "imports:"
+        required = list(self.required)
+        required.sort()
+        print >>f, required and ", ".join(required) or "{}"
+        imports = list(self.imports)
+        imports.sort()
+        print >>f, imports and ", ".join(imports) or "{}"
+
+        print >>f
+        print >>f, "deferred:"
+        deferred = map(str, set(self.deferred))
+        deferred.sort()
+        print >>f, ", ".join(deferred)
+
+        print >>f
+        print >>f, "special:"
+        names = self.special.keys()
+        names.sort()
+        for name in names:
+            ref, paths = self.special[name]
+            print >>f, name, ref, ", ".join(paths)
+
+        print >>f
+        print >>f, "members:"
+        objects = self.objects.keys()
+        objects.sort()
+        for name in objects:
+            print >>f, name, self.objects[name]
+
+        print >>f
+        print >>f, "class relationships:"
+        classes = self.classes.keys()
+        classes.sort()
+        for class_ in classes:
+            bases = self.classes[class_]
+            if bases:
+                print >>f, class_, ", ".join(map(str, bases))
+            else:
+                print >>f, class_
+
+        self.to_lines(f, "instance attributes:", self.instance_attrs)
+
+        print >>f
+        print >>f, "instance attribute constants:"
+        classes = self.instance_attr_constants.items()
+        classes.sort()
+        for name, attrs in classes:
+            attrs = attrs.items()
+            attrs.sort()
+            for attrname, ref in attrs:
+                print >>f, name, attrname, ref
+
+        self.to_lines(f, "names used:", self.names_used)
+
+        print >>f
+        print >>f, "name references:"
+        refs = self.name_references.items()
+        refs.sort()
+        for name, ref in refs:
+            print >>f, name, ref
+
+        print >>f
+        print >>f, "initialised names:"
+        assignments = self.initialised_names.items()
+        assignments.sort()
+        for (path, name), refs in assignments:
+            versions = refs.items()
+            versions.sort()
+            for version, ref in versions:
+                print >>f, path, name, version, ref
+
+        print >>f
+        print >>f, "aliased names:"
+        assignments = self.aliased_names.items()
+        assignments.sort()
+        for (path, name), aliases in assignments:
+            versions = aliases.items()
+            versions.sort()
+            for version, version_aliases in versions:
+                for alias in version_aliases:
+                    original_path, original_name, attrnames, number = alias
+                    print >>f, path, name, version, original_path, original_name, attrnames or "{}", number is None and "{}" or number
+
+        print >>f
+        print >>f, "function parameters:"
+        functions = self.function_parameters.keys()
+        functions.sort()
+        for function in functions:
+            parameters = self.function_parameters[function]
+            if parameters:
+                print >>f, function, ", ".join(parameters)
+            else:
+                print >>f, function, "{}"
+
+        print >>f
+        print >>f, "function attribute initialisers:"
+        functions = self.function_attr_initialisers.keys()
+        functions.sort()
+        for function in functions:
+            parameters = self.function_attr_initialisers[function]
+            if parameters:
+                print >>f, function, ", ".join(parameters)
+            else:
+                print >>f, function, "{}"
+
+        print >>f
+        print >>f, "function default parameters:"
+        functions = self.function_defaults.keys()
+        functions.sort()
+        for function in functions:
+            parameters = self.function_defaults[function]
+            if parameters:
+                print >>f, function, ", ".join([("%s=%s" % (name, default)) for (name, default) in parameters])
+            else:
+                print >>f, function, "{}"
+
+        print >>f
+        print >>f, "function locals:"
+        functions = self.function_locals.keys()
+        functions.sort()
+        for function in functions:
+            names = self.function_locals[function].items()
+            if names:
+                names.sort()
+                for name, value in names:
+                    print >>f, function, name, value
+            else:
+                print >>f, function, "{}"
+
+        self.to_lines(f, "scope globals:", self.scope_globals)
+
+        print >>f
+        print >>f, "attribute usage:"
+        units = self.attr_usage.keys()
+        units.sort()
+        for unit in units:
+            d = self.attr_usage[unit]
+            self.usage_to_cache(d, f, unit)
+
+        print >>f
+        print >>f, "attribute accesses:"
+        paths = self.attr_accesses.keys()
+        paths.sort()
+        for path in paths:
+            accesses = list(self.attr_accesses[path])
+            accesses.sort()
+            print >>f, path, ", ".join(accesses)
+
+        print >>f
+        print >>f, "constant accesses:"
+        paths = self.const_accesses.keys()
+        paths.sort()
+        for path in paths:
+            accesses = self.const_accesses[path].items()
+            accesses.sort()
+            for (original_name, attrnames), (objpath, ref, remaining_attrnames) in accesses:
+                print >>f, path, original_name, attrnames, objpath, ref, remaining_attrnames or "{}"
+
+        print >>f
+        print >>f, "attribute access usage:"
+        paths = self.attr_accessors.keys()
+        paths.sort()
+        for path in paths:
+            all_accesses = self.attr_accessors[path].items()
+            all_accesses.sort()
+            for (name, attrname), accesses in all_accesses:
+                for positions in accesses:
+                    positions = map(str, positions)
+                    print >>f, path, name, attrname or "{}", ", ".join(positions)
+
+        print >>f
+        print >>f, "attribute access modifiers:"
+        paths = self.attr_access_modifiers.keys()
+        paths.sort()
+        for path in paths:
+            all_accesses = self.attr_access_modifiers[path].items()
+            all_accesses.sort()
+            for (name, attrnames), modifiers in all_accesses:
+                print >>f, path, name or "{}", attrnames or "{}", encode_modifiers(modifiers)
+
+        print >>f
+        print >>f, "constant literals:"
+        paths = self.constants.keys()
+        paths.sort()
+        for path in paths:
+            constants = []
+            for (value, value_type, encoding), n in self.constants[path].items():
+                constants.append((n, value_type, encoding, value))
+            constants.sort()
+            for n, value_type, encoding, value in constants:
+                print >>f, path, value_type, encoding or "{}", repr(value)
+
+        print >>f
+        print >>f, "constant values:"
+        names = self.constant_values.keys()
+        names.sort()
+        for name in names:
+            value, value_type, encoding = self.constant_values[name]
+            print >>f, name, value_type, encoding or "{}", repr(value)
+
+        print >>f
+        print >>f, "exception namespaces:"
+        paths = list(self.exception_namespaces)
+        paths.sort()
+        print >>f, ", ".join(paths)
 
     def to_lines(self, f, heading, d):
 
@@ -940,4 +1049,64 @@ class CacheWritingModule:
 
                         print >>f, "%s %s %s" % (prefix, name, "; ".join(all_usages))
 
+# Cache encoding functions.
+
+def intern_strings(value):
+
+    """
+    Return 'value' with any plain strings it contains interned, so that each
+    distinct string is only stored once when marshalled.
+    """
+
+    if isinstance(value, str):
+        return intern(value)
+    elif isinstance(value, tuple):
+        return tuple(map(intern_strings, value))
+    elif isinstance(value, list):
+        return map(intern_strings, value)
+    elif isinstance(value, set):
+        return set(map(intern_strings, value))
+    elif isinstance(value, dict):
+        d = {}
+        for key, item in value.items():
+            d[intern_strings(key)] = intern_strings(item)
+        return d
+    else:
+        return value
+
+def normalise_usage_version(usages):
+
+    """
+    Return a normalised form of 'usages', being the set of attribute usage
+    details for a name version, with each usage having the form produced by
+    encoders.decode_usage.
+    """
+
+    all_usages = set()
+    for usage in usages:
+        all_attrnames = set()
+        for attrname, invocation, assignment in usage:
+            all_attrnames.add((attrname, invocation and True or False,
+                               not invocation and assignment and True or False))
+        all_attrnames = list(all_attrnames)
+        all_attrnames.sort()
+        all_usages.add(tuple(all_attrnames))
+    return all_usages
+
+def normalise_modifier(t):
+
+    """
+    Return a normalised form of the modifier 't', having the form produced by
+    encoders.decode_modifiers.
+    """
+
+    assignment, invocation = t
+    if assignment:
+        return True, None
+    elif invocation is not None:
+        arguments, keywords = invocation
+        return False, (arguments, list(keywords))
+    else:
+        return False, None
+
 # vim: tabstop=4 expandtab shiftwidth=4
@@ -32,7 +32,8 @@ class Optimiser(CommonOutput):
 
     def __init__(self, importer, deducer, output,
         attrnames_filename=None, locations_filename=None,
-        paramnames_filename=None, parameter_locations_filename=None):
+        paramnames_filename=None, parameter_locations_filename=None,
+        packing_limit=None):
 
         """
         Initialise an instance using the given 'importer' and 'deducer' that
@@ -43,6 +44,10 @@ class Optimiser(CommonOutput):
         'parameter_locations_filename' are given, they will be used to
         explicitly indicate existing attribute code, attribute position,
         parameter code, and parameter position information respectively.
+
+        If 'packing_limit' is given, it will limit the number of attribute or
+        parameter names tested for combination at each structure or table
+        location, trading table size for optimisation time.
         """
 
         self.importer = importer
@@ -56,6 +61,10 @@ class Optimiser(CommonOutput):
         self.paramnames_filename = paramnames_filename
         self.parameter_locations_filename = parameter_locations_filename
 
+        # Packing effort for structure and table locations.
+
+        self.packing_limit = packing_limit
+
         # Detection of differences between any existing structure or signature
         # information and the generated information.
 
@@ -314,6 +323,18 @@ class Optimiser(CommonOutput):
         ----
 
         The ordered list of constant literals is given in the "constants" file.
+
+        ----
+
+        The packing of structures and parameter tables is summarised in the
+        "packing" file in the following format:
+
+        kind " " locations " " occupied " " total " " density
+
+        The kind is either "structures" or "parameters", with the number of
+        locations allocated, the number of occupied entries and the total
+        number of entries in all structures or tables of that kind, and the
+        proportion of occupied entries also given.
         """
 
         f = open(join(self.output, "locations"), "w")
@@ -413,6 +434,29 @@ class Optimiser(CommonOutput):
         finally:
             f.close()
 
+        f = open(join(self.output, "packing"), "w")
+        try:
+            for kind, locations, tables in [
+                ("structures", self.locations, self.structures),
+                ("parameters", self.arg_locations, self.parameters),
+                ]:
+
+                occupied, total, density = get_packing_density(tables)
+                print >>f, kind, len(locations), occupied, total, "%.3f" % density
+
+        finally:
+            f.close()
+
+    def get_packing_densities(self):
+
+        """
+        Return the proportions of occupied entries in structures and parameter
+        tables.
+        """
+
+        return get_packing_density(self.structures)[2], \
+               get_packing_density(self.parameters)[2]
+
     def is_allocated_attribute(self, attrname):
 
         "Return whether 'attrname' is to be allocated in an object."
@@ -443,7 +487,8 @@ class Optimiser(CommonOutput):
 
         try:
             self.locations = get_allocated_locations(self.all_attrs,
-                get_attributes_and_sizes, self.existing_locations)
+                get_attributes_and_sizes, self.existing_locations,
+                self.packing_limit)
 
         # Uphold positioning conflicts only if the existing locations were
         # explicitly specified.
@@ -456,7 +501,7 @@ class Optimiser(CommonOutput):
             # regenerated.
 
             self.locations = get_allocated_locations(self.all_attrs,
-                get_attributes_and_sizes)
+                get_attributes_and_sizes, limit=self.packing_limit)
 
     def populate_parameters(self):
 
@@ -467,7 +512,7 @@ class Optimiser(CommonOutput):
         try:
             self.arg_locations = [set()] + get_allocated_locations(
                 self.importer.function_parameters, get_parameters_and_sizes,
-                self.existing_arg_locations[1:])
+                self.existing_arg_locations[1:], self.packing_limit)
 
         # Uphold positioning conflicts only if the existing locations were
         # explicitly specified.
@@ -480,7 +525,8 @@ class Optimiser(CommonOutput):
             # regenerated.
 
             self.arg_locations = [set()] + get_allocated_locations(
-                self.importer.function_parameters, get_parameters_and_sizes)
+                self.importer.function_parameters, get_parameters_and_sizes,
+                limit=self.packing_limit)
 
     def position_attributes(self):
 
@@ -711,25 +757,16 @@ class Optimiser(CommonOutput):
 
             self.constant_numbers[name] = self.constants[constant]
 
-def combine_rows(a, b):
-    c = []
-    for i, j in zip(a, b):
-        if i is None or j is None:
-            c.append(i or j)
-        else:
-            return None
-    return c
-
 def get_attributes_and_sizes(d):
 
     """
     Get attribute and size information for the object attributes defined by 'd'
     providing a mapping from object references to attribute names.
 
-    Return a matrix of attributes (each row entry consisting of column values
-    providing attribute names, with value positions corresponding to types
-    providing such attributes), a list of the type names corresponding to the
-    columns in the matrix, and a list of ranked sizes each indicating...
+    Return a matrix of attributes (each row being an integer with bits set for
+    the columns corresponding to types providing such attributes), a list of the
+    type names corresponding to the columns in the matrix, and a list of ranked
+    sizes each indicating...
 
      * a weighted size depending on the kind of object
      * the minimum size of an object employing an attribute
@@ -779,27 +816,15 @@ def get_attributes_and_sizes(d):
 
     # Make a matrix of attributes.
 
-    matrix = {}
-    for attrname, refs in attrs.items():
-
-        # Traverse the object types, adding the attribute name if the object
-        # type supports the attribute, adding None otherwise.
-
-        row = []
-        for ref in all_refs:
-            if ref in refs:
-                row.append(attrname)
-            else:
-                row.append(None)
-        matrix[attrname] = row
-
-    return matrix, all_refs, rsizes
+    return get_matrix(attrs, all_refs), all_refs, rsizes
 
 def get_parameters_and_sizes(d):
 
     """
-    Return a matrix of parameters, a list of functions corresponding to columns
-    in the matrix, and a list of ranked sizes each indicating...
+    Return a matrix of parameters (each row being an integer with bits set for
+    the columns corresponding to functions having such parameters), a list of
+    functions corresponding to columns in the matrix, and a list of ranked sizes
+    each indicating...
 
      * a weighted size depending on the kind of object
      * the minimum size of a parameter list employing a parameter
@@ -843,28 +868,53 @@ def get_parameters_and_sizes(d):
 
     # Make a matrix of parameters.
 
+    return get_matrix(params, names), names, rsizes
+
+def get_matrix(d, columns):
+
+    """
+    Return a matrix for 'd', mapping names to collections of objects, where each
+    row corresponds to a name and is an integer having bits set for each of the
+    objects in 'columns' associated with the name.
+    """
+
+    bits = {}
+    for i, column in enumerate(columns):
+        bits[column] = 1L << i
+
     matrix = {}
-    for argname, types in params.items():
-        row = []
-        for name in names:
-            if name in types:
-                row.append(argname)
-            else:
-                row.append(None)
-        matrix[argname] = row
+    for name, objects in d.items():
+        row = 0
+        for obj in objects:
+            row |= bits[obj]
+        matrix[name] = row
+
+    return matrix
 
-    return matrix, names, rsizes
+def count_bits(row):
 
-def get_allocated_locations(d, fn, existing=None):
+    "Return the number of bits set in 'row'."
+
+    return bin(row).count("1")
+
+def get_allocated_locations(d, fn, existing=None, limit=None):
 
     """
     Return a list where each element corresponds to a structure location and
     contains a set of attribute names that may be stored at that location, given
     a mapping 'd' whose keys are (object kind, object name) tuples and whose
     values are collections of attributes.
+
+    If 'limit' is specified, only that number of attribute names will be tested
+    for combination with those already allocated at each location, potentially
+    producing more locations in less time.
     """
 
     matrix, names, rsizes = fn(d)
+
+    # Each allocation consists of a row indicating the objects supporting the
+    # allocated attributes, together with the attribute names.
+
     allocated = []
 
     # Verify any existing allocation.
@@ -873,14 +923,8 @@ def get_allocated_locations(d, fn, existing=None):
 
     if existing:
         for attrnames in existing:
-
-            # Handle empty positions.
-
-            if not attrnames:
-                allocated.append([None] * len(names))
-                continue
-
-            base = None
+            base = 0
+            allocation = set()
 
             for attrname in attrnames:
 
@@ -889,30 +933,19 @@ def get_allocated_locations(d, fn, existing=None):
                 if not matrix.has_key(attrname):
                     continue
 
-                # Handle the first attribute name.
-
-                if base is None:
-                    base = matrix[attrname]
-                    allocated_attrnames.add(attrname)
-                    continue
-
                 # Combine existing and new attribute positioning.
 
-                new = combine_rows(base, matrix[attrname])
+                row = matrix[attrname]
 
-                if new:
-                    base = new
+                if not base & row:
+                    base |= row
+                    allocation.add(attrname)
                     allocated_attrnames.add(attrname)
                 else:
                     raise OptimiseError, "Attribute %s cannot be explicitly positioned at %d." % \
                                          (attrname, len(allocated))
 
-            # Handle empty positions.
-
-            if base:
-                allocated.append(base)
-            else:
-                allocated.append([None] * len(names))
+            allocated.append((base, allocation))
 
     # Try to allocate each attribute name in turn.
 
@@ -925,8 +958,8 @@ def get_allocated_locations(d, fn, existing=None):
         # current attribute looking for allocations to combine.
 
         if pos < len(allocated):
-            base = allocated[pos]
-            free = base.count(None)
+            base, allocation = allocated[pos]
+            free = len(names) - count_bits(base)
             y = x
 
         # Obtain the object information for the attribute name.
@@ -943,13 +976,16 @@ def get_allocated_locations(d, fn, existing=None):
             # Start at the next attribute looking for allocations to combine.
 
             base = matrix[attrname]
+            allocation = set([attrname])
             y = x + 1
 
         # Examine attribute names that follow in the ranking, attempting to
         # accumulate compatible attributes that can co-exist in the same
         # position within structures.
 
-        while y < len(rsizes):
+        tested = 0
+
+        while y < len(rsizes) and (limit is None or tested < limit):
             _weight, _size, _free, _attrname = rsizes[y]
 
             # Ignore allocated attribute names.
@@ -969,11 +1005,14 @@ def get_allocated_locations(d, fn, existing=None):
             # considered attribute, testing for conflicts. Adopt the merged row
             # details if they do not conflict.
 
-            new = combine_rows(base, matrix[_attrname])
-            if new:
+            row = matrix[_attrname]
+            tested += 1
+
+            if not base & row:
                 del matrix[_attrname]
                 del rsizes[y]
-                base = new
+                base |= row
+                allocation.add(_attrname)
                 free -= occupied
 
             # Otherwise, look for other compatible attributes.
@@ -984,35 +1023,29 @@ def get_allocated_locations(d, fn, existing=None):
         # Allocate the merged details at the current position.
 
         if pos < len(allocated):
-            allocated[pos] = base
+            allocated[pos] = base, allocation
             pos += 1
         else:
             x += 1
-            allocated.append(base)
+            allocated.append((base, allocation))
 
-    return allocations_to_sets(allocated)
+    return [allocation for base, allocation in allocated]
 
-def allocations_to_sets(allocated):
+def get_packing_density(tables):
 
     """
-    Return the list of attribute names from each row of the 'allocated'
-    attributes table.
+    Return the number of occupied entries, the total number of entries, and the
+    proportion of occupied entries for the given 'tables', these mapping names
+    to lists of entries with unoccupied entries being None.
     """
 
-    locations = []
-
-    for attrnames in allocated:
-        l = set()
-
-        # Convert populated allocations.
-
-        if attrnames:
-            for attrname in attrnames:
-                if attrname:
-                    l.add(attrname)
+    occupied = 0
+    total = 0
 
-        locations.append(l)
+    for entries in tables.values():
+        total += len(entries)
+        occupied += len(entries) - entries.count(None)
 
-    return locations
+    return occupied, total, total and float(occupied) / total or 1.0
 
 # vim: tabstop=4 expandtab shiftwidth=4
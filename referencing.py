@@ -275,7 +275,48 @@ def decode_reference(s, name=None):
     else:
         return Reference("<module>", s, name)
 
+def encode_reference_record(ref):
 
+    """
+    Encode 'ref' as a record of the form (kind, origin, alias) retaining the
+    details that would be serialised by the string form of the reference.
+    """
+
+    if ref is None:
+        return None
+
+    kind = ref.get_kind()
+
+    if kind == "<var>":
+        return kind, None, ref.name or None
+    else:
+        alias = ref.name != ref.origin and ref.name or None
+        return kind, ref.origin, alias
+
+def decode_reference_record(t, name=None):
+
+    """
+    Decode the record 't' produced by encode_reference_record, making a
+    reference employing any given 'name' in the same way as decode_reference.
+    """
+
+    if t is None:
+        return Reference("<var>", None, name)
+
+    kind, origin, alias = t
+
+    # Kind and alias or kind-only, origin is indicated name.
+
+    if kind == "<var>":
+        if alias:
+            return Reference(kind, None, alias)
+        else:
+            return Reference(kind, name, name)
+
+    # Kind and origin.
+
+    else:
+        return Reference(kind, origin, alias or name)
 
 # Type/reference collection functions.
 
@@ -18,6 +18,6 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 
 #include "exceptions.h"
 
-/* Define a global exception context. */
+/* Define an exception context for each thread. */
 
-struct __exception_context __the_exception_context[1];
+__thread struct __exception_context __the_exception_context[1];
@@ -35,7 +35,7 @@ typedef struct
 define_exception_type(__exc);
 #undef define_exception_type
 
-extern struct __exception_context __the_exception_context[1];
+extern __thread struct __exception_context __the_exception_context[1];
 
 /* More specific macros. */
 
@@ -0,0 +1,2 @@
+CFLAGS += -flto
+LDFLAGS += -flto
@@ -28,11 +28,13 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 
 __attr __new_str(char *s, __int size)
 {
-    /* Create a new string and mutate the __data__, __size__ and __key__ attributes. */
+    /* Create a new string and mutate the __data__, __size__, __key__ and
+       __hashvalue__ attributes, the latter being computed when needed. */
     __attr attr = __NEWINSTANCE(__builtins___str_str);
     __store_via_object(__VALUE(attr), __data__, (__attr) {.strvalue=s});
     __store_via_object(__VALUE(attr), __size__, (__attr) {.sizevalue=size});
     __store_via_object(__VALUE(attr), __key__, __NULL);
+    __store_via_object(__VALUE(attr), __hashvalue__, __NULL);
     return attr;
 }
 
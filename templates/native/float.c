@@ -0,0 +1,419 @@
+/* Native functions for floating point operations.
+
+Copyright (C) 2021 Paul Boddie <paul@boddie.org.uk>
+
+This program is free software; you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation; either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+details.
+
+You should have received a copy of the GNU General Public License along with
+this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <math.h>   /* copysign, floor, fmod, isfinite, isinf, isnan, pow, trunc */
+#include <stdio.h>  /* snprintf */
+#include <stdlib.h> /* atoi, strtod */
+#include <string.h> /* memcpy, memmove, strcat, strchr, strcpy, strlen */
+#include <errno.h>  /* errno */
+#include <ctype.h>  /* isspace */
+#include <stdint.h> /* uint64_t */
+#include "native/common.h"
+#include "native/long.h"
+#include "types.h"
+#include "exceptions.h"
+#include "ops.h"
+#include "progconsts.h"
+#include "progops.h"
+#include "progtypes.h"
+#include "main.h"
+
+/* The size of buffers used for string representations. */
+
+#define __FLOAT_BUFSIZE 32
+
+/* Test for doubles that are representable as integers. Note that the maximum
+   integer may not be exactly representable as a double, whereas the negated
+   minimum integer is always representable and just exceeds the maximum. */
+
+#define __FLOAT_IN_INT_RANGE(N) (((N) >= __MININT) && ((N) < -((double) __MININT)))
+
+/* Obtain the value of a float, an int or a long as a double. */
+
+static inline double float_value(__attr attr)
+{
+    if (__INTEGER(attr))
+        return (double) __TOINT(attr);
+    else if (__get_class(__VALUE(attr)) == &__builtins___long_long)
+        return __long_to_double(attr);
+    else
+        return __load_via_object(__VALUE(attr), __data__).floatvalue;
+}
+
+/* Create a float instance. Since the instance only holds the number, it need
+   not be scanned for references. */
+
+__attr __new_float(double n)
+{
+    __attr attr = __NEWINSTANCEIM(__builtins___float_float);
+    __store_via_object(__VALUE(attr), __data__, (__attr) {.floatvalue=n});
+    return attr;
+}
+
+/* Return a string for 'n', adding a decimal point to integral values. */
+
+static __attr float_string(char *buf, double n)
+{
+    __int size;
+    char *s;
+
+    if (isnan(n))
+        strcpy(buf, "nan");
+    else if (isinf(n))
+        strcpy(buf, n > 0 ? "inf" : "-inf");
+    else if (!strchr(buf, '.') && !strchr(buf, 'e'))
+        strcat(buf, ".0");
+
+    size = strlen(buf);
+    s = (char *) __ALLOCATE(size + 1, sizeof(char));
+    memcpy(s, buf, size);
+
+    return __new_str(s, size);
+}
+
+/* Remove trailing zeros from the mantissa of an exponential representation. */
+
+static void float_strip_zeros(char *buf)
+{
+    char *e = strchr(buf, 'e'), *end = e;
+
+    while (*(end - 1) == '0')
+        end--;
+
+    if (*(end - 1) == '.')
+        end--;
+
+    memmove(end, e, strlen(e) + 1);
+}
+
+/* Floating point operations. Each operand may be a float or an int. */
+
+__attr __fn_native_float_float_add(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+
+    /* Return the new float. */
+    return __new_float(i + j);
+}
+
+__attr __fn_native_float_float_sub(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+
+    /* Return the new float. */
+    return __new_float(i - j);
+}
+
+__attr __fn_native_float_float_mul(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+
+    /* Return the new float. */
+    return __new_float(i * j);
+}
+
+__attr __fn_native_float_float_div(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+
+    /* Test for division by zero. */
+    if (j == 0)
+        __raise_zero_division_error();
+
+    /* Return the new float. */
+    return __new_float(i / j);
+}
+
+/* Obtain the modulo of 'i' by 'j' having the sign of 'j'. */
+
+static double float_mod(double i, double j)
+{
+    double mod = fmod(i, j);
+
+    if (mod)
+    {
+        if ((j < 0) != (mod < 0))
+            mod += j;
+    }
+    else
+        mod = copysign(0.0, j);
+
+    return mod;
+}
+
+__attr __fn_native_float_float_mod(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+
+    /* Test for division by zero. */
+    if (j == 0)
+        __raise_zero_division_error();
+
+    /* Return the new float. */
+    return __new_float(float_mod(i, j));
+}
+
+__attr __fn_native_float_float_floordiv(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+    double mod, div, result;
+
+    /* Test for division by zero. */
+    if (j == 0)
+        __raise_zero_division_error();
+
+    /* Divide the difference between the dividend and the modulo, this being
+       exact, rounding the result to the nearest integral value. */
+    mod = float_mod(i, j);
+    div = (i - mod) / j;
+
+    if (div)
+    {
+        result = floor(div);
+        if (div - result > 0.5)
+            result += 1.0;
+    }
+    else
+        result = copysign(0.0, i / j);
+
+    /* Return the new float. */
+    return __new_float(result);
+}
+
+__attr __fn_native_float_float_pow(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+    double result;
+
+    /* Test for values that cannot be raised to the given power. */
+    if ((i == 0) && (j < 0))
+        __raise_zero_division_error();
+    else if ((i < 0) && (j != floor(j)))
+        __raise_value_error(self);
+
+    errno = 0;
+    result = pow(i, j);
+
+    /* Test for overflow. */
+    if ((errno == ERANGE) && isinf(result))
+        __raise_overflow_error();
+
+    /* Return the new float. */
+    return __new_float(result);
+}
+
+__attr __fn_native_float_float_neg(__attr __self, __attr self)
+{
+    /* self interpreted as float */
+    double i = float_value(self);
+
+    /* Return the new float. */
+    return __new_float(-i);
+}
+
+__attr __fn_native_float_float_le(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+
+    /* Return a boolean result. */
+    return i <= j ? __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_float_float_lt(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+
+    /* Return a boolean result. */
+    return i < j ? __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_float_float_ge(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+
+    /* Return a boolean result. */
+    return i >= j ? __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_float_float_gt(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+
+    /* Return a boolean result. */
+    return i > j ? __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_float_float_eq(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+
+    /* Return a boolean result. */
+    return i == j ? __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_float_float_ne(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as float */
+    double i = float_value(self);
+    double j = float_value(other);
+
+    /* Return a boolean result. */
+    return i != j ? __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_float_float_hash(__attr __self, __attr self)
+{
+    /* self interpreted as float */
+    double i = float_value(self);
+    union { double d; uint64_t u; } bits;
+
+    /* Integral values have the same hash as the equivalent integer. */
+    if ((i == trunc(i)) && __FLOAT_IN_INT_RANGE(i))
+        return __new_int((__int) i);
+    else if ((i == trunc(i)) && !isinf(i))
+        return __fn_native_long_long_hash(__NULL, __long_from_double(i));
+
+    /* Otherwise, combine the bits of the number. */
+    bits.d = i;
+    return __new_int((__int) ((bits.u ^ (bits.u >> 32)) & __MAXINT));
+}
+
+__attr __fn_native_float_float_int(__attr __self, __attr self)
+{
+    /* self interpreted as float */
+    double i = float_value(self);
+
+    /* Promote values not representable as integers to long integers. */
+    if (!__FLOAT_IN_INT_RANGE(i))
+        return __long_from_double(i);
+
+    /* Return the new integer. */
+    return __new_int((__int) i);
+}
+
+__attr __fn_native_float_float_parse(__attr __self, __attr value)
+{
+    /* value interpreted as string */
+    char *s = __load_via_object(__VALUE(value), __data__).strvalue;
+    __int size = __load_via_object(__VALUE(value), __size__).sizevalue;
+    char *end;
+    double result;
+
+    /* Convert the number, permitting surrounding whitespace. */
+    result = strtod(s, &end);
+
+    if (end == s)
+        __raise_value_error(value);
+
+    while ((end < s + size) && isspace(*end))
+        end++;
+
+    if (end != s + size)
+        __raise_value_error(value);
+
+    /* Return the new float. */
+    return __new_float(result);
+}
+
+__attr __fn_native_float_float_str(__attr __self, __attr self)
+{
+    /* self interpreted as float */
+    double i = float_value(self);
+    char buf[__FLOAT_BUFSIZE];
+    int exponent;
+
+    /* Infinite and undefined values have fixed representations. */
+    if (!isfinite(i))
+        return float_string(buf, i);
+
+    /* Employ twelve significant digits, using exponential notation where all
+       of these digits would precede the decimal point. */
+    snprintf(buf, __FLOAT_BUFSIZE, "%.11e", i);
+    exponent = atoi(strchr(buf, 'e') + 1);
+
+    if ((exponent >= -4) && (exponent < 11))
+        snprintf(buf, __FLOAT_BUFSIZE, "%.12g", i);
+    else
+        float_strip_zeros(buf);
+
+    /* Return a new string. */
+    return float_string(buf, i);
+}
+
+__attr __fn_native_float_float_repr(__attr __self, __attr self)
+{
+    /* self interpreted as float */
+    double i = float_value(self);
+    char buf[__FLOAT_BUFSIZE];
+    int digits, exponent;
+
+    /* Infinite and undefined values have fixed representations. */
+    if (!isfinite(i))
+        return float_string(buf, i);
+
+    /* Find the fewest significant digits reproducing the number. */
+    for (digits = 1; digits < 17; digits++)
+    {
+        snprintf(buf, __FLOAT_BUFSIZE, "%.*e", digits - 1, i);
+        if (strtod(buf, NULL) == i)
+            break;
+    }
+
+    snprintf(buf, __FLOAT_BUFSIZE, "%.*e", digits - 1, i);
+
+    /* Use positional notation for moderately-sized numbers, retaining the
+       exponential notation otherwise. */
+    exponent = atoi(strchr(buf, 'e') + 1);
+
+    if ((exponent >= -4) && (exponent < 16))
+        snprintf(buf, __FLOAT_BUFSIZE, "%.*f",
+                 digits - 1 - exponent > 0 ? digits - 1 - exponent : 0, i);
+
+    /* Return a new string. */
+    return float_string(buf, i);
+}
+
+/* Module initialisation. */
+
+void __main_native_float()
+{
+}
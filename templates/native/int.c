@@ -16,11 +16,12 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 */
 
-#include <math.h>   /* ceil, log10, pow */
+#include <math.h>   /* ceil, log10 */
 #include <stdio.h>  /* fdopen, snprintf */
-#include <errno.h>  /* errno */
 #include <string.h> /* strlen */
 #include "native/common.h"
+#include "native/float.h"
+#include "native/long.h"
 #include "types.h"
 #include "exceptions.h"
 #include "ops.h"
@@ -29,7 +30,8 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 #include "progtypes.h"
 #include "main.h"
 
-/* Integer operations. */
+/* Integer operations. Results that cannot be represented as integers are
+   produced by the long integer operations instead. */
 
 __attr __fn_native_int_is_int(__attr __self, __attr obj)
 {
@@ -46,7 +48,7 @@ __attr __fn_native_int_int_add(__attr __self, __attr self, __attr other)
     if (((i > 0) && (j > 0) && (i > __MAXINT - j)) ||
         ((i < 0) && (j < 0) && (i < __MININT - j)))
 
-        __raise_overflow_error();
+        return __fn_native_long_long_add(__self, self, other);
 
     /* Return the new integer. */
     return __new_int(i + j);
@@ -62,7 +64,7 @@ __attr __fn_native_int_int_sub(__attr __self, __attr self, __attr other)
     if (((i < 0) && (j > 0) && (i < __MININT + j)) ||
         ((i > 0) && (j < 0) && (i > __MAXINT + j)))
 
-        __raise_overflow_error();
+        return __fn_native_long_long_sub(__self, self, other);
 
     /* Return the new integer. */
     return __new_int(i - j);
@@ -80,26 +82,39 @@ __attr __fn_native_int_int_mul(__attr __self, __attr self, __attr other)
         ((i < 0) && (j > 0) && (i < __MININT / j)) ||
         ((i > 0) && (j < 0) && (j < __MININT / i)))
 
-        __raise_overflow_error();
+        return __fn_native_long_long_mul(__self, self, other);
 
     /* Return the new integer. */
     return __new_int(i * j);
 }
 
 __attr __fn_native_int_int_div(__attr __self, __attr self, __attr other)
+{
+    /* Integer division rounds towards negative infinity, as does floor
+       division and the division of long integers. */
+    return __fn_native_int_int_floordiv(__self, self, other);
+}
+
+__attr __fn_native_int_int_floordiv(__attr __self, __attr self, __attr other)
 {
     /* self and other interpreted as int */
     __int i = __TOINT(self);
     __int j = __TOINT(other);
+    __int k;
 
     /* Test for division by zero or overflow. */
     if (j == 0)
         __raise_zero_division_error();
     else if ((j == -1) && (i == __MININT))
-        __raise_overflow_error();
+        return __fn_native_long_long_div(__self, self, other);
+
+    /* Round any inexact quotient towards negative infinity. */
+    k = i / j;
+    if ((i % j) && ((i < 0) != (j < 0)))
+        k--;
 
     /* Return the new integer. */
-    return __new_int(i / j);
+    return __new_int(k);
 }
 
 __attr __fn_native_int_int_mod(__attr __self, __attr self, __attr other)
@@ -107,15 +122,24 @@ __attr __fn_native_int_int_mod(__attr __self, __attr self, __attr other)
     /* self and other interpreted as int */
     __int i = __TOINT(self);
     __int j = __TOINT(other);
+    __int k;
 
-    /* Test for division by zero or overflow. */
+    /* Test for division by zero. */
     if (j == 0)
         __raise_zero_division_error();
-    else if ((j == -1) && (i == __MININT))
-        __raise_overflow_error();
+
+    /* Avoid overflow in the division. */
+    if (j == -1)
+        return __new_int(0);
+
+    /* Give any non-zero remainder the sign of the divisor, consistent with
+       division rounding towards negative infinity. */
+    k = i % j;
+    if (k && ((k < 0) != (j < 0)))
+        k += j;
 
     /* Return the new integer. */
-    return __new_int(i % j);
+    return __new_int(k);
 }
 
 __attr __fn_native_int_int_neg(__attr __self, __attr self)
@@ -125,7 +149,7 @@ __attr __fn_native_int_int_neg(__attr __self, __attr self)
 
     /* Test for overflow. */
     if (i == __MININT)
-        __raise_overflow_error();
+        return __fn_native_long_long_neg(__self, self);
 
     /* Return the new integer. */
     return __new_int(-i);
@@ -136,22 +160,32 @@ __attr __fn_native_int_int_pow(__attr __self, __attr self, __attr other)
     /* self and other interpreted as int */
     __int i = __TOINT(self);
     __int j = __TOINT(other);
-    int k;
+    __int base = i, result = 1;
 
-    errno = 0;
-    k = (int) pow(i, j);
+    /* Negative exponents produce floating point results. */
+    if (j < 0)
+        return __fn_native_float_float_pow(__self, self, other);
 
-    /* Test for overflow. */
+    /* Employ repeated squaring, testing each bit of the exponent. */
+    while (j)
+    {
+        if (j & 1)
+        {
+            if (__builtin_mul_overflow(result, base, &result) ||
+                (result > __MAXINT) || (result < __MININT))
 
-    if (errno == ERANGE)
-        __raise_overflow_error();
-    if ((k > 0) && (k > __MAXINT))
-        __raise_overflow_error();
-    if ((k < 0) && (k < __MININT))
-        __raise_overflow_error();
+                return __fn_native_long_long_pow(__self, self, other);
+        }
+
+        j >>= 1;
+
+        /* Test for overflow only if the base is needed again. */
+        if (j && (__builtin_mul_overflow(base, base, &base) || (base > __MAXINT)))
+            return __fn_native_long_long_pow(__self, self, other);
+    }
 
     /* Return the new integer. */
-    return __new_int(k);
+    return __new_int(result);
 }
 
 __attr __fn_native_int_int_and(__attr __self, __attr self, __attr other)
@@ -202,8 +236,17 @@ __attr __fn_native_int_int_lshift(__attr __self, __attr self, __attr other)
     __int i = __TOINT(self);
     __int j = __TOINT(other);
 
+    /* Test for negative shifts. */
+    if (j < 0)
+        __raise_value_error(other);
+
+    /* Test for overflow, where bits would be lost or the sign would change. */
+    if (i && ((j >= (__int) (sizeof(__int) * 8 - 1)) ||
+              ((i << j) >> j != i) || (i << j > __MAXINT) || (i << j < __MININT)))
+
+        return __fn_native_long_long_lshift(__self, self, other);
+
     /* Return the new integer. */
-    /* NOTE: No overflow test applied. */
     return __new_int(i << j);
 }
 
@@ -213,9 +256,12 @@ __attr __fn_native_int_int_rshift(__attr __self, __attr self, __attr other)
     __int i = __TOINT(self);
     __int j = __TOINT(other);
 
-    /* Return the new integer. */
-    /* NOTE: No overflow test applied. */
-    return __new_int(i >> j);
+    /* Test for negative shifts. */
+    if (j < 0)
+        __raise_value_error(other);
+
+    /* Return the new integer, retaining only the sign for large shifts. */
+    return __new_int(j >= (__int) (sizeof(__int) * 8) ? (i < 0 ? -1 : 0) : i >> j);
 }
 
 __attr __fn_native_int_int_le(__attr __self, __attr self, __attr other)
@@ -28,6 +28,7 @@ __attr __fn_native_int_int_add(__attr __self, __attr _data, __attr other);
 __attr __fn_native_int_int_sub(__attr __self, __attr _data, __attr other);
 __attr __fn_native_int_int_mul(__attr __self, __attr _data, __attr other);
 __attr __fn_native_int_int_div(__attr __self, __attr _data, __attr other);
+__attr __fn_native_int_int_floordiv(__attr __self, __attr _data, __attr other);
 __attr __fn_native_int_int_mod(__attr __self, __attr _data, __attr other);
 __attr __fn_native_int_int_neg(__attr __self, __attr _data);
 __attr __fn_native_int_int_pow(__attr __self, __attr _data, __attr other);
@@ -40,9 +40,10 @@ __attr __fn_native_introspection_object_getattr(__attr __self, __attr obj, __att
     out = __check_and_load_via_object_null(__VALUE(obj), key.pos, key.code);
     if (__ISNULL(out))
     {
-        /* Inspect the object's class if this failed. */
+        /* Inspect the object's class if this failed, not raising an exception
+           if the class does not provide the attribute. */
 
-        out = __check_and_load_via_class__(__VALUE(obj), key.pos, key.code);
+        out = __check_and_load_via_object_null(__get_class(__VALUE(obj)), key.pos, key.code);
         if (__ISNULL(out))
             return _default;
 
@@ -18,7 +18,7 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 
 #include <unistd.h> /* read, write */
 #include <string.h> /* strcmp, memcpy */
-#include <stdio.h>  /* fdopen, snprintf */
+#include <stdio.h>  /* fdopen, getline, snprintf */
 #include <errno.h>  /* errno */
 #include "native/common.h"
 #include "types.h"
@@ -29,6 +29,11 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 #include "progtypes.h"
 #include "main.h"
 
+/* A buffer reused when reading lines, provided for each thread. */
+
+static __thread char *__linebuf = NULL;
+static __thread size_t __linebufsize = 0;
+
 /* Input/output. */
 
 __attr __fn_native_io_fclose(__attr __self, __attr fp)
@@ -143,6 +148,34 @@ __attr __fn_native_io_fread(__attr __self, __attr fp, __attr size)
     return __new_str(s, have_read);
 }
 
+__attr __fn_native_io_freadline(__attr __self, __attr fp)
+{
+    /* fp interpreted as FILE reference */
+    FILE *f = (FILE *) fp.datavalue;
+    ssize_t have_read;
+    char *s;
+
+    /* Read up to and including any newline, using the stream's own buffer to
+       find the end of the line. */
+
+    errno = 0;
+    have_read = getline(&__linebuf, &__linebufsize, f);
+
+    if (have_read == -1)
+    {
+        if (ferror(f))
+            __raise_io_error(__new_int(errno));
+        else
+            __raise_eof_error();
+    }
+
+    /* Reserve space for a new string. */
+
+    s = __ALLOCATE(have_read + 1, sizeof(char));
+    memcpy(s, __linebuf, have_read); /* does not null terminate but final byte should be zero */
+    return __new_str(s, have_read);
+}
+
 __attr __fn_native_io_fwrite(__attr __self, __attr fp, __attr str)
 {
     /* fp interpreted as FILE reference */
@@ -28,6 +28,7 @@ __attr __fn_native_io_fflush(__attr __self, __attr fp);
 __attr __fn_native_io_fopen(__attr __self, __attr filename, __attr mode);
 __attr __fn_native_io_fdopen(__attr __self, __attr fd, __attr mode);
 __attr __fn_native_io_fread(__attr __self, __attr fp, __attr size);
+__attr __fn_native_io_freadline(__attr __self, __attr fp);
 __attr __fn_native_io_fwrite(__attr __self, __attr fp, __attr str);
 __attr __fn_native_io_close(__attr __self, __attr fd);
 __attr __fn_native_io_read(__attr __self, __attr fd, __attr n);
@@ -16,6 +16,7 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 */
 
+#include <string.h> /* memcmp, memcpy, memmove, memset */
 #include "native/common.h"
 #include "types.h"
 #include "exceptions.h"
@@ -25,6 +26,62 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 #include "progtypes.h"
 #include "main.h"
 
+/* Capacity management. Fragments are only shrunk when the number of elements
+   falls below a quarter of the capacity, and then only to twice the number of
+   elements, so that alternating growth and shrinkage does not cause repeated
+   re-allocation. */
+
+#define __LIST_MIN_CAPACITY 4
+
+/* Return a fragment for 'data' able to hold at least 'n' elements. */
+
+static __fragment *__list_reserve(__fragment *data, __int n)
+{
+    __int capacity = data->capacity;
+
+    if (n <= capacity)
+        return data;
+
+    /* Double the capacity or provide the exact amount needed. */
+
+    capacity = capacity * 2 > n ? capacity * 2 : n;
+    data = (__fragment *) __REALLOCATE(data, __FRAGMENT_SIZE(capacity));
+    data->capacity = capacity;
+    return data;
+}
+
+/* Set the size of 'data' to 'n' elements, clearing the elements that are no
+   longer used and shrinking the fragment if appropriate. */
+
+static __fragment *__list_truncate(__fragment *data, __int n)
+{
+    __int capacity;
+
+    /* Remove references from unused elements so that the referenced objects
+       may be collected. */
+
+    if (n < data->size)
+        memset(data->attrs + n, 0, (data->size - n) * sizeof(__attr));
+
+    data->size = n;
+
+    if ((n >= data->capacity / 4) || (data->capacity <= __LIST_MIN_CAPACITY))
+        return data;
+
+    capacity = n * 2 > __LIST_MIN_CAPACITY ? n * 2 : __LIST_MIN_CAPACITY;
+    data = (__fragment *) __REALLOCATE(data, __FRAGMENT_SIZE(capacity));
+    data->capacity = capacity;
+    return data;
+}
+
+/* Replace the __data__ attribute of 'self' if 'newdata' differs from 'data'. */
+
+static void __list_update(__attr self, __fragment *data, __fragment *newdata)
+{
+    if (newdata != data)
+        __store_via_object(__VALUE(self), __data__, ((__attr) {.seqvalue=newdata}));
+}
+
 /* List operations. */
 
 __attr __fn_native_list_list_init(__attr __self, __attr size)
@@ -88,6 +145,73 @@ __attr __fn_native_list_list_concat(__attr __self, __attr self, __attr other)
     return __builtins___none_None;
 }
 
+__attr __fn_native_list_list_insert(__attr __self, __attr self, __attr index, __attr value)
+{
+    /* self.__data__ interpreted as list */
+    __fragment *data = __load_via_object(__VALUE(self), __data__).seqvalue;
+    __fragment *newdata;
+    /* index interpreted as int */
+    __int i = __TOINT(index);
+    __int size = data->size;
+
+    /* Make room for the element, moving subsequent elements along. */
+    newdata = __list_reserve(data, size + 1);
+    memmove(newdata->attrs + i + 1, newdata->attrs + i, (size - i) * sizeof(__attr));
+    newdata->attrs[i] = value;
+    newdata->size = size + 1;
+
+    __list_update(self, data, newdata);
+    return __builtins___none_None;
+}
+
+__attr __fn_native_list_list_delete(__attr __self, __attr self, __attr start, __attr end)
+{
+    /* self.__data__ interpreted as list */
+    __fragment *data = __load_via_object(__VALUE(self), __data__).seqvalue;
+    /* start, end interpreted as int */
+    __int i = __TOINT(start), j = __TOINT(end);
+    __int size = data->size;
+
+    /* Move subsequent elements over the deleted elements. */
+    memmove(data->attrs + i, data->attrs + j, (size - j) * sizeof(__attr));
+
+    __list_update(self, data, __list_truncate(data, size - (j - i)));
+    return __builtins___none_None;
+}
+
+__attr __fn_native_list_list_replace(__attr __self, __attr self, __attr start, __attr end, __attr other)
+{
+    /* self.__data__ interpreted as list, other interpreted as list.__data__ */
+    __fragment *data = __load_via_object(__VALUE(self), __data__).seqvalue;
+    __fragment *other_data = other.seqvalue, *newdata;
+    /* start, end interpreted as int */
+    __int i = __TOINT(start), j = __TOINT(end);
+    __int size = data->size, other_size = other_data->size;
+    __int n = size - (j - i) + other_size;
+    __attr *elements = other_data->attrs;
+
+    /* Copy the elements of a list replacing part of itself. */
+    if (other_data == data)
+    {
+        elements = (__attr *) __ALLOCATE(other_size, sizeof(__attr));
+        memcpy(elements, data->attrs, other_size * sizeof(__attr));
+    }
+
+    /* Move subsequent elements to follow the replacement elements. */
+    newdata = __list_reserve(data, n);
+    memmove(newdata->attrs + i + other_size, newdata->attrs + j, (size - j) * sizeof(__attr));
+    memcpy(newdata->attrs + i, elements, other_size * sizeof(__attr));
+
+    /* Adjust the size, clearing any elements no longer used. */
+    if (n < size)
+        newdata = __list_truncate(newdata, n);
+    else
+        newdata->size = n;
+
+    __list_update(self, data, newdata);
+    return __builtins___none_None;
+}
+
 __attr __fn_native_list_list_len(__attr __self, __attr _data)
 {
     /* _data interpreted as list.__data__ */
@@ -124,6 +248,200 @@ __attr __fn_native_list_list_setelement(__attr __self, __attr _data, __attr inde
     return __builtins___none_None;
 }
 
+/* Sorting support. Items are copied, together with any separate sort keys,
+   into a separate array which is sorted and then copied back into the list
+   data, so that exceptions raised by comparisons leave the list unchanged. */
+
+typedef struct __sortitem
+{
+    __attr key, value;
+} __sortitem;
+
+/* Comparison modes, with the last two employing the supplied functions. */
+
+#define __SORT_INT  0
+#define __SORT_STR  1
+#define __SORT_LT   2
+#define __SORT_CMP  3
+
+/* Insertion sort is used for short runs before merging. */
+
+#define __SORT_RUN  32
+
+typedef struct __sortcontext
+{
+    int mode;
+    __attr cmp, lt;
+} __sortcontext;
+
+static inline int __sort_is_str(__attr attr)
+{
+    return !__INTEGER(attr) && __is_instance(__VALUE(attr)) &&
+           (__get_class(__VALUE(attr)) == &__builtins___str_str);
+}
+
+/* Return whether key 'a' is less than key 'b'. */
+
+static int __sort_lt(__sortcontext *c, __attr a, __attr b)
+{
+    char *s, *t;
+    __int ssize, tsize;
+    int result;
+    __attr value;
+
+    switch (c->mode)
+    {
+        case __SORT_INT:
+        return a.intvalue < b.intvalue;
+
+        case __SORT_STR:
+        s = __load_via_object(__VALUE(a), __data__).strvalue;
+        t = __load_via_object(__VALUE(b), __data__).strvalue;
+        ssize = __load_via_object(__VALUE(a), __size__).sizevalue;
+        tsize = __load_via_object(__VALUE(b), __size__).sizevalue;
+        result = memcmp(s, t, ssize < tsize ? ssize : tsize);
+        return result < 0 || (!result && (ssize < tsize));
+
+        case __SORT_LT:
+        return __BOOL(__invoke(c->lt, 1, 0, 0, 0, 3, __ARGS(__NULL, a, b)));
+
+        /* Comparison results that are not integers are compared with zero
+           using the less-than function. */
+
+        default:
+        value = __invoke(c->cmp, 0, 0, 0, 0, 3, __ARGS(__NULL, a, b));
+
+        if (__INTEGER(value))
+            return __TOINT(value) < 0;
+
+        return __BOOL(__invoke(c->lt, 1, 0, 0, 0, 3, __ARGS(__NULL, value, __new_int(0))));
+    }
+}
+
+/* Sort the items from 'start' up to but not including 'end' by insertion. */
+
+static void __sort_insertion(__sortcontext *c, __sortitem *items, __int start, __int end)
+{
+    __sortitem item;
+    __int i, j;
+
+    for (i = start + 1; i < end; i++)
+    {
+        item = items[i];
+
+        /* Move earlier items greater than this item, retaining the order of
+           equal items. */
+
+        for (j = i; (j > start) && __sort_lt(c, item.key, items[j - 1].key); j--)
+            items[j] = items[j - 1];
+
+        items[j] = item;
+    }
+}
+
+/* Merge the sorted runs from 'start' to 'middle' and from 'middle' to 'end',
+   using 'tmp' to hold the merged items. */
+
+static void __sort_merge(__sortcontext *c, __sortitem *items, __sortitem *tmp,
+                         __int start, __int middle, __int end)
+{
+    __int i = start, j = middle, k = start;
+
+    /* Runs that are already in order need no merging. */
+
+    if (!__sort_lt(c, items[middle].key, items[middle - 1].key))
+        return;
+
+    /* Take items from the second run only when less than those in the first,
+       retaining the order of equal items. */
+
+    while ((i < middle) && (j < end))
+    {
+        if (__sort_lt(c, items[j].key, items[i].key))
+            tmp[k++] = items[j++];
+        else
+            tmp[k++] = items[i++];
+    }
+
+    while (i < middle)
+        tmp[k++] = items[i++];
+
+    /* Any remaining items in the second run are already in place. */
+
+    memcpy(items + start, tmp + start, (k - start) * sizeof(__sortitem));
+}
+
+__attr __fn_native_list_list_sort(__attr __self, __attr self, __attr keys, __attr cmp, __attr lt, __attr reverse)
+{
+    /* self.__data__, keys.__data__ interpreted as list */
+    __fragment *data = __load_via_object(__VALUE(self), __data__).seqvalue;
+    __fragment *keydata = __load_via_object(__VALUE(keys), __data__).seqvalue;
+    __int n = data->size < keydata->size ? data->size : keydata->size;
+    int descending = __BOOL(reverse);
+    __sortitem *items, *tmp;
+    __sortcontext c;
+    __int i, start, width;
+
+    if (n < 2)
+        return __builtins___boolean_True;
+
+    /* Copy the keys and items, reversing them for a descending sort so that
+       equal items retain their original order. */
+
+    items = (__sortitem *) __ALLOCATE(n, sizeof(__sortitem));
+    tmp = (__sortitem *) __ALLOCATE(n, sizeof(__sortitem));
+
+    for (i = 0; i < n; i++)
+        items[descending ? n - 1 - i : i] = (__sortitem) {.key=keydata->attrs[i], .value=data->attrs[i]};
+
+    /* Employ any comparison function. Otherwise, compare integers or strings
+       directly, only employing the less-than function for other keys. */
+
+    c.cmp = cmp;
+    c.lt = lt;
+
+    if (__VALUE(cmp) != __VALUE(__builtins___none_None))
+        c.mode = __SORT_CMP;
+    else
+    {
+        for (i = 0; (i < n) && __INTEGER(items[i].key); i++);
+
+        if (i == n)
+            c.mode = __SORT_INT;
+        else
+        {
+            for (i = 0; (i < n) && __sort_is_str(items[i].key); i++);
+
+            c.mode = i == n ? __SORT_STR : __SORT_LT;
+        }
+    }
+
+    /* Sort short runs and then merge runs of increasing size. */
+
+    for (start = 0; start < n; start += __SORT_RUN)
+        __sort_insertion(&c, items, start, start + __SORT_RUN < n ? start + __SORT_RUN : n);
+
+    for (width = __SORT_RUN; width < n; width *= 2)
+    {
+        for (start = 0; start + width < n; start += 2 * width)
+            __sort_merge(&c, items, tmp, start, start + width,
+                         start + 2 * width < n ? start + 2 * width : n);
+    }
+
+    /* Indicate failure if the list was replaced or resized by any comparison,
+       leaving the list as it is. */
+
+    if ((__load_via_object(__VALUE(self), __data__).seqvalue != data) || (data->size != n))
+        return __builtins___boolean_False;
+
+    /* Store the sorted items in the list. */
+
+    for (i = 0; i < n; i++)
+        data->attrs[i] = items[descending ? n - 1 - i : i].value;
+
+    return __builtins___boolean_True;
+}
+
 /* Module initialisation. */
 
 void __main_native_list()
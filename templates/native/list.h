@@ -27,10 +27,14 @@ __attr __fn_native_list_list_init(__attr __self, __attr size);
 __attr __fn_native_list_list_setsize(__attr __self, __attr _data, __attr size);
 __attr __fn_native_list_list_append(__attr __self, __attr self, __attr value);
 __attr __fn_native_list_list_concat(__attr __self, __attr self, __attr other);
+__attr __fn_native_list_list_insert(__attr __self, __attr self, __attr index, __attr value);
+__attr __fn_native_list_list_delete(__attr __self, __attr self, __attr start, __attr end);
+__attr __fn_native_list_list_replace(__attr __self, __attr self, __attr start, __attr end, __attr other);
 __attr __fn_native_list_list_len(__attr __self, __attr _data);
 __attr __fn_native_list_list_nonempty(__attr __self, __attr _data);
 __attr __fn_native_list_list_element(__attr __self, __attr _data, __attr index);
 __attr __fn_native_list_list_setelement(__attr __self, __attr _data, __attr index, __attr value);
+__attr __fn_native_list_list_sort(__attr __self, __attr self, __attr keys, __attr cmp, __attr lt, __attr reverse);
 
 /* Module initialisation. */
 
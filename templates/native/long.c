@@ -0,0 +1,1137 @@
+/* Native functions for long integer operations.
+
+Copyright (C) 2021 Paul Boddie <paul@boddie.org.uk>
+
+This program is free software; you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation; either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+details.
+
+You should have received a copy of the GNU General Public License along with
+this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <ctype.h>  /* isspace */
+#include <math.h>   /* frexp, isinf, isnan, ldexp */
+#include <string.h> /* memcpy, memset */
+#include "native/common.h"
+#include "native/float.h"
+#include "native/long.h"
+#include "types.h"
+#include "exceptions.h"
+#include "ops.h"
+#include "progconsts.h"
+#include "progops.h"
+#include "progtypes.h"
+#include "main.h"
+
+/* Digit details. */
+
+#define __LONG_BITS 32
+#define __LONG_MASK 0xffffffff
+
+/* The number of digits in each operand above which multiplication employs the
+   Karatsuba method instead of the schoolbook method. */
+
+#define __LONG_KARATSUBA_CUTOFF 48
+
+/* The largest power of ten held in a digit, used in string conversion. */
+
+#define __LONG_DECIMAL_BASE 1000000000
+#define __LONG_DECIMAL_DIGITS 9
+
+#define __LONG_LENGTH(L) ((L)->size < 0 ? -(L)->size : (L)->size)
+
+/* Storage for ints presented as long integers. */
+
+typedef union __long_storage
+{
+    __long l;
+    char data[sizeof(__long) + sizeof(__int)];
+} __long_storage;
+
+/* Allocate a long integer with 'n' digits, all initially zero. Since the digits
+   hold no references, the storage need not be scanned. */
+
+static __long *long_alloc(__int n)
+{
+    __long *l = (__long *) __ALLOCATEIM(1, sizeof(__long) + (n ? n : 1) * sizeof(uint32_t));
+
+    memset(l->digits, 0, (n ? n : 1) * sizeof(uint32_t));
+    l->size = n;
+    return l;
+}
+
+/* Remove leading zero digits from 'l', setting any negative sign. */
+
+static __long *long_normalise(__long *l, int negative)
+{
+    __int n = __LONG_LENGTH(l);
+
+    while (n && !l->digits[n - 1])
+        n--;
+
+    l->size = negative ? -n : n;
+    return l;
+}
+
+/* Obtain a long integer for a long or an int, using 'storage' for ints. */
+
+static __long *long_value(__attr attr, __long_storage *storage)
+{
+    __int i, n = 0;
+    uint64_t u;
+
+    if (!__INTEGER(attr))
+        return (__long *) __load_via_object(__VALUE(attr), __data__).datavalue;
+
+    i = __TOINT(attr);
+    u = i < 0 ? -((uint64_t) i) : (uint64_t) i;
+
+    while (u)
+    {
+        storage->l.digits[n++] = (uint32_t) u;
+        u >>= __LONG_BITS;
+    }
+
+    storage->l.size = i < 0 ? -n : n;
+    return &storage->l;
+}
+
+/* Return an int for 'l' if representable, otherwise a long instance. */
+
+static __attr long_result(__long *l)
+{
+    __int n = __LONG_LENGTH(l), i;
+    uint64_t u = 0;
+    __attr attr;
+
+    if (n * __LONG_BITS <= 64)
+    {
+        for (i = n - 1; i >= 0; i--)
+            u = (u << __LONG_BITS) | l->digits[i];
+
+        if ((l->size >= 0) && (u <= (uint64_t) __MAXINT))
+            return __new_int((__int) u);
+        else if ((l->size < 0) && (u <= -((uint64_t) __MININT)))
+            return __new_int(-((__int) (u - 1)) - 1);
+    }
+
+    attr = __NEWINSTANCE(__builtins___long_long);
+    __store_via_object(__VALUE(attr), __data__, (__attr) {.datavalue=l});
+    return attr;
+}
+
+/* Magnitude operations on digit arrays. */
+
+/* Compare 'a' having 'na' digits with 'b' having 'nb' digits, with neither
+   having leading zero digits. */
+
+static int mag_cmp(const uint32_t *a, __int na, const uint32_t *b, __int nb)
+{
+    __int i;
+
+    if (na != nb)
+        return na < nb ? -1 : 1;
+
+    for (i = na - 1; i >= 0; i--)
+        if (a[i] != b[i])
+            return a[i] < b[i] ? -1 : 1;
+
+    return 0;
+}
+
+/* Add 'b' having 'nb' digits to 'r' having 'nr' digits, where 'nr' is at least
+   'nb' and large enough to hold the result. */
+
+static void mag_add_to(uint32_t *r, __int nr, const uint32_t *b, __int nb)
+{
+    uint64_t carry = 0;
+    __int i;
+
+    for (i = 0; i < nb; i++)
+    {
+        carry += (uint64_t) r[i] + b[i];
+        r[i] = (uint32_t) carry;
+        carry >>= __LONG_BITS;
+    }
+
+    for (; carry && (i < nr); i++)
+    {
+        carry += r[i];
+        r[i] = (uint32_t) carry;
+        carry >>= __LONG_BITS;
+    }
+}
+
+/* Subtract 'b' having 'nb' digits from 'r' having 'nr' digits, where 'r' is at
+   least as large as 'b'. */
+
+static void mag_sub_from(uint32_t *r, __int nr, const uint32_t *b, __int nb)
+{
+    int64_t borrow = 0;
+    __int i;
+
+    for (i = 0; i < nb; i++)
+    {
+        borrow += (int64_t) r[i] - b[i];
+        r[i] = (uint32_t) borrow;
+        borrow = borrow < 0 ? -1 : 0;
+    }
+
+    for (; borrow && (i < nr); i++)
+    {
+        borrow += r[i];
+        r[i] = (uint32_t) borrow;
+        borrow = borrow < 0 ? -1 : 0;
+    }
+}
+
+/* Multiply 'a' by 'b' using the schoolbook method, writing 'na' + 'nb' digits
+   to 'r'. */
+
+static void mag_mul_simple(uint32_t *r, const uint32_t *a, __int na,
+                           const uint32_t *b, __int nb)
+{
+    uint64_t carry;
+    __int i, j;
+
+    memset(r, 0, (na + nb) * sizeof(uint32_t));
+
+    for (i = 0; i < na; i++)
+    {
+        if (!a[i])
+            continue;
+
+        carry = 0;
+
+        for (j = 0; j < nb; j++)
+        {
+            carry += (uint64_t) a[i] * b[j] + r[i + j];
+            r[i + j] = (uint32_t) carry;
+            carry >>= __LONG_BITS;
+        }
+
+        r[i + nb] = (uint32_t) carry;
+    }
+}
+
+/* Multiply 'a' by 'b', writing 'na' + 'nb' digits to 'r'. Large operands are
+   split into halves and multiplied using three half-sized products instead of
+   four. */
+
+static void mag_mul(uint32_t *r, const uint32_t *a, __int na,
+                    const uint32_t *b, __int nb)
+{
+    const uint32_t *t;
+    uint32_t *p, *sa, *sb, *z1;
+    __int h, i, n, nsa, nsb;
+
+    /* Make 'a' the longer operand. */
+
+    if (na < nb)
+    {
+        t = a; a = b; b = t;
+        n = na; na = nb; nb = n;
+    }
+
+    if (nb < __LONG_KARATSUBA_CUTOFF)
+    {
+        mag_mul_simple(r, a, na, b, nb);
+        return;
+    }
+
+    /* Multiply a much longer operand in slices of the shorter one's length. */
+
+    if (2 * nb <= na)
+    {
+        p = (uint32_t *) __ALLOCATEIM(2 * nb, sizeof(uint32_t));
+        memset(r, 0, (na + nb) * sizeof(uint32_t));
+
+        for (i = 0; i < na; i += nb)
+        {
+            n = na - i < nb ? na - i : nb;
+            mag_mul(p, a + i, n, b, nb);
+            mag_add_to(r + i, na + nb - i, p, n + nb);
+        }
+
+        return;
+    }
+
+    /* Split the operands into low and high parts at 'h' digits, with the
+       shorter operand still having a high part. */
+
+    h = na / 2;
+
+    /* Compute the low and high products in the result. */
+
+    mag_mul(r, a, h, b, h);
+    mag_mul(r + 2 * h, a + h, na - h, b + h, nb - h);
+
+    /* Compute the product of the sums of the parts. */
+
+    nsa = na - h + 1;
+    nsb = (h > nb - h ? h : nb - h) + 1;
+
+    sa = (uint32_t *) __ALLOCATEIM(nsa + nsb + nsa + nsb, sizeof(uint32_t));
+    sb = sa + nsa;
+    z1 = sb + nsb;
+
+    memset(sa, 0, (nsa + nsb) * sizeof(uint32_t));
+    memcpy(sa, a + h, (na - h) * sizeof(uint32_t));
+    mag_add_to(sa, nsa, a, h);
+    memcpy(sb, b, h * sizeof(uint32_t));
+    mag_add_to(sb, nsb, b + h, nb - h);
+
+    mag_mul(z1, sa, nsa, sb, nsb);
+
+    /* Remove the low and high products, leaving the middle product, and add it
+       to the result. */
+
+    mag_sub_from(z1, nsa + nsb, r, 2 * h);
+    mag_sub_from(z1, nsa + nsb, r + 2 * h, na + nb - 2 * h);
+
+    n = nsa + nsb;
+    while (n && !z1[n - 1])
+        n--;
+
+    mag_add_to(r + h, na + nb - h, z1, n);
+}
+
+/* Divide 'a' by the single digit 'b', writing the quotient to 'q' and returning
+   the remainder. */
+
+static uint32_t mag_divmod_digit(uint32_t *q, const uint32_t *a, __int na, uint32_t b)
+{
+    uint64_t rem = 0;
+    __int i;
+
+    for (i = na - 1; i >= 0; i--)
+    {
+        rem = (rem << __LONG_BITS) | a[i];
+        q[i] = (uint32_t) (rem / b);
+        rem %= b;
+    }
+
+    return (uint32_t) rem;
+}
+
+/* Divide 'u' having 'm' digits by 'v' having 'n' digits, where 'm' is at least
+   'n' and 'n' is at least two, writing 'm' - 'n' + 1 digits of quotient to 'q'
+   and 'n' digits of remainder to 'r'. This follows Knuth's algorithm D. */
+
+static void mag_divmod(uint32_t *q, uint32_t *r, const uint32_t *u, __int m,
+                       const uint32_t *v, __int n)
+{
+    uint32_t *un, *vn;
+    uint64_t num, qhat, rhat, p;
+    int64_t t, k;
+    __int i, j;
+    int s;
+
+    /* Normalise the operands so that the divisor's top digit has its top bit
+       set. */
+
+    s = __builtin_clz(v[n - 1]);
+
+    un = (uint32_t *) __ALLOCATEIM(m + 1 + n, sizeof(uint32_t));
+    vn = un + m + 1;
+
+    for (i = n - 1; i > 0; i--)
+        vn[i] = (v[i] << s) | (s ? v[i - 1] >> (__LONG_BITS - s) : 0);
+    vn[0] = v[0] << s;
+
+    un[m] = s ? u[m - 1] >> (__LONG_BITS - s) : 0;
+    for (i = m - 1; i > 0; i--)
+        un[i] = (u[i] << s) | (s ? u[i - 1] >> (__LONG_BITS - s) : 0);
+    un[0] = u[0] << s;
+
+    for (j = m - n; j >= 0; j--)
+    {
+        /* Estimate the quotient digit. */
+
+        num = ((uint64_t) un[j + n] << __LONG_BITS) | un[j + n - 1];
+        qhat = num / vn[n - 1];
+        rhat = num % vn[n - 1];
+
+        while ((qhat > __LONG_MASK) ||
+               (qhat * vn[n - 2] > ((rhat << __LONG_BITS) | un[j + n - 2])))
+        {
+            qhat--;
+            rhat += vn[n - 1];
+            if (rhat > __LONG_MASK)
+                break;
+        }
+
+        /* Multiply and subtract. */
+
+        k = 0;
+        for (i = 0; i < n; i++)
+        {
+            p = qhat * vn[i];
+            t = (int64_t) un[i + j] - k - (int64_t) (p & __LONG_MASK);
+            un[i + j] = (uint32_t) t;
+            k = (int64_t) (p >> __LONG_BITS) - (t >> __LONG_BITS);
+        }
+
+        t = (int64_t) un[j + n] - k;
+        un[j + n] = (uint32_t) t;
+        q[j] = (uint32_t) qhat;
+
+        /* Add back if the estimate was one too large. */
+
+        if (t < 0)
+        {
+            q[j]--;
+            p = 0;
+            for (i = 0; i < n; i++)
+            {
+                p += (uint64_t) un[i + j] + vn[i];
+                un[i + j] = (uint32_t) p;
+                p >>= __LONG_BITS;
+            }
+            un[j + n] += (uint32_t) p;
+        }
+    }
+
+    /* Unnormalise the remainder. */
+
+    for (i = 0; i < n - 1; i++)
+        r[i] = (un[i] >> s) | (s ? un[i + 1] << (__LONG_BITS - s) : 0);
+    r[n - 1] = un[n - 1] >> s;
+}
+
+/* Signed operations on long integers. */
+
+/* Add 'a' and 'b', negating 'b' if 'subtract' is set. */
+
+static __long *long_add(__long *a, __long *b, int subtract)
+{
+    __int na = __LONG_LENGTH(a), nb = __LONG_LENGTH(b);
+    int negative_a = a->size < 0, negative_b = (b->size < 0) != subtract;
+    __long *r;
+
+    /* Add magnitudes when the signs are the same. */
+
+    if (negative_a == negative_b)
+    {
+        if (na < nb)
+        {
+            r = long_alloc(nb + 1);
+            memcpy(r->digits, b->digits, nb * sizeof(uint32_t));
+            mag_add_to(r->digits, nb + 1, a->digits, na);
+        }
+        else
+        {
+            r = long_alloc(na + 1);
+            memcpy(r->digits, a->digits, na * sizeof(uint32_t));
+            mag_add_to(r->digits, na + 1, b->digits, nb);
+        }
+
+        return long_normalise(r, negative_a);
+    }
+
+    /* Otherwise, subtract the smaller magnitude from the larger one. */
+
+    if (mag_cmp(a->digits, na, b->digits, nb) < 0)
+    {
+        r = long_alloc(nb);
+        memcpy(r->digits, b->digits, nb * sizeof(uint32_t));
+        mag_sub_from(r->digits, nb, a->digits, na);
+        return long_normalise(r, negative_b);
+    }
+    else
+    {
+        r = long_alloc(na);
+        memcpy(r->digits, a->digits, na * sizeof(uint32_t));
+        mag_sub_from(r->digits, na, b->digits, nb);
+        return long_normalise(r, negative_a);
+    }
+}
+
+static __long *long_mul(__long *a, __long *b)
+{
+    __int na = __LONG_LENGTH(a), nb = __LONG_LENGTH(b);
+    __long *r;
+
+    if (!na || !nb)
+        return long_alloc(0);
+
+    r = long_alloc(na + nb);
+    mag_mul(r->digits, a->digits, na, b->digits, nb);
+    return long_normalise(r, (a->size < 0) != (b->size < 0));
+}
+
+/* Divide 'a' by 'b', rounding the quotient towards negative infinity, and
+   providing a remainder with the sign of 'b'. Either result may be omitted. */
+
+static void long_divmod(__long *a, __long *b, __long **quotient, __long **remainder)
+{
+    __int na = __LONG_LENGTH(a), nb = __LONG_LENGTH(b);
+    int negative = (a->size < 0) != (b->size < 0);
+    __long *q, *r;
+
+    if (!nb)
+        __raise_zero_division_error();
+
+    /* Handle dividends smaller than the divisor. */
+
+    if (mag_cmp(a->digits, na, b->digits, nb) < 0)
+    {
+        q = long_alloc(0);
+        r = long_alloc(na);
+        memcpy(r->digits, a->digits, na * sizeof(uint32_t));
+    }
+
+    /* Divide by single digits directly. */
+
+    else if (nb == 1)
+    {
+        q = long_alloc(na);
+        r = long_alloc(1);
+        r->digits[0] = mag_divmod_digit(q->digits, a->digits, na, b->digits[0]);
+    }
+    else
+    {
+        q = long_alloc(na - nb + 1);
+        r = long_alloc(nb);
+        mag_divmod(q->digits, r->digits, a->digits, na, b->digits, nb);
+    }
+
+    long_normalise(q, negative);
+    long_normalise(r, a->size < 0);
+
+    /* Adjust truncated results where the operands have different signs and
+       the division is inexact. */
+
+    if (negative && r->size)
+    {
+        __long one = {.size=1};
+        __long_storage storage;
+
+        storage.l = one;
+        storage.l.digits[0] = 1;
+
+        q = long_add(q, &storage.l, 1);
+        r = long_add(r, b, 0);
+    }
+
+    if (quotient)
+        *quotient = q;
+    if (remainder)
+        *remainder = r;
+}
+
+/* Convert 'a' to two's complement form with 'n' digits. */
+
+static void long_to_twos(__long *a, uint32_t *digits, __int n)
+{
+    __int na = __LONG_LENGTH(a), i;
+    uint64_t borrow = 1;
+
+    memset(digits, 0, n * sizeof(uint32_t));
+    memcpy(digits, a->digits, na * sizeof(uint32_t));
+
+    /* Negative numbers are inverted after subtracting one. */
+
+    if (a->size < 0)
+        for (i = 0; i < n; i++)
+        {
+            uint64_t d = (uint64_t) digits[i] - borrow;
+
+            borrow = d >> 63;
+            digits[i] = ~((uint32_t) d);
+        }
+}
+
+/* Convert the two's complement 'r', being negative if 'negative' is set, to a
+   long integer. */
+
+static __long *long_from_twos(__long *r, int negative)
+{
+    __int n = __LONG_LENGTH(r), i;
+    uint64_t carry = 1;
+
+    /* Negative numbers are inverted before adding one. */
+
+    if (negative)
+        for (i = 0; i < n; i++)
+        {
+            carry += (uint32_t) ~r->digits[i];
+            r->digits[i] = (uint32_t) carry;
+            carry >>= __LONG_BITS;
+        }
+
+    return long_normalise(r, negative);
+}
+
+/* Perform a bitwise operation ('&', '|' or '^') on 'a' and 'b'. */
+
+static __long *long_bitwise(__long *a, __long *b, char op)
+{
+    __int na = __LONG_LENGTH(a), nb = __LONG_LENGTH(b);
+    __int n = (na > nb ? na : nb) + 1, i;
+    uint32_t *da = (uint32_t *) __ALLOCATEIM(n, sizeof(uint32_t));
+    __long *r = long_alloc(n);
+    int negative_a = a->size < 0, negative_b = b->size < 0, negative;
+
+    long_to_twos(a, da, n);
+    long_to_twos(b, r->digits, n);
+
+    for (i = 0; i < n; i++)
+    {
+        if (op == '&')
+            r->digits[i] &= da[i];
+        else if (op == '|')
+            r->digits[i] |= da[i];
+        else
+            r->digits[i] ^= da[i];
+    }
+
+    if (op == '&')
+        negative = negative_a && negative_b;
+    else if (op == '|')
+        negative = negative_a || negative_b;
+    else
+        negative = negative_a != negative_b;
+
+    return long_from_twos(r, negative);
+}
+
+/* Shift the magnitude of 'a' left by 'bits'. */
+
+static __long *long_lshift(__long *a, __int bits)
+{
+    __int na = __LONG_LENGTH(a), shift = bits / __LONG_BITS, i;
+    int s = bits % __LONG_BITS;
+    __long *r = long_alloc(na + shift + 1);
+
+    for (i = 0; i < na; i++)
+    {
+        r->digits[i + shift] |= a->digits[i] << s;
+        if (s)
+            r->digits[i + shift + 1] = a->digits[i] >> (__LONG_BITS - s);
+    }
+
+    return long_normalise(r, a->size < 0);
+}
+
+/* Shift the magnitude of 'a' right by 'bits'. */
+
+static __long *long_rshift(__long *a, __int bits)
+{
+    __int na = __LONG_LENGTH(a), shift = bits / __LONG_BITS, i;
+    int s = bits % __LONG_BITS;
+    __long *r;
+
+    if (shift >= na)
+        return long_alloc(0);
+
+    r = long_alloc(na - shift);
+
+    for (i = shift; i < na; i++)
+    {
+        r->digits[i - shift] = a->digits[i] >> s;
+        if (s && (i + 1 < na))
+            r->digits[i - shift] |= a->digits[i + 1] << (__LONG_BITS - s);
+    }
+
+    return long_normalise(r, a->size < 0);
+}
+
+/* Compare 'a' and 'b'. */
+
+static int long_cmp(__long *a, __long *b)
+{
+    int negative_a = a->size < 0, negative_b = b->size < 0;
+
+    if (negative_a != negative_b)
+        return negative_a ? -1 : 1;
+
+    if (negative_a)
+        return mag_cmp(b->digits, -b->size, a->digits, -a->size);
+    else
+        return mag_cmp(a->digits, a->size, b->digits, b->size);
+}
+
+/* Conversion between long integers and other numbers. */
+
+double __long_to_double(__attr attr)
+{
+    __long_storage storage;
+    __long *a = long_value(attr, &storage);
+    __int i;
+    double result = 0;
+
+    for (i = __LONG_LENGTH(a) - 1; i >= 0; i--)
+        result = result * 4294967296.0 + a->digits[i];
+
+    /* Test for overflow. */
+    if (isinf(result))
+        __raise_overflow_error();
+
+    return a->size < 0 ? -result : result;
+}
+
+__attr __long_from_double(double n)
+{
+    double fraction;
+    int exponent;
+    __int ndigits, i;
+    __long *r;
+
+    /* Test for values that cannot be represented. */
+    if (isnan(n))
+        __raise_value_error(__new_float(n));
+    else if (isinf(n))
+        __raise_overflow_error();
+
+    fraction = frexp(n < 0 ? -n : n, &exponent);
+
+    if (exponent <= 0)
+        return __new_int(0);
+
+    /* Extract digits from the most significant end. */
+    ndigits = (exponent - 1) / __LONG_BITS + 1;
+    r = long_alloc(ndigits);
+    fraction = ldexp(fraction, (exponent - 1) % __LONG_BITS + 1);
+
+    for (i = ndigits - 1; i >= 0; i--)
+    {
+        uint32_t d = (uint32_t) fraction;
+
+        r->digits[i] = d;
+        fraction = ldexp(fraction - d, __LONG_BITS);
+    }
+
+    return long_result(long_normalise(r, n < 0));
+}
+
+/* Long integer operations. */
+
+__attr __fn_native_long_long_new(__attr __self, __attr number)
+{
+    /* number interpreted as int or long */
+    __long_storage storage;
+    __long *a = long_value(number, &storage), *r;
+    __attr attr;
+
+    /* Produce a long instance even for numbers representable as ints. */
+    if (!__INTEGER(number))
+        return number;
+
+    r = long_alloc(__LONG_LENGTH(a));
+    memcpy(r->digits, a->digits, __LONG_LENGTH(a) * sizeof(uint32_t));
+    r->size = a->size;
+
+    attr = __NEWINSTANCE(__builtins___long_long);
+    __store_via_object(__VALUE(attr), __data__, (__attr) {.datavalue=r});
+    return attr;
+}
+
+__attr __fn_native_long_long_parse(__attr __self, __attr value, __attr base)
+{
+    /* value interpreted as string */
+    char *s = __load_via_object(__VALUE(value), __data__).strvalue;
+    __int size = __load_via_object(__VALUE(value), __size__).sizevalue;
+    /* base interpreted as int */
+    __int ibase = __TOINT(base);
+    __int i = 0, n = 0, j;
+    uint64_t carry;
+    int negative = 0, d;
+    __long *r;
+
+    if ((ibase < 2) || (ibase > 36))
+        __raise_value_error(base);
+
+    /* Skip whitespace and obtain any sign. */
+    while ((i < size) && isspace(s[i]))
+        i++;
+
+    if ((i < size) && ((s[i] == '-') || (s[i] == '+')))
+        negative = s[i++] == '-';
+
+    /* Each character provides fewer than six bits. */
+    r = long_alloc((size - i) * 6 / __LONG_BITS + 1);
+
+    for (; (i < size) && isalnum(s[i]); i++, n++)
+    {
+        d = isdigit(s[i]) ? s[i] - '0' : tolower(s[i]) - 'a' + 10;
+
+        if (d >= ibase)
+            break;
+
+        /* Multiply the existing digits by the base and add the new digit. */
+        carry = d;
+        for (j = 0; j < __LONG_LENGTH(r); j++)
+        {
+            carry += (uint64_t) r->digits[j] * ibase;
+            r->digits[j] = (uint32_t) carry;
+            carry >>= __LONG_BITS;
+        }
+    }
+
+    /* Permit a long suffix and whitespace. */
+    if (n && (i < size) && ((s[i] == 'L') || (s[i] == 'l')))
+        i++;
+
+    while ((i < size) && isspace(s[i]))
+        i++;
+
+    if (!n || (i != size))
+        __raise_value_error(value);
+
+    return long_result(long_normalise(r, negative));
+}
+
+__attr __fn_native_long_long_add(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+
+    /* Return the new number. */
+    return long_result(long_add(i, j, 0));
+}
+
+__attr __fn_native_long_long_sub(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+
+    /* Return the new number. */
+    return long_result(long_add(i, j, 1));
+}
+
+__attr __fn_native_long_long_mul(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+
+    /* Return the new number. */
+    return long_result(long_mul(i, j));
+}
+
+__attr __fn_native_long_long_div(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+    __long *q;
+
+    long_divmod(i, j, &q, NULL);
+
+    /* Return the new number. */
+    return long_result(q);
+}
+
+__attr __fn_native_long_long_mod(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+    __long *r;
+
+    long_divmod(i, j, NULL, &r);
+
+    /* Return the new number. */
+    return long_result(r);
+}
+
+__attr __fn_native_long_long_pow(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+    __long *result, *base;
+    __int n, bit;
+
+    /* Negative exponents produce floating point results. */
+    if (j->size < 0)
+        return __fn_native_float_float_pow(__NULL, self, other);
+
+    /* Employ repeated squaring, testing each bit of the exponent. */
+    result = long_alloc(1);
+    result->digits[0] = 1;
+    base = i;
+
+    for (n = 0; n < j->size; n++)
+        for (bit = 0; bit < __LONG_BITS; bit++)
+        {
+            if (j->digits[n] & ((uint32_t) 1 << bit))
+                result = long_mul(result, base);
+
+            /* Stop after the most significant bit. */
+            if ((n == j->size - 1) && !(j->digits[n] >> bit >> 1))
+                break;
+
+            base = long_mul(base, base);
+        }
+
+    /* Return the new number. */
+    return long_result(result);
+}
+
+__attr __fn_native_long_long_neg(__attr __self, __attr self)
+{
+    /* self interpreted as long */
+    __long_storage si;
+    __long *i = long_value(self, &si);
+    __long *r = long_alloc(__LONG_LENGTH(i));
+
+    memcpy(r->digits, i->digits, __LONG_LENGTH(i) * sizeof(uint32_t));
+    r->size = -i->size;
+
+    /* Return the new number. */
+    return long_result(r);
+}
+
+__attr __fn_native_long_long_and(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+
+    /* Return the new number. */
+    return long_result(long_bitwise(i, j, '&'));
+}
+
+__attr __fn_native_long_long_not(__attr __self, __attr self)
+{
+    /* self interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *one = long_value(__new_int(1), &sj);
+
+    /* Return the new number, this being -(self + 1). */
+    __long *r = long_add(i, one, 0);
+    r->size = -r->size;
+    return long_result(r);
+}
+
+__attr __fn_native_long_long_or(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+
+    /* Return the new number. */
+    return long_result(long_bitwise(i, j, '|'));
+}
+
+__attr __fn_native_long_long_xor(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+
+    /* Return the new number. */
+    return long_result(long_bitwise(i, j, '^'));
+}
+
+__attr __fn_native_long_long_lshift(__attr __self, __attr self, __attr other)
+{
+    /* self interpreted as long */
+    __long_storage si;
+    __long *i = long_value(self, &si);
+
+    /* other interpreted as int */
+    if (!__INTEGER(other))
+        __raise_overflow_error();
+    else if (__TOINT(other) < 0)
+        __raise_value_error(other);
+
+    /* Return the new number. */
+    return long_result(long_lshift(i, __TOINT(other)));
+}
+
+__attr __fn_native_long_long_rshift(__attr __self, __attr self, __attr other)
+{
+    /* self interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *one = long_value(__new_int(1), &sj);
+    __long *r;
+    __int bits;
+
+    /* other interpreted as int, with huge shifts leaving only the sign */
+    if (!__INTEGER(other))
+        return __new_int(i->size < 0 ? -1 : 0);
+
+    bits = __TOINT(other);
+
+    if (bits < 0)
+        __raise_value_error(other);
+
+    /* Shift negative numbers as -((-self - 1) >> other) - 1, with the
+       magnitude of self + 1 being shifted. */
+    if (i->size < 0)
+        r = long_add(long_rshift(long_add(i, one, 0), bits), one, 1);
+    else
+        r = long_rshift(i, bits);
+
+    /* Return the new number. */
+    return long_result(r);
+}
+
+__attr __fn_native_long_long_le(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+
+    /* Return a boolean result. */
+    return long_cmp(i, j) <= 0 ? __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_long_long_lt(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+
+    /* Return a boolean result. */
+    return long_cmp(i, j) < 0 ? __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_long_long_ge(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+
+    /* Return a boolean result. */
+    return long_cmp(i, j) >= 0 ? __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_long_long_gt(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+
+    /* Return a boolean result. */
+    return long_cmp(i, j) > 0 ? __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_long_long_eq(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+
+    /* Return a boolean result. */
+    return long_cmp(i, j) == 0 ? __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_long_long_ne(__attr __self, __attr self, __attr other)
+{
+    /* self and other interpreted as long */
+    __long_storage si, sj;
+    __long *i = long_value(self, &si);
+    __long *j = long_value(other, &sj);
+
+    /* Return a boolean result. */
+    return long_cmp(i, j) != 0 ? __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_long_long_float(__attr __self, __attr self)
+{
+    /* Return the new float. */
+    return __new_float(__long_to_double(self));
+}
+
+__attr __fn_native_long_long_hash(__attr __self, __attr self)
+{
+    /* self interpreted as long */
+    __long_storage si;
+    __long *i = long_value(self, &si);
+    uint64_t h = 0;
+    __int n;
+
+    /* Reduce the number modulo the largest integer, this being a Mersenne
+       prime for 64-bit integers, so that numbers representable as ints hash
+       like those ints. */
+    for (n = __LONG_LENGTH(i) - 1; n >= 0; n--)
+        h = ((h << __LONG_BITS) | i->digits[n]) % (uint64_t) __MAXINT;
+
+    /* Return the new integer. */
+    return __new_int(i->size < 0 ? -((__int) h) : (__int) h);
+}
+
+__attr __fn_native_long_long_str(__attr __self, __attr self)
+{
+    /* self interpreted as long */
+    __long_storage si;
+    __long *i = long_value(self, &si);
+    __int n = __LONG_LENGTH(i), nchunks = 0, size, pos, k;
+    uint32_t *digits, *chunks, chunk;
+    char *s;
+
+    /* Obtain decimal chunks by repeated division of the digits. */
+    digits = (uint32_t *) __ALLOCATEIM(n + 1, sizeof(uint32_t));
+    chunks = (uint32_t *) __ALLOCATEIM(n * 2 + 1, sizeof(uint32_t));
+    memcpy(digits, i->digits, n * sizeof(uint32_t));
+
+    do
+    {
+        chunks[nchunks++] = mag_divmod_digit(digits, digits, n, __LONG_DECIMAL_BASE);
+        while (n && !digits[n - 1])
+            n--;
+    }
+    while (n);
+
+    /* Reserve space for the chunks and any sign. */
+    size = nchunks * __LONG_DECIMAL_DIGITS + 1;
+    s = (char *) __ALLOCATE(size + 1, sizeof(char));
+    pos = size;
+
+    for (k = 0; k < nchunks; k++)
+    {
+        chunk = chunks[k];
+
+        /* Emit all digits of lower chunks but only significant digits of the
+           final chunk. */
+        do
+        {
+            s[--pos] = '0' + chunk % 10;
+            chunk /= 10;
+        }
+        while ((k < nchunks - 1) ? (size - pos) % __LONG_DECIMAL_DIGITS : chunk);
+    }
+
+    if (i->size < 0)
+        s[--pos] = '-';
+
+    /* Return a new string. */
+    memmove(s, s + pos, size - pos);
+    s[size - pos] = '\0';
+    return __new_str(s, size - pos);
+}
+
+/* Module initialisation. */
+
+void __main_native_long()
+{
+}
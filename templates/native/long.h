@@ -0,0 +1,75 @@
+/* Native functions for long integer operations.
+
+Copyright (C) 2021 Paul Boddie <paul@boddie.org.uk>
+
+This program is free software; you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation; either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+details.
+
+You should have received a copy of the GNU General Public License along with
+this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#ifndef __NATIVE_LONG_H__
+#define __NATIVE_LONG_H__
+
+#include "types.h"
+
+/* Long integers hold digits of 32 bits, least significant first, with the size
+   indicating the number of digits, being negative for negative numbers. Long
+   integer constants employ the same layout. */
+
+typedef struct __long
+{
+    __int size;
+    uint32_t digits[];
+} __long;
+
+/* Conversion between long integers and other numbers. */
+
+double __long_to_double(__attr attr);
+__attr __long_from_double(double n);
+
+/* Long integer operations. Each operand may be a long or an int. */
+
+__attr __fn_native_long_long_new(__attr __self, __attr number);
+__attr __fn_native_long_long_parse(__attr __self, __attr value, __attr base);
+
+__attr __fn_native_long_long_add(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_sub(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_mul(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_div(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_mod(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_pow(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_neg(__attr __self, __attr self);
+
+__attr __fn_native_long_long_and(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_not(__attr __self, __attr self);
+__attr __fn_native_long_long_or(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_xor(__attr __self, __attr self, __attr other);
+
+__attr __fn_native_long_long_lshift(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_rshift(__attr __self, __attr self, __attr other);
+
+__attr __fn_native_long_long_eq(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_ge(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_gt(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_le(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_lt(__attr __self, __attr self, __attr other);
+__attr __fn_native_long_long_ne(__attr __self, __attr self, __attr other);
+
+__attr __fn_native_long_long_float(__attr __self, __attr self);
+__attr __fn_native_long_long_hash(__attr __self, __attr self);
+__attr __fn_native_long_long_str(__attr __self, __attr self);
+
+/* Module initialisation. */
+
+void __main_native_long();
+
+#endif /* __NATIVE_LONG_H__ */
@@ -0,0 +1,421 @@
+/* Native functions for mapping operations.
+
+Copyright (C) 2016, 2017, 2021 Paul Boddie <paul@boddie.org.uk>
+
+This program is free software; you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation; either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+details.
+
+You should have received a copy of the GNU General Public License along with
+this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <string.h> /* memcmp, memset */
+#include "native/common.h"
+#include "types.h"
+#include "exceptions.h"
+#include "ops.h"
+#include "progconsts.h"
+#include "progops.h"
+#include "progtypes.h"
+#include "main.h"
+
+/* Mappings employ an index table of entry positions, addressed using the hash
+   values of keys, together with an entry table holding each hash value, key
+   and value in insertion order. Removed entries have null keys and are only
+   discarded when the tables are resized. */
+
+typedef struct __entry
+{
+    __int hash;
+    __attr key, value;
+} __entry;
+
+typedef struct __mapping
+{
+    __int size;                 /* number of items present */
+    __int used;                 /* number of entries used, including removed items */
+    __int removed;              /* number of removed index table positions */
+    __int capacity;             /* number of entries available */
+    size_t mask;                /* index table size minus one */
+    int32_t *indexes;           /* entry positions or special index values */
+    __entry *entries;           /* entries in insertion order */
+} __mapping;
+
+/* Special index values, with the changed value indicating that a search must
+   be repeated because the mapping was changed while testing key equality. */
+
+#define __INDEX_EMPTY   -1
+#define __INDEX_REMOVED -2
+#define __INDEX_CHANGED -3
+
+#define __MIN_INDEXES   8
+#define __PERTURB_SHIFT 5
+
+#define __TOMAPPING(ATTR) ((__mapping *) (ATTR).datavalue)
+
+/* Allocate tables with enough index table positions for the given number of
+   entries, keeping the index table no more than two-thirds full. */
+
+static void __mapping_allocate(__mapping *t, __int n)
+{
+    size_t nindexes = __MIN_INDEXES;
+
+    while (nindexes * 2 < n * 3)
+        nindexes *= 2;
+
+    t->mask = nindexes - 1;
+    t->capacity = (nindexes * 2) / 3;
+    t->used = 0;
+    t->removed = 0;
+
+    /* Index tables hold no references and may be allocated as such. */
+
+    t->indexes = (int32_t *) __ALLOCATEIM(nindexes, sizeof(int32_t));
+    memset(t->indexes, 0xff, nindexes * sizeof(int32_t));
+
+    t->entries = (__entry *) __ALLOCATE(t->capacity, sizeof(__entry));
+}
+
+/* Return the next index table position in the probe sequence for a hash. */
+
+static inline size_t __mapping_probe(__mapping *t, size_t i, size_t *perturb)
+{
+    *perturb >>= __PERTURB_SHIFT;
+    return (i * 5 + *perturb + 1) & t->mask;
+}
+
+/* Return an unused index table position for the given hash value. */
+
+static size_t __mapping_empty_slot(__mapping *t, __int hash)
+{
+    size_t perturb = (size_t) hash;
+    size_t i = perturb & t->mask;
+
+    while (t->indexes[i] != __INDEX_EMPTY)
+        i = __mapping_probe(t, i, &perturb);
+
+    return i;
+}
+
+/* Return the index table position referencing the given entry position. */
+
+static size_t __mapping_entry_slot(__mapping *t, __int hash, int32_t index)
+{
+    size_t perturb = (size_t) hash;
+    size_t i = perturb & t->mask;
+
+    while (t->indexes[i] != index)
+        i = __mapping_probe(t, i, &perturb);
+
+    return i;
+}
+
+/* Resize the tables to hold the given number of entries, discarding removed
+   entries. */
+
+static void __mapping_resize(__mapping *t, __int n)
+{
+    __entry *entries = t->entries;
+    __int used = t->used, i, j;
+
+    __mapping_allocate(t, n);
+
+    for (i = 0, j = 0; i < used; i++)
+    {
+        if (__ISNULL(entries[i].key))
+            continue;
+
+        t->entries[j] = entries[i];
+        t->indexes[__mapping_empty_slot(t, entries[i].hash)] = j;
+        j++;
+    }
+
+    t->used = j;
+}
+
+/* Test for exact string instances. */
+
+static inline int __mapping_is_str(__attr attr)
+{
+    return !__INTEGER(attr) && __is_instance(__VALUE(attr)) &&
+           (__get_class(__VALUE(attr)) == &__builtins___str_str);
+}
+
+/* Test keys for equality, employing the given 'eq' function only where keys
+   cannot be compared directly. */
+
+static int __mapping_equal(__attr key, __attr found, __attr eq)
+{
+    __int size;
+
+    /* Identical keys, including identical integers, are equal. */
+
+    if (key.value == found.value)
+        return 1;
+
+    /* Different integers are not equal. */
+
+    if (__INTEGER(key) && __INTEGER(found))
+        return 0;
+
+    /* Strings are compared using their data. */
+
+    if (__mapping_is_str(key) && __mapping_is_str(found))
+    {
+        size = __load_via_object(__VALUE(key), __size__).sizevalue;
+
+        return (size == __load_via_object(__VALUE(found), __size__).sizevalue) &&
+               !memcmp(__load_via_object(__VALUE(key), __data__).strvalue,
+                       __load_via_object(__VALUE(found), __data__).strvalue, size);
+    }
+
+    /* Other keys are compared using the equality function. */
+
+    return __BOOL(__invoke(eq, 1, 0, 0, 0, 3, __ARGS(__NULL, key, found)));
+}
+
+/* Return the entry position for a key, __INDEX_EMPTY if the key is not
+   present, or __INDEX_CHANGED if the mapping was changed during the search. */
+
+static int32_t __mapping_search(__mapping *t, __attr key, __int hash, __attr eq)
+{
+    __entry *entries = t->entries;
+    size_t perturb = (size_t) hash;
+    size_t i = perturb & t->mask;
+    int32_t index;
+    __attr found;
+    int equal;
+
+    while ((index = t->indexes[i]) != __INDEX_EMPTY)
+    {
+        if ((index != __INDEX_REMOVED) && (entries[index].hash == hash))
+        {
+            found = entries[index].key;
+            equal = __mapping_equal(key, found, eq);
+
+            /* Detect changes to the mapping made by the equality function. */
+
+            if ((t->entries != entries) || (entries[index].key.value != found.value))
+                return __INDEX_CHANGED;
+
+            if (equal)
+                return index;
+        }
+
+        i = __mapping_probe(t, i, &perturb);
+    }
+
+    return __INDEX_EMPTY;
+}
+
+static int32_t __mapping_find(__mapping *t, __attr key, __int hash, __attr eq)
+{
+    int32_t index;
+
+    do
+        index = __mapping_search(t, key, hash, eq);
+    while (index == __INDEX_CHANGED);
+
+    return index;
+}
+
+/* Mapping operations. */
+
+__attr __fn_native_mapping_mapping_init(__attr __self, __attr size)
+{
+    /* size interpreted as int */
+    __mapping *t = (__mapping *) __ALLOCATE(1, sizeof(__mapping));
+
+    __mapping_allocate(t, __TOINT(size));
+
+    /* Return the __data__ attribute. */
+    return (__attr) {.datavalue=t};
+}
+
+__attr __fn_native_mapping_mapping_len(__attr __self, __attr _data)
+{
+    /* _data interpreted as mapping */
+    return __new_int(__TOMAPPING(_data)->size);
+}
+
+__attr __fn_native_mapping_mapping_contains(__attr __self, __attr _data, __attr key, __attr hash, __attr eq)
+{
+    /* _data interpreted as mapping, hash interpreted as int */
+    __mapping *t = __TOMAPPING(_data);
+
+    return __mapping_find(t, key, __TOINT(hash), eq) != __INDEX_EMPTY ?
+           __builtins___boolean_True : __builtins___boolean_False;
+}
+
+__attr __fn_native_mapping_mapping_get(__attr __self, __attr _data, __attr key, __attr hash, __attr eq, __attr _default)
+{
+    /* _data interpreted as mapping, hash interpreted as int */
+    __mapping *t = __TOMAPPING(_data);
+    int32_t index = __mapping_find(t, key, __TOINT(hash), eq);
+
+    return index != __INDEX_EMPTY ? t->entries[index].value : _default;
+}
+
+__attr __fn_native_mapping_mapping_set(__attr __self, __attr _data, __attr key, __attr hash, __attr value, __attr eq)
+{
+    /* _data interpreted as mapping, hash interpreted as int */
+    __mapping *t = __TOMAPPING(_data);
+    __int h = __TOINT(hash);
+    int32_t index = __mapping_find(t, key, h, eq);
+
+    /* Replace the value of any existing entry. */
+
+    if (index != __INDEX_EMPTY)
+    {
+        t->entries[index].value = value;
+        return __builtins___none_None;
+    }
+
+    /* Make space for a new entry, also discarding removed entries and index
+       table positions, keeping the index table no more than two-thirds
+       occupied by present and removed items. */
+
+    if ((t->used >= t->capacity) || (t->size + t->removed >= t->capacity))
+        __mapping_resize(t, t->size * 2 + 1);
+
+    /* Add the entry, referencing it from the index table. */
+
+    index = t->used;
+    t->entries[index] = (__entry) {.hash=h, .key=key, .value=value};
+    t->indexes[__mapping_empty_slot(t, h)] = index;
+    t->used++;
+    t->size++;
+    return __builtins___none_None;
+}
+
+__attr __fn_native_mapping_mapping_remove(__attr __self, __attr _data, __attr key, __attr hash, __attr eq)
+{
+    /* _data interpreted as mapping, hash interpreted as int */
+    __mapping *t = __TOMAPPING(_data);
+    __int h = __TOINT(hash);
+    int32_t index = __mapping_find(t, key, h, eq);
+
+    if (index == __INDEX_EMPTY)
+        return __builtins___boolean_False;
+
+    /* Mark the index table position and entry as removed. */
+
+    t->indexes[__mapping_entry_slot(t, h, index)] = __INDEX_REMOVED;
+    __SETNULL(t->entries[index].key);
+    __SETNULL(t->entries[index].value);
+    t->removed++;
+    t->size--;
+    return __builtins___boolean_True;
+}
+
+__attr __fn_native_mapping_mapping_pop(__attr __self, __attr _data)
+{
+    /* _data interpreted as mapping */
+    __mapping *t = __TOMAPPING(_data);
+    __int index = t->used - 1;
+    __attr key;
+
+    /* Find the most recently added entry, requiring a non-empty mapping. */
+
+    while (__ISNULL(t->entries[index].key))
+        index--;
+
+    key = t->entries[index].key;
+
+    /* Mark the index table position and entry as removed, counting the
+       removed position so that it is eventually discarded when the mapping is
+       resized. */
+
+    t->indexes[__mapping_entry_slot(t, t->entries[index].hash, index)] = __INDEX_REMOVED;
+    __SETNULL(t->entries[index].key);
+    __SETNULL(t->entries[index].value);
+    t->removed++;
+    t->size--;
+
+    /* Discard this and any preceding removed entries from the end of the
+       entry table so that subsequent searches need not visit them again. */
+
+    while (index && __ISNULL(t->entries[index - 1].key))
+        index--;
+
+    t->used = index;
+    return key;
+}
+
+__attr __fn_native_mapping_mapping_next(__attr __self, __attr _data, __attr index)
+{
+    /* _data interpreted as mapping, index interpreted as int */
+    __mapping *t = __TOMAPPING(_data);
+    __int i;
+
+    /* Return the position of the next entry present from the given position. */
+
+    for (i = __TOINT(index); i < t->used; i++)
+    {
+        if (!__ISNULL(t->entries[i].key))
+            return __new_int(i);
+    }
+
+    return __new_int(-1);
+}
+
+__attr __fn_native_mapping_mapping_key(__attr __self, __attr _data, __attr index)
+{
+    /* _data interpreted as mapping, index interpreted as int */
+    return __TOMAPPING(_data)->entries[__TOINT(index)].key;
+}
+
+/* Produce lists of keys, values or items in insertion order. */
+
+static __attr __mapping_list(__mapping *t, int keys, int values)
+{
+    __fragment *data = __new_fragment(t->size);
+    __entry *entry;
+    __int i, j;
+
+    for (i = 0, j = 0; i < t->used; i++)
+    {
+        entry = &t->entries[i];
+
+        if (__ISNULL(entry->key))
+            continue;
+
+        data->attrs[j++] = keys && values ?
+                           __newdata_tuple(2, __ARGS(entry->key, entry->value)) :
+                           keys ? entry->key : entry->value;
+    }
+
+    data->size = j;
+    return __new_list(data);
+}
+
+__attr __fn_native_mapping_mapping_keys(__attr __self, __attr _data)
+{
+    /* _data interpreted as mapping */
+    return __mapping_list(__TOMAPPING(_data), 1, 0);
+}
+
+__attr __fn_native_mapping_mapping_values(__attr __self, __attr _data)
+{
+    /* _data interpreted as mapping */
+    return __mapping_list(__TOMAPPING(_data), 0, 1);
+}
+
+__attr __fn_native_mapping_mapping_items(__attr __self, __attr _data)
+{
+    /* _data interpreted as mapping */
+    return __mapping_list(__TOMAPPING(_data), 1, 1);
+}
+
+/* Module initialisation. */
+
+void __main_native_mapping()
+{
+}
@@ -0,0 +1,43 @@
+/* Native functions for mapping operations.
+
+Copyright (C) 2016, 2017, 2021 Paul Boddie <paul@boddie.org.uk>
+
+This program is free software; you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation; either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+details.
+
+You should have received a copy of the GNU General Public License along with
+this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#ifndef __NATIVE_MAPPING_H__
+#define __NATIVE_MAPPING_H__
+
+#include "types.h"
+
+/* Mapping operations. */
+
+__attr __fn_native_mapping_mapping_init(__attr __self, __attr size);
+__attr __fn_native_mapping_mapping_len(__attr __self, __attr _data);
+__attr __fn_native_mapping_mapping_contains(__attr __self, __attr _data, __attr key, __attr hash, __attr eq);
+__attr __fn_native_mapping_mapping_get(__attr __self, __attr _data, __attr key, __attr hash, __attr eq, __attr _default);
+__attr __fn_native_mapping_mapping_set(__attr __self, __attr _data, __attr key, __attr hash, __attr value, __attr eq);
+__attr __fn_native_mapping_mapping_remove(__attr __self, __attr _data, __attr key, __attr hash, __attr eq);
+__attr __fn_native_mapping_mapping_pop(__attr __self, __attr _data);
+__attr __fn_native_mapping_mapping_next(__attr __self, __attr _data, __attr index);
+__attr __fn_native_mapping_mapping_key(__attr __self, __attr _data, __attr index);
+__attr __fn_native_mapping_mapping_keys(__attr __self, __attr _data);
+__attr __fn_native_mapping_mapping_values(__attr __self, __attr _data);
+__attr __fn_native_mapping_mapping_items(__attr __self, __attr _data);
+
+/* Module initialisation. */
+
+void __main_native_mapping();
+
+#endif /* __NATIVE_MAPPING_H__ */
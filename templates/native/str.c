@@ -16,7 +16,8 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 */
 
-#include <string.h> /* strcmp, memcpy */
+#include <stdio.h>  /* snprintf */
+#include <string.h> /* strchr, strcmp, strlen, memchr, memcmp, memcpy, memset */
 #include "native/common.h"
 #include "types.h"
 #include "exceptions.h"
@@ -26,6 +27,102 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 #include "progtypes.h"
 #include "main.h"
 
+/* String data access. */
+
+static inline char *__str_data(__attr self)
+{
+    return __load_via_object(__VALUE(self), __data__).strvalue;
+}
+
+static inline __int __str_size(__attr self)
+{
+    return __load_via_object(__VALUE(self), __size__).sizevalue;
+}
+
+static inline int __str_is_none(__attr attr)
+{
+    return __VALUE(attr) == __VALUE(__builtins___none_None);
+}
+
+/* Whitespace characters, consistent with the library's definition. */
+
+static inline int __str_isspace(char c)
+{
+    return (c == ' ') || (c == '\f') || (c == '\n') || (c == '\r') || (c == '\t');
+}
+
+/* Return the position of 't' having size 'm' in 's' having size 'n', or -1 if
+   't' does not occur in 's'. Candidate positions are found using the first
+   character of 't' before the remaining characters are compared. */
+
+static __int __str_search(const char *s, __int n, const char *t, __int m)
+{
+    const char *p = s, *last = s + n - m;
+
+    if (!m)
+        return 0;
+
+    while (p <= last)
+    {
+        p = (const char *) memchr(p, t[0], last - p + 1);
+
+        if (p == NULL)
+            return -1;
+        if (!memcmp(p + 1, t + 1, m - 1))
+            return p - s;
+        p++;
+    }
+
+    return -1;
+}
+
+/* Return the last position of 't' having size 'm' in 's' having size 'n', or
+   -1 if 't' does not occur in 's'. */
+
+static __int __str_rsearch(const char *s, __int n, const char *t, __int m)
+{
+    const char *p;
+
+    if (!m)
+        return n;
+
+    for (p = s + n - m; p >= s; p--)
+    {
+        if ((p[0] == t[0]) && !memcmp(p + 1, t + 1, m - 1))
+            return p - s;
+    }
+
+    return -1;
+}
+
+/* Return a new string for the characters in 's' from 'start' until (but
+   excluding) 'end'. */
+
+static __attr __str_range(const char *s, __int start, __int end)
+{
+    __int n = end - start;
+    char *r = (char *) __ALLOCATE(n + 1, sizeof(char));
+
+    memcpy(r, s + start, n);
+    return __new_str(r, n);
+}
+
+/* Reverse the elements of 'data', permitting lists populated from the end of a
+   string to present their elements in order. */
+
+static void __str_reverse(__fragment *data)
+{
+    __int i, j;
+    __attr tmp;
+
+    for (i = 0, j = data->size - 1; i < j; i++, j--)
+    {
+        tmp = data->attrs[i];
+        data->attrs[i] = data->attrs[j];
+        data->attrs[j] = tmp;
+    }
+}
+
 /* String operations. */
 
 __attr __fn_native_str_str_add(__attr __self, __attr _data, __attr other, __attr _size, __attr othersize)
@@ -85,6 +182,32 @@ __attr __fn_native_str_str_eq(__attr __self, __attr _data, __attr other)
     return strcmp(s, o) == 0 ? __builtins___boolean_True : __builtins___boolean_False;
 }
 
+__attr __fn_native_str_str_hash(__attr __self, __attr self)
+{
+    /* self interpreted as string */
+    __attr hashvalue = __load_via_object(__VALUE(self), __hashvalue__);
+    unsigned char *s;
+    __int i, size;
+    uint32_t h;
+
+    /* Return any previously computed hash value. */
+    if (__INTEGER(hashvalue))
+        return hashvalue;
+
+    s = (unsigned char *) __load_via_object(__VALUE(self), __data__).strvalue;
+    size = __load_via_object(__VALUE(self), __size__).sizevalue;
+
+    /* Compute an FNV-1a hash of the string data, limited to values that are
+       representable as integers on all platforms. This must match the value
+       computed by common.get_string_hash for literals. */
+    for (h = 2166136261U, i = 0; i < size; i++)
+        h = (h ^ s[i]) * 16777619U;
+
+    hashvalue = __new_int(h & 0x1fffffff);
+    __store_via_object(__VALUE(self), __hashvalue__, hashvalue);
+    return hashvalue;
+}
+
 __attr __fn_native_str_str_ord(__attr __self, __attr _data)
 {
     /* _data interpreted as string.__data__ */
@@ -111,7 +234,7 @@ __attr __fn_native_str_str_substr(__attr __self, __attr _data, __attr start, __a
 
     /* Calculate the size of the substring. */
     size_t resultsize = ((iend - istart - (istep > 0 ? 1 : -1)) / istep) + 1;
-    size_t to, from;
+    __int to, from;
 
     /* Reserve space for a new string. */
     sub = (char *) __ALLOCATE(resultsize + 1, sizeof(char));
@@ -127,6 +250,653 @@ __attr __fn_native_str_str_substr(__attr __self, __attr _data, __attr start, __a
     return __new_str(sub, resultsize);
 }
 
+/* Search and transformation operations. Start and end positions are provided
+   in normalised form, being limited to positions within the strings. */
+
+__attr __fn_native_str_str_find(__attr __self, __attr self, __attr sub, __attr start, __attr end)
+{
+    /* self, sub interpreted as string */
+    char *s = __str_data(self), *t = __str_data(sub);
+    __int m = __str_size(sub);
+    /* start, end interpreted as int */
+    __int i = __TOINT(start), j = __TOINT(end);
+    __int pos;
+
+    if (j - i < m)
+        return __new_int(-1);
+
+    pos = __str_search(s + i, j - i, t, m);
+    return __new_int(pos < 0 ? -1 : i + pos);
+}
+
+__attr __fn_native_str_str_rfind(__attr __self, __attr self, __attr sub, __attr start, __attr end)
+{
+    /* self, sub interpreted as string */
+    char *s = __str_data(self), *t = __str_data(sub);
+    __int m = __str_size(sub);
+    /* start, end interpreted as int */
+    __int i = __TOINT(start), j = __TOINT(end);
+    __int pos;
+
+    if (j - i < m)
+        return __new_int(-1);
+
+    pos = __str_rsearch(s + i, j - i, t, m);
+    return __new_int(pos < 0 ? -1 : i + pos);
+}
+
+__attr __fn_native_str_str_lower(__attr __self, __attr self)
+{
+    /* self interpreted as string */
+    char *s = __str_data(self);
+    __int i, n = __str_size(self);
+    char *r = (char *) __ALLOCATE(n + 1, sizeof(char));
+
+    /* NOTE: Only converting ASCII characters. */
+    for (i = 0; i < n; i++)
+        r[i] = (s[i] >= 'A') && (s[i] <= 'Z') ? s[i] - 'A' + 'a' : s[i];
+
+    return __new_str(r, n);
+}
+
+__attr __fn_native_str_str_upper(__attr __self, __attr self)
+{
+    /* self interpreted as string */
+    char *s = __str_data(self);
+    __int i, n = __str_size(self);
+    char *r = (char *) __ALLOCATE(n + 1, sizeof(char));
+
+    /* NOTE: Only converting ASCII characters. */
+    for (i = 0; i < n; i++)
+        r[i] = (s[i] >= 'a') && (s[i] <= 'z') ? s[i] - 'a' + 'A' : s[i];
+
+    return __new_str(r, n);
+}
+
+__attr __fn_native_str_str_replace(__attr __self, __attr self, __attr old, __attr new, __attr count)
+{
+    /* self, old, new interpreted as string */
+    char *s = __str_data(self), *o = __str_data(old), *t = __str_data(new);
+    __int n = __str_size(self), m = __str_size(old), k = __str_size(new);
+    /* count interpreted as int, being negative if unlimited */
+    __int limit = __TOINT(count);
+    __int found = 0, i, pos, size;
+    char *r, *p;
+
+    /* Count the occurrences to be replaced, with an empty string occurring
+       before each character and at the end of the string. */
+
+    if (!m)
+        found = (limit >= 0) && (limit < n + 1) ? limit : n + 1;
+    else
+    {
+        for (i = 0; (found != limit) && ((pos = __str_search(s + i, n - i, o, m)) >= 0); found++)
+            i += pos + m;
+    }
+
+    if (!found)
+        return self;
+
+    /* Write the new string in a single allocation. */
+
+    size = n + found * (k - m);
+    r = p = (char *) __ALLOCATE(size + 1, sizeof(char));
+
+    for (i = 0; found; found--)
+    {
+        pos = m ? __str_search(s + i, n - i, o, m) : (i < n ? 1 : 0);
+
+        if (!m)
+        {
+            memcpy(p, t, k);
+            p += k;
+        }
+
+        memcpy(p, s + i, pos);
+        p += pos;
+
+        if (m)
+        {
+            memcpy(p, t, k);
+            p += k;
+        }
+
+        i += pos + m;
+    }
+
+    memcpy(p, s + i, n - i);
+    return __new_str(r, size);
+}
+
+__attr __fn_native_str_str_split(__attr __self, __attr self, __attr sep, __attr maxsplit)
+{
+    /* self interpreted as string */
+    char *s = __str_data(self);
+    __int n = __str_size(self);
+    /* maxsplit interpreted as int, being negative if unlimited */
+    __int limit = __TOINT(maxsplit);
+    __fragment *data = __new_fragment(limit >= 0 && limit < 8 ? limit + 1 : 8);
+    __int i = 0, j, m, pos;
+    char *t;
+
+    /* Split at runs of whitespace, ignoring whitespace at the ends. */
+
+    if (__str_is_none(sep))
+    {
+        while (1)
+        {
+            while ((i < n) && __str_isspace(s[i]))
+                i++;
+
+            if (i == n)
+                break;
+
+            /* Retain the remaining characters when no more splits are
+               permitted. */
+
+            if (!limit)
+            {
+                data = __fragment_append(data, __str_range(s, i, n));
+                break;
+            }
+
+            for (j = i; (j < n) && !__str_isspace(s[j]); j++);
+
+            data = __fragment_append(data, __str_range(s, i, j));
+            limit--;
+            i = j;
+        }
+    }
+
+    /* Split at each occurrence of the separator. */
+
+    else
+    {
+        t = __str_data(sep);
+        m = __str_size(sep);
+
+        for (; limit && ((pos = __str_search(s + i, n - i, t, m)) >= 0); limit--)
+        {
+            data = __fragment_append(data, __str_range(s, i, i + pos));
+            i += pos + m;
+        }
+
+        data = __fragment_append(data, __str_range(s, i, n));
+    }
+
+    return __new_list(data);
+}
+
+__attr __fn_native_str_str_rsplit(__attr __self, __attr self, __attr sep, __attr maxsplit)
+{
+    /* self interpreted as string */
+    char *s = __str_data(self);
+    __int n = __str_size(self);
+    /* maxsplit interpreted as int, being negative if unlimited */
+    __int limit = __TOINT(maxsplit);
+    __fragment *data = __new_fragment(limit >= 0 && limit < 8 ? limit + 1 : 8);
+    __int i, j = n, m, pos;
+    char *t;
+
+    /* Split at runs of whitespace, ignoring whitespace at the ends. */
+
+    if (__str_is_none(sep))
+    {
+        while (1)
+        {
+            while ((j > 0) && __str_isspace(s[j - 1]))
+                j--;
+
+            if (!j)
+                break;
+
+            /* Retain the remaining characters when no more splits are
+               permitted. */
+
+            if (!limit)
+            {
+                data = __fragment_append(data, __str_range(s, 0, j));
+                break;
+            }
+
+            for (i = j; (i > 0) && !__str_isspace(s[i - 1]); i--);
+
+            data = __fragment_append(data, __str_range(s, i, j));
+            limit--;
+            j = i;
+        }
+    }
+
+    /* Split at each occurrence of the separator. */
+
+    else
+    {
+        t = __str_data(sep);
+        m = __str_size(sep);
+
+        for (; limit && ((pos = __str_rsearch(s, j, t, m)) >= 0); limit--)
+        {
+            data = __fragment_append(data, __str_range(s, pos + m, j));
+            j = pos;
+        }
+
+        data = __fragment_append(data, __str_range(s, 0, j));
+    }
+
+    /* Present the elements in order. */
+
+    __str_reverse(data);
+    return __new_list(data);
+}
+
+__attr __fn_native_str_str_splitlines(__attr __self, __attr self, __attr keepends)
+{
+    /* self interpreted as string */
+    char *s = __str_data(self);
+    __int n = __str_size(self);
+    /* keepends interpreted as boolean */
+    int keep = __BOOL(keepends);
+    __fragment *data = __new_fragment(8);
+    __int i = 0, j, eol;
+
+    while (i < n)
+    {
+        for (eol = i; (eol < n) && (s[eol] != '\n') && (s[eol] != '\r'); eol++);
+
+        /* Include any line ending, treating CR LF as a single line ending. */
+
+        j = eol;
+        if ((j < n) && (s[j] == '\r') && (j + 1 < n) && (s[j + 1] == '\n'))
+            j += 2;
+        else if (j < n)
+            j++;
+
+        data = __fragment_append(data, __str_range(s, i, keep ? j : eol));
+        i = j;
+    }
+
+    return __new_list(data);
+}
+
+__attr __fn_native_str_str_strip(__attr __self, __attr self, __attr chars, __attr ends)
+{
+    /* self interpreted as string */
+    char *s = __str_data(self);
+    __int n = __str_size(self);
+    /* ends interpreted as int: 1 for the start, 2 for the end, 3 for both */
+    __int e = __TOINT(ends);
+    __int i = 0, j = n, k, m;
+    char *t;
+    unsigned char strip[256];
+
+    /* Record the characters to be stripped, employing whitespace by default. */
+
+    if (__str_is_none(chars))
+    {
+        for (k = 0; k < 256; k++)
+            strip[k] = __str_isspace((char) k);
+    }
+    else
+    {
+        t = __str_data(chars);
+        m = __str_size(chars);
+
+        memset(strip, 0, sizeof(strip));
+        for (k = 0; k < m; k++)
+            strip[(unsigned char) t[k]] = 1;
+    }
+
+    if (e & 1)
+        while ((i < j) && strip[(unsigned char) s[i]])
+            i++;
+
+    if (e & 2)
+        while ((j > i) && strip[(unsigned char) s[j - 1]])
+            j--;
+
+    if ((i == 0) && (j == n))
+        return self;
+
+    return __str_range(s, i, j);
+}
+
+/* Formatting specifications. */
+
+#define __FORMAT_LEFT   1
+#define __FORMAT_PLUS   2
+#define __FORMAT_SPACE  4
+#define __FORMAT_ALT    8
+#define __FORMAT_ZERO   16
+
+typedef struct
+{
+    int flags;
+    int star_width, star_prec;
+    __int width, prec;
+    char conv;
+} __str_spec;
+
+/* Parse the specification following a '%' character in 's' having size 'n',
+   starting at the position referenced by 'pos' and updating it to refer to the
+   character following the specification. Return whether a specification was
+   successfully parsed into 'spec'. */
+
+static int __str_parse_spec(const char *s, __int n, __int *pos, __str_spec *spec)
+{
+    __int i = *pos;
+
+    spec->flags = 0;
+    spec->star_width = spec->star_prec = 0;
+    spec->width = 0;
+    spec->prec = -1;
+
+    for (; i < n; i++)
+    {
+        if (s[i] == '-') spec->flags |= __FORMAT_LEFT;
+        else if (s[i] == '+') spec->flags |= __FORMAT_PLUS;
+        else if (s[i] == ' ') spec->flags |= __FORMAT_SPACE;
+        else if (s[i] == '#') spec->flags |= __FORMAT_ALT;
+        else if (s[i] == '0') spec->flags |= __FORMAT_ZERO;
+        else break;
+    }
+
+    if ((i < n) && (s[i] == '*'))
+    {
+        spec->star_width = 1;
+        i++;
+    }
+    else
+        for (; (i < n) && (s[i] >= '0') && (s[i] <= '9'); i++)
+            spec->width = spec->width * 10 + s[i] - '0';
+
+    if ((i < n) && (s[i] == '.'))
+    {
+        spec->prec = 0;
+        i++;
+
+        if ((i < n) && (s[i] == '*'))
+        {
+            spec->star_prec = 1;
+            i++;
+        }
+        else
+            for (; (i < n) && (s[i] >= '0') && (s[i] <= '9'); i++)
+                spec->prec = spec->prec * 10 + s[i] - '0';
+    }
+
+    /* Ignore any length modifiers. */
+
+    for (; (i < n) && ((s[i] == 'h') || (s[i] == 'l') || (s[i] == 'L')); i++);
+
+    if ((i == n) || !s[i] || !strchr("%cdiouxXeEfFgGrs", s[i]))
+        return 0;
+
+    spec->conv = s[i];
+    *pos = i + 1;
+    return 1;
+}
+
+/* Emit 'k' characters from 't' or 'k' copies of 'c' at position 'len' in 'out'
+   if 'out' is not null, returning the updated position. */
+
+static inline __int __str_emit(char *out, __int len, const char *t, __int k)
+{
+    if (out && (k > 0))
+        memcpy(out + len, t, k);
+    return k > 0 ? len + k : len;
+}
+
+static inline __int __str_emit_fill(char *out, __int len, char c, __int k)
+{
+    if (out && (k > 0))
+        memset(out + len, c, k);
+    return k > 0 ? len + k : len;
+}
+
+/* Emit the string 't' of size 'k' according to 'spec'. */
+
+static __int __str_format_string(char *out, __int len, __str_spec *spec, const char *t, __int k)
+{
+    if ((spec->prec >= 0) && (spec->prec < k) && (spec->conv != 'c'))
+        k = spec->prec;
+
+    if (spec->flags & __FORMAT_LEFT)
+    {
+        len = __str_emit(out, len, t, k);
+        return __str_emit_fill(out, len, ' ', spec->width - k);
+    }
+
+    len = __str_emit_fill(out, len, ' ', spec->width - k);
+    return __str_emit(out, len, t, k);
+}
+
+/* Emit the 'k' digits in 't' according to 'spec', indicating a negative number
+   using 'neg'. */
+
+static __int __str_format_digits(char *out, __int len, __str_spec *spec, int neg, const char *t, __int k)
+{
+    const char *prefix = "";
+    char sign = neg ? '-' : spec->flags & __FORMAT_PLUS ? '+' :
+                spec->flags & __FORMAT_SPACE ? ' ' : 0;
+    __int zeros = spec->prec > k ? spec->prec - k : 0;
+    __int body, pad;
+
+    if (spec->flags & __FORMAT_ALT)
+    {
+        if ((spec->conv == 'o') && (t[0] != '0') && !zeros) prefix = "0";
+        else if (spec->conv == 'x') prefix = "0x";
+        else if (spec->conv == 'X') prefix = "0X";
+    }
+
+    body = (sign ? 1 : 0) + strlen(prefix) + zeros + k;
+    pad = spec->width > body ? spec->width - body : 0;
+
+    /* Pad with spaces before or after the number, or with zeros after any sign
+       and prefix. */
+
+    if (!(spec->flags & __FORMAT_LEFT) && !((spec->flags & __FORMAT_ZERO) && (spec->prec < 0)))
+        len = __str_emit_fill(out, len, ' ', pad);
+
+    if (sign)
+        len = __str_emit_fill(out, len, sign, 1);
+
+    len = __str_emit(out, len, prefix, strlen(prefix));
+
+    if (!(spec->flags & __FORMAT_LEFT) && (spec->flags & __FORMAT_ZERO) && (spec->prec < 0))
+        len = __str_emit_fill(out, len, '0', pad);
+
+    len = __str_emit_fill(out, len, '0', zeros);
+    len = __str_emit(out, len, t, k);
+
+    if (spec->flags & __FORMAT_LEFT)
+        len = __str_emit_fill(out, len, ' ', pad);
+
+    return len;
+}
+
+/* Emit the integer 'value' according to 'spec'. Values are either integers or
+   strings containing the decimal representation of long integers. */
+
+static __int __str_format_int(char *out, __int len, __str_spec *spec, __attr value)
+{
+    char digits[3 * sizeof(unsigned long long) + 1], *t, *end = digits + sizeof(digits);
+    const char *symbols = spec->conv == 'X' ? "0123456789ABCDEF" : "0123456789abcdef";
+    unsigned base = spec->conv == 'o' ? 8 : (spec->conv == 'x') || (spec->conv == 'X') ? 16 : 10;
+    unsigned long long m;
+    __int v, k;
+    int neg;
+
+    if (!__INTEGER(value))
+    {
+        t = __str_data(value);
+        k = __str_size(value);
+        neg = t[0] == '-';
+        return __str_format_digits(out, len, spec, neg, t + neg, k - neg);
+    }
+
+    v = __TOINT(value);
+    neg = v < 0;
+    m = neg ? -(unsigned long long) v : (unsigned long long) v;
+
+    t = end;
+    do
+    {
+        *--t = symbols[m % base];
+        m /= base;
+    }
+    while (m);
+
+    return __str_format_digits(out, len, spec, neg, t, end - t);
+}
+
+/* Emit the floating point 'value' according to 'spec', using a buffer of the
+   given 'size' for any output. */
+
+static __int __str_format_float(char *out, __int len, __int size, __str_spec *spec, __attr value)
+{
+    double d = __load_via_object(__VALUE(value), __data__).floatvalue;
+    char fmt[16], *f = fmt;
+
+    *f++ = '%';
+    if (spec->flags & __FORMAT_LEFT) *f++ = '-';
+    if (spec->flags & __FORMAT_PLUS) *f++ = '+';
+    if (spec->flags & __FORMAT_SPACE) *f++ = ' ';
+    if (spec->flags & __FORMAT_ALT) *f++ = '#';
+    if (spec->flags & __FORMAT_ZERO) *f++ = '0';
+    *f++ = '*';
+    *f++ = '.';
+    *f++ = '*';
+    *f++ = spec->conv;
+    *f = '\0';
+
+    return len + snprintf(out ? out + len : NULL, out ? size - len + 1 : 0, fmt,
+                          (int) spec->width, (int) spec->prec, d);
+}
+
+/* Format the string 's' having size 'n' using the 'values' prepared for each
+   conversion, writing to 'out' if not null, this having the given 'size', and
+   returning the size of the formatted string. */
+
+static __int __str_format(char *out, __int size, const char *s, __int n, __attr *values)
+{
+    __int i = 0, j, len = 0;
+    __str_spec spec;
+    __attr value;
+
+    while (i < n)
+    {
+        /* Copy literal text. */
+
+        for (j = i; (j < n) && (s[j] != '%'); j++);
+        len = __str_emit(out, len, s + i, j - i);
+
+        if (j == n)
+            break;
+
+        /* Format values, having validated the format already. */
+
+        i = j + 1;
+        __str_parse_spec(s, n, &i, &spec);
+
+        if (spec.conv == '%')
+        {
+            len = __str_emit_fill(out, len, '%', 1);
+            continue;
+        }
+
+        /* Obtain any width or precision from the values, with a negative width
+           indicating left justification and a negative precision being
+           ignored. */
+
+        if (spec.star_width)
+        {
+            spec.width = __TOINT(*values++);
+            if (spec.width < 0)
+            {
+                spec.flags |= __FORMAT_LEFT;
+                spec.width = -spec.width;
+            }
+        }
+
+        if (spec.star_prec)
+        {
+            spec.prec = __TOINT(*values++);
+            if (spec.prec < 0)
+                spec.prec = -1;
+        }
+
+        value = *values++;
+
+        switch (spec.conv)
+        {
+            case 'c': case 'r': case 's':
+            len = __str_format_string(out, len, &spec, __str_data(value), __str_size(value));
+            break;
+
+            case 'e': case 'E': case 'f': case 'F': case 'g': case 'G':
+            len = __str_format_float(out, len, size, &spec, value);
+            break;
+
+            default:
+            len = __str_format_int(out, len, &spec, value);
+            break;
+        }
+    }
+
+    return len;
+}
+
+__attr __fn_native_str_str_format_codes(__attr __self, __attr self)
+{
+    /* self interpreted as string */
+    char *s = __str_data(self);
+    __int n = __str_size(self);
+    /* Each specification occupies at least as many characters as its codes. */
+    char *r = (char *) __ALLOCATE(n + 1, sizeof(char));
+    __int i = 0, k = 0;
+    __str_spec spec;
+
+    while (i < n)
+    {
+        if (s[i++] != '%')
+            continue;
+
+        if (!__str_parse_spec(s, n, &i, &spec))
+            __raise_value_error(self);
+
+        if (spec.conv == '%')
+            continue;
+
+        if (spec.star_width)
+            r[k++] = '*';
+        if (spec.star_prec)
+            r[k++] = '*';
+
+        r[k++] = spec.conv;
+    }
+
+    return __new_str(r, k);
+}
+
+__attr __fn_native_str_str_format(__attr __self, __attr self, __attr _data)
+{
+    /* self interpreted as string */
+    char *s = __str_data(self);
+    __int n = __str_size(self);
+    /* _data interpreted as list.__data__ */
+    __attr *values = _data.seqvalue->attrs;
+    __int size;
+    char *r;
+
+    /* Determine the size of the formatted string before writing it. */
+
+    size = __str_format(NULL, 0, s, n, values);
+    r = (char *) __ALLOCATE(size + 1, sizeof(char));
+    __str_format(r, size, s, n, values);
+
+    return __new_str(r, size);
+}
+
 /* Module initialisation. */
 
 void __main_native_str()
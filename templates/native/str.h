@@ -26,10 +26,28 @@ __attr __fn_native_str_str_chr(__attr __self, __attr _data);
 __attr __fn_native_str_str_lt(__attr __self, __attr _data, __attr other);
 __attr __fn_native_str_str_gt(__attr __self, __attr _data, __attr other);
 __attr __fn_native_str_str_eq(__attr __self, __attr _data, __attr other);
+__attr __fn_native_str_str_hash(__attr __self, __attr self);
 __attr __fn_native_str_str_ord(__attr __self, __attr _data);
 __attr __fn_native_str_str_size(__attr __self);
 __attr __fn_native_str_str_substr(__attr __self, __attr _data, __attr start, __attr end, __attr step);
 
+/* Search and transformation operations. */
+
+__attr __fn_native_str_str_find(__attr __self, __attr self, __attr sub, __attr start, __attr end);
+__attr __fn_native_str_str_rfind(__attr __self, __attr self, __attr sub, __attr start, __attr end);
+__attr __fn_native_str_str_lower(__attr __self, __attr self);
+__attr __fn_native_str_str_upper(__attr __self, __attr self);
+__attr __fn_native_str_str_replace(__attr __self, __attr self, __attr old, __attr new, __attr count);
+__attr __fn_native_str_str_split(__attr __self, __attr self, __attr sep, __attr maxsplit);
+__attr __fn_native_str_str_rsplit(__attr __self, __attr self, __attr sep, __attr maxsplit);
+__attr __fn_native_str_str_splitlines(__attr __self, __attr self, __attr keepends);
+__attr __fn_native_str_str_strip(__attr __self, __attr self, __attr chars, __attr ends);
+
+/* Formatting operations. */
+
+__attr __fn_native_str_str_format_codes(__attr __self, __attr self);
+__attr __fn_native_str_str_format(__attr __self, __attr self, __attr _data);
+
 /* Module initialisation. */
 
 void __main_native_str();
@@ -0,0 +1,206 @@
+/* Native functions for threads and their synchronisation.
+
+Copyright (C) 2021 Paul Boddie <paul@boddie.org.uk>
+
+This program is free software; you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation; either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+details.
+
+You should have received a copy of the GNU General Public License along with
+this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <pthread.h> /* pthread_* */
+#include <errno.h>   /* EBUSY */
+#include "gc.h"      /* GC_pthread_create via GC_THREADS */
+#include "native/common.h"
+#include "types.h"
+#include "exceptions.h"
+#include "ops.h"
+#include "progconsts.h"
+#include "progops.h"
+#include "progtypes.h"
+#include "main.h"
+
+/* Thread details, referencing the callable run by the thread and any exception
+   raised by it. This structure is scanned by the garbage collector, keeping the
+   callable and exception alive. */
+
+typedef struct __threaddata
+{
+    __attr callable;
+    __attr exception;
+    pthread_t thread;
+    int raised;
+} __threaddata;
+
+/* Run a thread, catching any exception so that it may be raised when the
+   thread is joined. */
+
+static void *__thread_run(void *arg)
+{
+    __threaddata *t = (__threaddata *) arg;
+    __exc exc;
+
+    __Try
+    {
+        __invoke(t->callable, 0, 0, 0, 0, 1, __ARGS(__CONTEXT_AS_VALUE(t->callable)));
+    }
+    __Catch(exc)
+    {
+        if (exc.raising)
+        {
+            t->exception = exc.arg;
+            t->raised = 1;
+        }
+    }
+
+    return NULL;
+}
+
+/* Threads. */
+
+__attr __fn_native_thread_thread_start(__attr __self, __attr callable)
+{
+    __threaddata *t = (__threaddata *) __ALLOCATE(1, sizeof(__threaddata));
+    int result;
+
+    t->callable = callable;
+
+    /* Produce an exception if the thread could not be started. */
+    result = pthread_create(&t->thread, NULL, __thread_run, t);
+
+    if (result)
+        __raise_os_error(__new_int(result), __builtins___none_None);
+
+    /* Return the __data__ attribute. */
+    return (__attr) {.datavalue=t};
+}
+
+__attr __fn_native_thread_thread_join(__attr __self, __attr thread)
+{
+    /* thread interpreted as thread details */
+    __threaddata *t = (__threaddata *) thread.datavalue;
+    int result = pthread_join(t->thread, NULL);
+
+    /* Produce an exception if the thread could not be joined. */
+    if (result)
+        __raise_os_error(__new_int(result), __builtins___none_None);
+
+    /* Propagate any exception raised by the thread. */
+    if (t->raised)
+    {
+        t->raised = 0;
+        __Raise(t->exception);
+    }
+
+    return __builtins___none_None;
+}
+
+/* Locks. Since locks do not reference objects, they need not be scanned by the
+   garbage collector. Checking locks are employed so that releasing a lock not
+   held by the current thread produces an error instead of undefined
+   behaviour. */
+
+__attr __fn_native_thread_lock_init(__attr __self)
+{
+    pthread_mutex_t *m = (pthread_mutex_t *) __ALLOCATEIM(1, sizeof(pthread_mutex_t));
+    pthread_mutexattr_t attr;
+
+    pthread_mutexattr_init(&attr);
+    pthread_mutexattr_settype(&attr, PTHREAD_MUTEX_ERRORCHECK);
+    pthread_mutex_init(m, &attr);
+    pthread_mutexattr_destroy(&attr);
+
+    /* Return the __data__ attribute. */
+    return (__attr) {.datavalue=m};
+}
+
+__attr __fn_native_thread_lock_acquire(__attr __self, __attr lock, __attr blocking)
+{
+    /* lock interpreted as mutex */
+    pthread_mutex_t *m = (pthread_mutex_t *) lock.datavalue;
+    int result;
+
+    /* blocking interpreted as boolean */
+    if (__BOOL(blocking))
+        result = pthread_mutex_lock(m);
+    else
+        result = pthread_mutex_trylock(m);
+
+    /* Return whether the lock was acquired. */
+    if (!result)
+        return __builtins___boolean_True;
+    else if (result == EBUSY)
+        return __builtins___boolean_False;
+
+    /* Produce an exception for other failures, such as deadlock. */
+    __raise_os_error(__new_int(result), __builtins___none_None);
+    return __builtins___none_None;
+}
+
+__attr __fn_native_thread_lock_release(__attr __self, __attr lock)
+{
+    /* lock interpreted as mutex */
+    pthread_mutex_t *m = (pthread_mutex_t *) lock.datavalue;
+    int result = pthread_mutex_unlock(m);
+
+    /* Produce an exception if the lock was not held. */
+    if (result)
+        __raise_os_error(__new_int(result), __builtins___none_None);
+
+    return __builtins___none_None;
+}
+
+/* Condition variables. */
+
+__attr __fn_native_thread_cond_init(__attr __self)
+{
+    pthread_cond_t *c = (pthread_cond_t *) __ALLOCATEIM(1, sizeof(pthread_cond_t));
+
+    pthread_cond_init(c, NULL);
+
+    /* Return the __data__ attribute. */
+    return (__attr) {.datavalue=c};
+}
+
+__attr __fn_native_thread_cond_wait(__attr __self, __attr cond, __attr lock)
+{
+    /* cond interpreted as condition variable */
+    pthread_cond_t *c = (pthread_cond_t *) cond.datavalue;
+    /* lock interpreted as mutex */
+    pthread_mutex_t *m = (pthread_mutex_t *) lock.datavalue;
+    int result = pthread_cond_wait(c, m);
+
+    /* Produce an exception if the lock was not held. */
+    if (result)
+        __raise_os_error(__new_int(result), __builtins___none_None);
+
+    return __builtins___none_None;
+}
+
+__attr __fn_native_thread_cond_notify(__attr __self, __attr cond)
+{
+    /* cond interpreted as condition variable */
+    pthread_cond_signal((pthread_cond_t *) cond.datavalue);
+    return __builtins___none_None;
+}
+
+__attr __fn_native_thread_cond_notify_all(__attr __self, __attr cond)
+{
+    /* cond interpreted as condition variable */
+    pthread_cond_broadcast((pthread_cond_t *) cond.datavalue);
+    return __builtins___none_None;
+}
+
+/* Module initialisation. */
+
+void __main_native_thread()
+{
+}
@@ -0,0 +1,46 @@
+/* Native functions for threads and their synchronisation.
+
+Copyright (C) 2021 Paul Boddie <paul@boddie.org.uk>
+
+This program is free software; you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation; either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+details.
+
+You should have received a copy of the GNU General Public License along with
+this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#ifndef __NATIVE_THREAD_H__
+#define __NATIVE_THREAD_H__
+
+#include "types.h"
+
+/* Threads. */
+
+__attr __fn_native_thread_thread_start(__attr __self, __attr callable);
+__attr __fn_native_thread_thread_join(__attr __self, __attr thread);
+
+/* Locks. */
+
+__attr __fn_native_thread_lock_init(__attr __self);
+__attr __fn_native_thread_lock_acquire(__attr __self, __attr lock, __attr blocking);
+__attr __fn_native_thread_lock_release(__attr __self, __attr lock);
+
+/* Condition variables. */
+
+__attr __fn_native_thread_cond_init(__attr __self);
+__attr __fn_native_thread_cond_wait(__attr __self, __attr cond, __attr lock);
+__attr __fn_native_thread_cond_notify(__attr __self, __attr cond);
+__attr __fn_native_thread_cond_notify_all(__attr __self, __attr cond);
+
+/* Module initialisation. */
+
+void __main_native_thread();
+
+#endif /* __NATIVE_THREAD_H__ */
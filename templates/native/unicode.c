@@ -16,6 +16,7 @@ You should have received a copy of the GNU General Public License along with
 this program.  If not, see <http://www.gnu.org/licenses/>.
 */
 
+#include <string.h> /* memcpy */
 #include "native/common.h"
 #include "types.h"
 #include "exceptions.h"
@@ -67,6 +68,45 @@ static __int prevpos(char *s, __int bytestart)
     return i;
 }
 
+/* Character offset indexes record the byte position of every character whose
+   index is a multiple of the stride, also recording the end of the string where
+   it falls on such an index. */
+
+#define __UNICODE_STRIDE 64
+
+static __int findpos(char *s, __int size, __int *offsets, __int index)
+{
+    /* Start from the recorded position at or before the character. */
+
+    __int i = offsets[index / __UNICODE_STRIDE];
+    __int c = index % __UNICODE_STRIDE;
+
+    while (c--)
+        i = nextpos(s, size, i);
+
+    return i;
+}
+
+static __int steppos(char *s, __int size, __int *offsets, __int bytestart,
+                     __int index, __int step)
+{
+    __int c;
+
+    /* Use the index for large steps, walking the string for small ones. */
+
+    if ((step >= __UNICODE_STRIDE) || (step <= -__UNICODE_STRIDE))
+        return findpos(s, size, offsets, index + step);
+
+    else if (step > 0)
+        for (c = 0; c < step; c++)
+            bytestart = nextpos(s, size, bytestart);
+    else
+        for (c = 0; c > step; c--)
+            bytestart = prevpos(s, bytestart);
+
+    return bytestart;
+}
+
 /* Unicode operations. */
 
 __attr __fn_native_unicode_unicode_len(__attr __self, __attr _data, __attr _size)
@@ -119,7 +159,34 @@ __attr __fn_native_unicode_unicode_ord(__attr __self, __attr _data, __attr _size
     return __new_int(c);
 }
 
-__attr __fn_native_unicode_unicode_substr(__attr __self, __attr _data, __attr _size, __attr start, __attr end, __attr step)
+__attr __fn_native_unicode_unicode_offsets(__attr __self, __attr _data, __attr _size)
+{
+    /* _data interpreted as string.__data__ */
+    char *s = _data.strvalue;
+    /* _size interpreted as size */
+    __int size = _size.sizevalue;
+    __int i, c = 0;
+
+    /* Reserve enough entries for a string of single-byte characters plus the
+       end of the string. */
+
+    __int *offsets = (__int *) __ALLOCATEIM(size / __UNICODE_STRIDE + 2, sizeof(__int));
+
+    for (i = 0; i < size; i++)
+        if (boundary(s[i]))
+        {
+            if (!(c % __UNICODE_STRIDE))
+                offsets[c / __UNICODE_STRIDE] = i;
+            c++;
+        }
+
+    if (!(c % __UNICODE_STRIDE))
+        offsets[c / __UNICODE_STRIDE] = size;
+
+    return (__attr) {.datavalue=offsets};
+}
+
+__attr __fn_native_unicode_unicode_substr(__attr __self, __attr _data, __attr _size, __attr start, __attr end, __attr step, __attr _offsets)
 {
     /* _data interpreted as string.__data__ */
     char *s = _data.strvalue, *sub;
@@ -131,63 +198,52 @@ __attr __fn_native_unicode_unicode_substr(__attr __self, __attr _data, __attr _s
     __int iend = __TOINT(end);
     /* step interpreted as int */
     __int istep = __TOINT(step);
+    /* _offsets interpreted as offset index */
+    __int *offsets = (__int *) _offsets.datavalue;
 
     /* Calculate the number of characters. */
     __int nchar = ((iend - istart - (istep > 0 ? 1 : -1)) / istep) + 1;
-    __int indexes[nchar];
 
-    __int c, d, i, to, from, lastbyte = 0;
+    __int c, i, to, from, first;
     __int resultsize = 0;
 
-    /* Find the indexes of the characters. */
-    if (istep > 0)
-    {
-        /* Get the first byte position. */
-        for (c = 0; c < istart; c++)
-            lastbyte = nextpos(s, ss, lastbyte);
-
-        /* Get each subsequent byte position. */
-        for (c = istart, i = 0; i < nchar; c += istep, i++)
-        {
-            indexes[i] = lastbyte;
-
-            /* Add the character size to the result size. */
-            resultsize += nextpos(s, ss, lastbyte) - lastbyte;
+    /* Find the first character using the offset index. */
+    first = findpos(s, ss, offsets, istart);
 
-            for (d = c; d < c + istep; d++)
-                lastbyte = nextpos(s, ss, lastbyte);
-        }
-    }
-    else
+    /* Contiguous characters are copied directly. */
+    if (istep == 1)
     {
-        /* Get the first byte position. */
-        for (c = 0; c < istart; c++)
-            lastbyte = nextpos(s, ss, lastbyte);
-
-        /* Get each subsequent byte position. */
-        for (c = istart, i = 0; i < nchar; c += istep, i++)
-        {
-            indexes[i] = lastbyte;
+        resultsize = findpos(s, ss, offsets, iend) - first;
+        sub = (char *) __ALLOCATE(resultsize + 1, sizeof(char));
+        memcpy(sub, s + first, resultsize);
+        return __new_str(sub, resultsize);
+    }
 
-            /* Add the character size to the result size. */
-            resultsize += nextpos(s, ss, lastbyte) - lastbyte;
+    /* Add the size of each character to the result size. */
+    for (c = istart, i = 0, from = first; i < nchar; c += istep, i++)
+    {
+        resultsize += nextpos(s, ss, from) - from;
 
-            for (d = c; d > c + istep; d--)
-                lastbyte = prevpos(s, lastbyte);
-        }
+        /* Avoid stepping beyond the final character. */
+        if (i + 1 < nchar)
+            from = steppos(s, ss, offsets, from, c, istep);
     }
 
     /* Reserve space for a new string. */
     sub = (char *) __ALLOCATE(resultsize + 1, sizeof(char));
 
     /* Does not null terminate but final byte should be zero. */
-    for (i = 0, to = 0; i < nchar; i++)
+    for (c = istart, i = 0, to = 0, from = first; i < nchar; c += istep, i++)
     {
-        from = indexes[i];
+        __int pos = from;
+
         do
         {
-            sub[to++] = s[from++];
-        } while (!boundary(s[from]));
+            sub[to++] = s[pos++];
+        } while (!boundary(s[pos]));
+
+        if (i + 1 < nchar)
+            from = steppos(s, ss, offsets, from, c, istep);
     }
 
     return __new_str(sub, resultsize);
@@ -23,7 +23,8 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 
 __attr __fn_native_unicode_unicode_len(__attr __self, __attr _data, __attr _size);
 __attr __fn_native_unicode_unicode_ord(__attr __self, __attr _data, __attr _size);
-__attr __fn_native_unicode_unicode_substr(__attr __self, __attr _data, __attr _size, __attr start, __attr end, __attr step);
+__attr __fn_native_unicode_unicode_offsets(__attr __self, __attr _data, __attr _size);
+__attr __fn_native_unicode_unicode_substr(__attr __self, __attr _data, __attr _size, __attr start, __attr end, __attr step, __attr _offsets);
 __attr __fn_native_unicode_unicode_unichr(__attr __self, __attr value);
 
 /* Module initialisation. */
@@ -20,11 +20,35 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 #define __OPS_H__
 
 #include "types.h"
+#include "progconsts.h" /* for attribute codes and positions */
+#include "progops.h" /* for raising errors and unbound methods */
+#include "progtypes.h" /* for __common_integer_obj */
 #include <string.h> /* for __COPY */
 
+/* Trivial operations are defined here so that they may be inlined wherever
+   they are used, making access to attributes at known positions a matter of
+   direct member access. */
+
 /* Get object reference from attribute. */
 
-__ref __VALUE(__attr attr);
+static inline __ref __VALUE(__attr attr)
+{
+    if (!__INTEGER(attr))
+        return attr.value;
+    else
+        return &__common_integer_obj;
+}
+
+/* Test for null attributes. */
+
+#define __ISNULL(__ATTR) (!__ATTR.value)
+
+/* Basic structure tests. */
+
+static inline int __HASATTR(__ref obj, int pos, int code)
+{
+    return __TABLE_HAS(obj->table, pos, code);
+}
 
 /* Direct access and manipulation of static objects. */
 
@@ -34,9 +58,33 @@ __attr __load_static_test(__attr context, __ref obj);
 
 /* Direct retrieval operations, returning attributes. */
 
-__attr __load_via_class__(__ref obj, int pos);
-__attr __load_via_object__(__ref obj, int pos);
-__attr __get_class_and_load__(__ref obj, int pos);
+static inline __attr __load_via_object__(__ref obj, int pos)
+{
+    return obj->attrs[pos];
+}
+
+static inline int __is_instance(__ref obj)
+{
+    return obj->pos == __INSTANCEPOS;
+}
+
+static inline __ref __get_class(__ref obj)
+{
+    return __VALUE(__load_via_object__(obj, __ATTRPOS(__class__)));
+}
+
+static inline __attr __load_via_class__(__ref obj, int pos)
+{
+    return __load_via_object__(__get_class(obj), pos);
+}
+
+static inline __attr __get_class_and_load__(__ref obj, int pos)
+{
+    if (__is_instance(obj))
+        return __load_via_class__(obj, pos);
+    else
+        return __load_via_object__(obj, pos);
+}
 
 #define __load_via_class(OBJ, ATTRNAME) (__load_via_class__(OBJ, __ATTRPOS(ATTRNAME)))
 #define __load_via_object(OBJ, ATTRNAME) (__load_via_object__(OBJ, __ATTRPOS(ATTRNAME)))
@@ -44,32 +92,88 @@ __attr __get_class_and_load__(__ref obj, int pos);
 
 /* Direct storage operations. */
 
-int __store_via_class__(__ref obj, int pos, __attr value);
-int __store_via_object__(__ref obj, int pos, __attr value);
+static inline int __store_via_object__(__ref obj, int pos, __attr value)
+{
+    obj->attrs[pos] = value;
+    return 1;
+}
+
+static inline int __store_via_class__(__ref obj, int pos, __attr value)
+{
+    return __store_via_object__(__get_class(obj), pos, value);
+}
+
 int __get_class_and_store__(__ref obj, int pos, __attr value);
 
 #define __store_via_class(OBJ, ATTRNAME, VALUE) (__store_via_class__(OBJ, __ATTRPOS(ATTRNAME), VALUE))
 #define __store_via_object(OBJ, ATTRNAME, VALUE) (__store_via_object__(OBJ, __ATTRPOS(ATTRNAME), VALUE))
 #define __get_class_and_store(OBJ, ATTRNAME, VALUE) (__get_class_and_store__(OBJ, __ATTRPOS(ATTRNAME), VALUE))
 
+/* Attribute codes and positions for type objects. */
+
+static inline unsigned int __TYPECODE(__ref obj)
+{
+    return __TABLE_CODE(obj->table, obj->pos);
+}
+
+static inline unsigned int __TYPEPOS(__ref obj)
+{
+    return obj->pos;
+}
+
 /* Introspection. */
 
-int __is_instance(__ref obj);
-int __is_subclass(__ref obj, __attr cls);
-int __is_instance_subclass(__ref obj, __attr cls);
-int __is_type_instance(__ref obj);
-__ref __get_class(__ref obj);
-__attr __get_class_attr(__ref obj);
+static inline int __is_subclass(__ref obj, __attr cls)
+{
+    return __HASATTR(obj, __TYPEPOS(__VALUE(cls)), __TYPECODE(__VALUE(cls)));
+}
+
+static inline int __is_instance_subclass(__ref obj, __attr cls)
+{
+    return __is_instance(obj) && __HASATTR(__get_class(obj), __TYPEPOS(__VALUE(cls)), __TYPECODE(__VALUE(cls)));
+}
+
+static inline int __is_type_instance(__ref obj)
+{
+    return __HASATTR(__get_class(obj), __TYPE_CLASS_POS, __TYPE_CLASS_CODE);
+}
+
+static inline __attr __get_class_attr(__ref obj)
+{
+    return __load_via_object__(obj, __ATTRPOS(__class__));
+}
 
 /* Attribute testing operations. */
 
-__ref __test_specific_instance(__ref obj, __ref type);
-__ref __test_specific_object(__ref obj, __ref type);
-__ref __test_specific_type(__ref obj, __ref type);
+static inline __ref __test_specific_instance(__ref obj, __ref type)
+{
+    return __get_class(obj) == type ? obj : 0;
+}
+
+static inline __ref __test_specific_type(__ref obj, __ref type)
+{
+    return obj == type ? obj : 0;
+}
 
-__ref __test_common_instance__(__ref obj, int pos, int code);
-__ref __test_common_object__(__ref obj, int pos, int code);
-__ref __test_common_type__(__ref obj, int pos, int code);
+static inline __ref __test_specific_object(__ref obj, __ref type)
+{
+    return __test_specific_type(obj, type) || __test_specific_instance(obj, type) ? obj : 0;
+}
+
+static inline __ref __test_common_instance__(__ref obj, int pos, int code)
+{
+    return __HASATTR(__get_class(obj), pos, code) ? obj : 0;
+}
+
+static inline __ref __test_common_type__(__ref obj, int pos, int code)
+{
+    return __HASATTR(obj, pos, code) ? obj : 0;
+}
+
+static inline __ref __test_common_object__(__ref obj, int pos, int code)
+{
+    return __test_common_type__(obj, pos, code) || __test_common_instance__(obj, pos, code) ? obj : 0;
+}
 
 #define __to_error(REF) (REF ? REF : (__raise_type_error(), (__ref) 0))
 
@@ -79,11 +183,35 @@ __ref __test_common_type__(__ref obj, int pos, int code);
 
 /* Attribute testing and retrieval operations. */
 
-__attr __check_and_load_via_object_null(__ref obj, int pos, int code);
-
-__attr __check_and_load_via_class__(__ref obj, int pos, int code);
-__attr __check_and_load_via_object__(__ref obj, int pos, int code);
-__attr __check_and_load_via_any__(__ref obj, int pos, int code);
+static inline __attr __check_and_load_via_object_null(__ref obj, int pos, int code)
+{
+    if (__HASATTR(obj, pos, code))
+        return __load_via_object__(obj, pos);
+    else
+        return __NULL;
+}
+
+static inline __attr __check_and_load_via_object__(__ref obj, int pos, int code)
+{
+    if (__HASATTR(obj, pos, code))
+        return __load_via_object__(obj, pos);
+
+    __raise_type_error();
+    return __NULL;
+}
+
+static inline __attr __check_and_load_via_class__(__ref obj, int pos, int code)
+{
+    return __check_and_load_via_object__(__get_class(obj), pos, code);
+}
+
+static inline __attr __check_and_load_via_any__(__ref obj, int pos, int code)
+{
+    __attr out = __check_and_load_via_object_null(obj, pos, code);
+    if (__ISNULL(out))
+        out = __check_and_load_via_class__(obj, pos, code);
+    return out;
+}
 
 #define __check_and_load_via_class(OBJ, ATTRNAME) (__check_and_load_via_class__(OBJ, __ATTRPOS(ATTRNAME), __ATTRCODE(ATTRNAME)))
 #define __check_and_load_via_object(OBJ, ATTRNAME) (__check_and_load_via_object__(OBJ, __ATTRPOS(ATTRNAME), __ATTRCODE(ATTRNAME)))
@@ -92,8 +220,31 @@ __attr __check_and_load_via_any__(__ref obj, int pos, int code);
 /* Attribute testing and storage operations. */
 
 int __check_and_store_via_class__(__ref obj, int pos, int code, __attr value);
-int __check_and_store_via_object__(__ref obj, int pos, int code, __attr value);
-int __check_and_store_via_any__(__ref obj, int pos, int code, __attr value);
+
+static inline int __check_and_store_via_object__(__ref obj, int pos, int code, __attr value)
+{
+    if (__HASATTR(obj, pos, code))
+    {
+        __store_via_object__(obj, pos, value);
+        return 1;
+    }
+
+    /* No suitable attribute. */
+
+    __raise_type_error();
+    return 0;
+}
+
+static inline int __check_and_store_via_any__(__ref obj, int pos, int code, __attr value)
+{
+    if (__check_and_store_via_object__(obj, pos, code, value))
+        return 1;
+
+    /* Forbid class-relative assignments. */
+
+    __raise_type_error();
+    return 0;
+}
 
 #define __check_and_store_via_class(OBJ, ATTRNAME, VALUE) (__check_and_store_via_class__(OBJ, __ATTRPOS(ATTRNAME), __ATTRCODE(ATTRNAME), VALUE))
 #define __check_and_store_via_object(OBJ, ATTRNAME, VALUE) (__check_and_store_via_object__(OBJ, __ATTRPOS(ATTRNAME), __ATTRCODE(ATTRNAME), VALUE))
@@ -114,15 +265,59 @@ __attr __test_context_static(int target, __attr context, __ref value, __attr con
 #define __set_accessor(__TARGET, __ATTR) (__tmp_values[__TARGET] = (__ATTR))
 #define __set_target_accessor(__ATTR) (__tmp_target_value = (__ATTR))
 
-/* Context testing for invocations. */
-
-__attr __unwrap_callable(__attr callable);
-__attr (*__get_function_unchecked(__attr target))();
-__attr (*__get_function(__attr context, __attr target))();
-__attr (*__get_function_unwrapped(__attr context, __attr target))();
-__attr (*__get_function_member(__attr target))();
-__attr (*__check_and_get_function(__attr context, __attr target))();
-__attr (*__check_and_get_function_unwrapped(__attr context, __attr target))();
+/* Context testing for invocations. These operations are performed for most
+   invocations and are therefore inlined, with the unusual case of type methods
+   being tested separately. */
+
+int __type_method_invocation(__attr context, __attr target);
+
+static inline __attr __unwrap_callable(__attr callable)
+{
+    __attr value = __check_and_load_via_object_null(__VALUE(callable), __ATTRPOS(__value__), __ATTRCODE(__value__));
+    return __VALUE(value) ? value : callable;
+}
+
+static inline __attr (*__get_function_member(__attr target))()
+{
+    return __load_via_object(__VALUE(target), __fn__).fn;
+}
+
+static inline __attr (*__get_function_unchecked(__attr target))()
+{
+    return __load_via_object(__VALUE(__unwrap_callable(target)), __fn__).fn;
+}
+
+static inline __attr (*__get_function_unwrapped(__attr context, __attr target))()
+{
+    /* Require null or instance contexts for functions and methods respectively,
+       or type instance contexts for type methods. */
+
+    if (__ISNULL(context) || __is_instance(__VALUE(context)) || __type_method_invocation(context, target))
+        return __get_function_member(target);
+    else
+        return __unbound_method;
+}
+
+static inline __attr (*__get_function(__attr context, __attr target))()
+{
+    return __get_function_unwrapped(context, __unwrap_callable(target));
+}
+
+static inline __attr (*__check_and_get_function_unwrapped(__attr context, __attr target))()
+{
+    /* Require null or instance contexts for functions and methods respectively,
+       or type instance contexts for type methods. */
+
+    if (__ISNULL(context) || __is_instance(__VALUE(context)) || __type_method_invocation(context, target))
+        return __check_and_load_via_object__(__VALUE(target), __ATTRPOS(__fn__), __ATTRCODE(__fn__)).fn;
+    else
+        return __unbound_method;
+}
+
+static inline __attr (*__check_and_get_function(__attr context, __attr target))()
+{
+    return __check_and_get_function_unwrapped(context, __unwrap_callable(target));
+}
 
 /* Parameter position operations. */
 
@@ -134,14 +329,10 @@ __attr __CONTEXT_AS_VALUE(__attr attr);
 
 /* Type testing. */
 
-__ref __ISFUNC(__ref obj);
-
-#define __ISNULL(__ATTR) (!__ATTR.value)
-
-/* Attribute codes and positions for type objects. */
-
-unsigned int __TYPECODE(__ref obj);
-unsigned int __TYPEPOS(__ref obj);
+static inline __ref __ISFUNC(__ref obj)
+{
+    return __test_specific_instance(obj, &__FUNCTION_TYPE);
+}
 
 /* Memory allocation. */
 
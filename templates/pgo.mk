@@ -0,0 +1,12 @@
+# Build an instrumented program with PGO=generate, recording profile data when
+# the program is run, and then build the program with PGO=use to employ the
+# recorded profile data.
+
+ifeq ($(PGO),generate)
+CFLAGS += -fprofile-generate
+LDFLAGS += -fprofile-generate
+endif
+
+ifeq ($(PGO),use)
+CFLAGS += -fprofile-use -fprofile-correction -Wno-missing-profile
+endif
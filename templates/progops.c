@@ -237,7 +237,21 @@ __attr __invoke(__attr callable, int always_callable,
         __raise_type_error();
     }
 
-    /* Copy the arguments. */
+    /* Copy the arguments, filling the remaining arguments using the defaults
+       directly where no keyword arguments are given. */
+
+    else if (!nkwargs)
+    {
+        allargs = moreargs;
+
+        for (pos = 0; pos < nargs; pos++)
+            allargs[pos] = args[pos];
+
+        for (pos = nargs; pos < max; pos++)
+            allargs[pos] = __GETDEFAULT(__VALUE(target), pos - min);
+    }
+
+    /* Copy the arguments and process keyword arguments. */
 
     else if (nargs < max)
     {
@@ -299,16 +313,6 @@ __attr __unbound_method(__attr __self)
 
 /* Generic operations depending on specific program details. */
 
-void __SETDEFAULT(__ref obj, int pos, __attr value)
-{
-    __store_via_object__(obj, __FUNCTION_INSTANCE_SIZE + pos, value);
-}
-
-__attr __GETDEFAULT(__ref obj, int pos)
-{
-    return __load_via_object__(obj, __FUNCTION_INSTANCE_SIZE + pos);
-}
-
 int __BOOL(__attr attr)
 {
     __ref value;
@@ -79,11 +79,12 @@ __attr __unbound_method(__attr __self);
 
 /* Generic operations depending on specific program details. */
 
-void __SETDEFAULT(__ref obj, int pos, __attr value);
+int __BOOL(__attr attr);
 
-__attr __GETDEFAULT(__ref obj, int pos);
+/* Access to defaults stored after the members of function instances. */
 
-int __BOOL(__attr attr);
+#define __SETDEFAULT(OBJ, POS, VALUE) __store_via_object__(OBJ, __FUNCTION_INSTANCE_SIZE + (POS), VALUE)
+#define __GETDEFAULT(OBJ, POS) __load_via_object__(OBJ, __FUNCTION_INSTANCE_SIZE + (POS))
 
 /* Convenience definitions. */
 
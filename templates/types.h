@@ -32,12 +32,27 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 
 #include "instancepos.h"
 
-typedef uint16_t __code;
-typedef uint16_t __pos;
-typedef uint16_t __pcode;
-typedef uint16_t __ppos;
+/* Include the code and position types, these having sizes chosen for each
+   program, together with any table representation details. */
 
-/* Attribute tables are lists of codes confirming the presence of attributes. */
+#include "codetypes.h"
+
+/* Attribute tables are lists of codes confirming the presence of attributes.
+
+   Compact tables are positions within a single list of codes shared by all
+   objects, with each table being displaced within the list so that its codes do
+   not coincide with those of other tables. Since each attribute code is only
+   ever found at a single position, a code found at a given position within a
+   compact table can only have been provided by that table. */
+
+#ifdef __COMPACT_TABLES
+
+typedef __code __table;
+
+#define __TABLE_CODE(TABLE, POS) ((TABLE)[POS])
+#define __TABLE_HAS(TABLE, POS, CODE) (__TABLE_CODE(TABLE, POS) == (CODE))
+
+#else
 
 typedef struct __table
 {
@@ -45,14 +60,19 @@ typedef struct __table
     const __code attrs[];
 } __table;
 
+#define __TABLE_CODE(TABLE, POS) ((TABLE)->attrs[POS])
+#define __TABLE_HAS(TABLE, POS, CODE) (((POS) < (TABLE)->size) && (__TABLE_CODE(TABLE, POS) == (CODE)))
+
+#endif /* __COMPACT_TABLES */
+
 /* Parameter tables are lists of codes confirming the presence of parameters, as
    well as the positions of those parameters in the list for a given function.
 */
 
 typedef struct __param
 {
-    __code code;
-    __pos pos;
+    __pcode code;
+    __ppos pos;
 } __param;
 
 typedef struct __ptable
@@ -88,11 +108,11 @@ typedef union __attr
 
     const __ptable * ptable;    /* parameter table */
     struct {
-        __pcode code;           /* parameter table code for key */
-        __ppos pos;             /* parameter table position for key */
+        uint32_t code;          /* attribute or parameter code for key */
+        uint32_t pos;           /* attribute or parameter position for key */
     };
     __attr (*fn)();             /* callable details */
-    float floatvalue;          	/* floating point value */
+    double floatvalue;          /* floating point value */
     char * strvalue;            /* string value */
     __fragment * seqvalue;      /* sequence data */
     void * datavalue;           /* object-specific data */
@@ -102,11 +122,11 @@ typedef union __attr
 typedef struct __obj
 {
     const __table * table;      /* attribute table */
-    __ppos pos;                 /* position of attribute indicating class */
+    __pos pos;                  /* position of attribute indicating class */
     __attr attrs[];             /* attributes */
 } __obj;
 
-#define __INSTANCE_SIZE(NUMBER) ((NUMBER) * sizeof(__attr) + sizeof(__table *) + sizeof(__ppos))
+#define __INSTANCE_SIZE(NUMBER) ((NUMBER) * sizeof(__attr) + sizeof(__table *) + sizeof(__pos))
 
 /* Fragments are simple collections of attributes employed by sequence types.
    They provide the basis of lists and tuples. */
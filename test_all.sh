@@ -24,7 +24,9 @@ shift 1
 MAKE_OPTIONS="$*"
 
 LPLC="./lplc"
+SHOWCACHE="./tools/showcache.py"
 DATADIR="_main.lplc"
+CACHETEXT="$DATADIR/cache.txt"
 TESTINPUT="_results/testinput.txt"
 
 # Expect failure from the "bad" tests.
@@ -170,13 +172,20 @@ for FILENAME in tests/* ; do
     # Check for unresolved names in the cache.
 
     echo " (depends)..." 1>&2
-    for CACHEFILE in "$DATADIR/_cache/"* ; do
-        STARTLINE=`grep -n '^deferred:' "$CACHEFILE" | cut -d: -f 1`
-        if tail -n +$(($STARTLINE + 2)) "$CACHEFILE" | grep -q '<depends>' ; then
-           echo "Unresolved names in the cache." 1>&2
-           exit 1
-        fi
-    done
+
+    # Show the cache contents, excluding the cache details file, in textual
+    # form for examination, looking beyond the deferred names of each module.
+
+    "$SHOWCACHE" "$DATADIR/_cache/"[!\$]* > "$CACHETEXT" || exit 1
+
+    if awk '/^imports:$/ { state = 0 }
+            state == 2 && /<depends>/ { found = 1 }
+            state == 1 { state = 2 }
+            /^deferred:$/ { state = 1 }
+            END { exit !found }' "$CACHETEXT" ; then
+        echo "Unresolved names in the cache." 1>&2
+        exit 1
+    fi
 
     # Check for type warnings in deduction output.
 
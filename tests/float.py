@@ -0,0 +1,51 @@
+x = 1.5
+y = 2.25
+print x, y              # 1.5 2.25
+print x + y, x - y      # 3.75 -0.75
+print x * y, x / y      # 3.375 0.666666666667
+print repr(x / y)       # 0.6666666666666666
+print y ** 2, 2 ** x    # 5.0625 2.82842712475
+print -y // x, -y % x   # -2.0 0.75
+
+# Test combining floats with integers.
+
+print x + 1, 1 + x      # 2.5 2.5
+print 3 - x, 3 * x      # 1.5 4.5
+print 3 / 2.0, 7 // 2.0 # 1.5 3.0
+print 7 // 2, -7 // 2   # 3 -4
+print x < 2, 2 < x      # True False
+print 3 == 3.0          # True
+
+# Test conversions.
+
+print float("3.25")     # 3.25
+print float(" -1e3 ")   # -1000.0
+print float(7)          # 7.0
+print int(3.99)         # 3
+print int(-3.99)        # -3
+
+try:
+    a = float("a")      # should raise an exception
+except ValueError, exc:
+    print 'float("a") failed:', exc.value
+
+# Test representations.
+
+print 1e16, 1e-7        # 1e+16 1e-07
+print 123456789012.0    # 1.23456789012e+11
+print repr(0.1)         # 0.1
+print repr(1e15)        # 1000000000000000.0
+
+# Test hashing.
+
+d = {1 : "one", 2.5 : "two and a half"}
+print d[1.0]            # one
+print d[2.5]            # two and a half
+
+try:
+    print x / 0         # should raise an exception
+except ZeroDivisionError:
+    print "x / 0: division by zero"
+
+a_is_float = isinstance(x, float)
+print a_is_float        # True
@@ -32,3 +32,20 @@ try:
 
 except StopIteration:
     print "stopped"     # stopped
+
+# Test loops using names that hide built-in functions.
+
+def counted():
+    for i in range(3):
+        print i         # 42
+
+def range(n):
+    return [42]
+
+counted()
+
+def enumerated(enumerate):
+    for i, x in enumerate([1, 2]):
+        print i, x      # a b
+
+enumerated(lambda l: [("a", "b")])
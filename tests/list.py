@@ -97,3 +97,78 @@ print e                 # [3, 1, 2]
 
 e.reverse()
 print e                 # [2, 1, 3]
+
+# Test sorting.
+
+f = [3, 1, 2, 1]
+f.sort()
+print f                 # [1, 1, 2, 3]
+f.sort(reverse=True)
+print f                 # [3, 2, 1, 1]
+
+g = ["pear", "fig", "apple", "kiwi"]
+print sorted(g)                 # ["apple", "fig", "kiwi", "pear"]
+print sorted(g, key=len)        # ["fig", "pear", "kiwi", "apple"]
+print sorted(g, lambda a, b: cmp(len(b), len(a))) # ["apple", "pear", "kiwi", "fig"]
+print sorted(g, lambda a, b: float(len(a) - len(b))) # ["fig", "pear", "kiwi", "apple"]
+
+def appending(a, b):
+    m.append(0)
+    return cmp(a, b)
+
+m = [3, 1, 2]
+try:
+    m.sort(appending)   # should raise an exception
+except ValueError, exc:
+    print "m.sort(appending): failed with", exc.value, m[:3] # m.sort(appending): failed with list modified during sort [3, 1, 2]
+
+# Test removal and replacement of items and slices.
+
+h = range(0, 10)
+print h.pop(0)          # 0
+print h.pop()           # 9
+print h.pop(-2)         # 7
+print h                 # [1, 2, 3, 4, 5, 6, 8]
+del h[1]
+print h                 # [1, 3, 4, 5, 6, 8]
+del h[-2:]
+print h                 # [1, 3, 4, 5]
+h[1:3] = ["a", "b", "c"]
+print h                 # [1, "a", "b", "c", 5]
+h[:1] = []
+print h                 # ["a", "b", "c", 5]
+h[2:] = h
+print h                 # ["a", "b", "a", "b", "c", 5]
+del h[:]
+print h                 # []
+
+try:
+    h.pop()             # should raise an exception
+except IndexError, exc:
+    print "h.pop(): failed to pop at index", exc.index
+
+# Test deleting stepped slices.
+
+k = range(0, 10)
+del k[::3]
+print k                 # [1, 2, 4, 5, 7, 8]
+del k[-1:0:-2]
+print k                 # [1, 4, 7]
+
+# Test assigning to stepped slices.
+
+k = range(0, 7)
+k[::2] = [10, 11, 12, 13]
+print k                 # [10, 1, 11, 3, 12, 5, 13]
+k[::-3] = ("a", "b", "c")
+print k                 # ["c", 1, 11, "b", 12, 5, "a"]
+
+try:
+    k[::2] = [1]        # should raise an exception
+except ValueError, exc:
+    print "k[::2] = [1]: value is not appropriate", exc.value
+
+# Test zipping sequences and iterators.
+
+print zip([[1, 2, 3], enumerate([4, 5]), (6, 7, 8)]) # [(1, (0, 4), 6), (2, (1, 5), 7)]
+print zip([])           # []
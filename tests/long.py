@@ -0,0 +1,89 @@
+import sys
+
+# Test the promotion of integers to long integers.
+
+i = sys.maxint
+print i + 1 > i                         # True
+print i + 1 - 1 == i                    # True
+print -i - 2 < -i - 1                   # True
+print -(-i - 1) == i + 1                # True
+print i * i                             # 5316911983139663487003542222693990401
+print i * i / i == i                    # True
+
+# Test literals and representations.
+
+x = 123456789012345678901234567890
+y = -98765432109876543210
+print x                                 # 123456789012345678901234567890
+print y                                 # -98765432109876543210
+print repr(x)                           # 123456789012345678901234567890L
+print 5L, repr(5L)                      # 5 5L
+
+# Test arithmetic.
+
+print x + y                             # 123456788913580246791358024680
+print x - y                             # 123456789111111111011111111100
+print x * y                             # -12193263113702179522496570642237463801111263526900
+print x / y, x % y                      # -1249999989 -38580246902623456800
+print -x / y, -x % y                    # 1249999988 -60185185207253086410
+print x / 7, x % 7                      # 17636684144620811271604938270 0
+print 2 ** 100                          # 1267650600228229401496703205376
+print 3 ** 80                           # 147808829414345923316083210206383297601
+print (2 ** 100) ** 2 == 2 ** 200       # True
+print 2 ** 200 / 2 ** 199               # 2
+
+# Test division of negative operands, with integers and long integers both
+# rounding towards negative infinity.
+
+print -7 / 2, -7 % 2, 7 / -2, 7 % -2    # -4 1 -4 -1
+print -7 // 2, -8 / 2, -8 % 2           # -4 -4 0
+print -7L / 2, -7L % 2, 7L / -2, 7L % -2 # -4 1 -4 -1
+
+# Test large multiplication and division.
+
+f = 1
+n = 1
+while n <= 300:
+    f *= n
+    n += 1
+
+print len(str(f))                       # 615
+print f % 1000000007                    # 419467694
+g = f
+n = 300
+while n > 1:
+    g /= n
+    n -= 1
+
+print g                                 # 1
+
+# Test bitwise operations and shifts.
+
+print 1 << 70                           # 1180591620717411303424
+print (1 << 70) >> 69                   # 2
+print -(1 << 70) >> 3                   # -147573952589676412928
+print -x >> 80                          # -102122
+print x & 0xffffffffffff                # 247314119592658
+print x | (1 << 100)                    # 1391107389240575080397937773266
+print x ^ y                             # -123456788954006837576592880700
+print ~x                                # -123456789012345678901234567891
+print -x & 0xffff                       # 62766
+
+# Test comparisons, hashing and conversions.
+
+print x > y, y < 0, x == x + 0          # True True True
+print hash(long(5)) == hash(5)          # True
+print long("123456789012345678901234567890") == x   # True
+print long("-ff", 16)                   # -255
+print int(2.0 ** 70)                    # 1180591620717411303424
+print float(2 ** 70)                    # 1.18059162072e+21
+print int(long(5)), long(5) == 5        # 5 True
+
+d = {x : "x", 5 : "5"}
+print d[123456789012345678901234567890] # x
+print d[long(5)]                        # 5
+
+try:
+    print long("12a")
+except ValueError:
+    print "long('12a'): invalid literal"
@@ -3,6 +3,7 @@
 l = range(0, 10)
 print l                                     # [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
 print len(l)                                # 10
+print range(3)                              # [0, 1, 2]
 
 # Test a descending xrange.
 
@@ -30,7 +31,7 @@ print y                                     # __builtins__.span.xrange(4, 8, 1)
 
 # Test enumerate and sum.
 
-print enumerate(y)                          # [(0, 4), (1, 5), (2, 6), (3, 7)]
+print list(enumerate(y))                    # [(0, 4), (1, 5), (2, 6), (3, 7)]
 print sum(y)                                # 22
 
 # Test map and filter using lambdas.
@@ -65,3 +66,27 @@ print reduce(lambda x, y: x+y, double)      # [7]
 beyond = xrange(4, 9, 2)
 print list(beyond)                          # [4, 6, 8]
 print len(beyond)                           # 3
+
+# Test counted loops over ranges and enumerations.
+
+total = 0
+for i in range(1000000):
+    total += i
+print total                                 # 499999500000
+
+for i, x in enumerate(range(5, 0, -2), 1):
+    print i, x                              # 1 5
+                                            # 2 3
+                                            # 3 1
+
+for i in xrange(3, 3):
+    print i
+else:
+    print "empty range completed"           # empty range completed
+
+for i, x in enumerate(["a", "b", "c", "d"]):
+    if x == "c":
+        break
+else:
+    print "not printed"
+print i, x                                  # 2 c
@@ -15,3 +15,24 @@ try:
     print s
 finally:
     f.close()
+
+# Read lines using iteration and as a list.
+
+f = open("tests/read_file.py")
+
+try:
+    n = 0
+    for line in f:
+        n += 1
+    print n                         # 38
+finally:
+    f.close()
+
+f = open("tests/read_file.py")
+
+try:
+    lines = f.readlines()
+    print len(lines)                # 38
+    print lines[-1]                 #     f.close()
+finally:
+    f.close()
@@ -68,3 +68,24 @@ print len(adb2)                     # 1
 asdb2 = a.copy()
 asdb2.symmetric_difference_update(b)
 print len(asdb2)                    # 2
+
+# Test repeated addition and removal of values.
+
+s = set()
+total = 0
+for i in range(0, 100):
+    s.add(i)
+    total += s.pop()
+print total, len(s)                 # 4950 0
+
+# Test draining a set, adding values after some removals.
+
+s = set(range(0, 1000))
+total = 0
+for i in range(0, 500):
+    total += s.pop()
+for i in range(1000, 1010):
+    s.add(i)
+while len(s):
+    total += s.pop()
+print total, len(s)                 # 509545 0
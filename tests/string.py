@@ -18,6 +18,7 @@ print s.rfind("o")          # 7
 print s.rfind("o", 7)       # 7
 print s.rfind("o", 8)       # -1
 print s.rfind("o", 0, 7)    # 4
+print s.find("", 12), s.find("", 13), s.rfind("", 13) # 12 -1 -1
 
 try:
     print s.index("p")      # should raise an exception
@@ -102,7 +103,20 @@ print s7.split("\n")        # ["Hello...", "  world,", "  planet,", "  globe."]
 
 print "RGB(%r, %r, %r)".split("%") # ["RGB(", "r, ", "r, ", "r)"]
 
-# NOTE: To test rsplit once list.insert is implemented.
+print s7.rsplit()           # ["Hello...", "world,", "planet,", "globe."]
+print s7.rsplit(maxsplit=2) # ["Hello...\n  world,", "planet,", "globe."]
+print s7.rsplit("\n", 1)    # ["Hello...\n  world,\n  planet,", "  globe."]
+print s7.splitlines()       # ["Hello...", "  world,", "  planet,", "  globe."]
+print "a\r\nb\n".splitlines(True) # ["a\r\n", "b\n"]
+
+# Test replacement and case conversion.
+
+print s.replace("o", "0")       # Hell0 w0rld!
+print s.replace("o", "", 1)     # Hell world!
+print s.replace("l", "LL")      # HeLLLLo worLLd!
+print s.replace("", "-", 3)     # -H-e-llo world!
+print s.lower(), s.upper()      # hello world! HELLO WORLD!
+print "orl" in s, "olr" in s    # True False
 
 # Test stripping of strings.
 
@@ -122,4 +136,22 @@ print repr('
 
 # Test formatting of strings.
 
-print "RGB(%r, %r, %r)" % (1, 2, 3)
+print "RGB(%r, %r, %r)" % (1, 2, 3)             # RGB(1, 2, 3)
+print "[%5d|%-5d|%05d|%+d|% d]" % (42, 42, -42, 42, 42) # [   42|42   |-0042|+42| 42]
+print "[%x|%X|%#x|%#o|%o|%x]" % (255, 255, 255, 8, 8, -255) # [ff|FF|0xff|010|10|-ff]
+print "[%.3f|%10.2f|%-8.1e|%g]" % (3.14159, 2.5, 12345.678, 0.0001) # [3.142|      2.50|1.2e+04 |0.0001]
+print "[%s|%10s|%-6s|%.2s|%*s|%-*d]" % ("abc", "right", "left", "xyz", 4, "ab", 3, 7) # [abc|     right|left  |xy|  ab|7  ]
+print "[%c%c|%%|%5.3d|%r]" % (72, "i", 7, "q")  # [Hi|%|  007|"q"]
+print "%d" % 12345678901234567890               # 12345678901234567890
+print "%d" % 1e20                               # 100000000000000000000
+print "%x|%#X|%o" % (2 ** 70, 2 ** 70, -2 ** 70)  # 400000000000000000|0X400000000000000000|-200000000000000000000000
+
+try:
+    print "%s %s" % ("one",)
+except TypeError:
+    print "Too few values for the format."      # Too few values for the format.
+
+try:
+    print "%y" % 1
+except ValueError:
+    print "Unsupported conversion."             # Unsupported conversion.
@@ -0,0 +1,109 @@
+from thread import condition, lock, thread
+
+# Test threads computing results independently.
+
+class Summer:
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+    def run(self):
+        total = 0
+        i = self.start
+        while i < self.end:
+            total += i
+            i += 1
+        return total
+
+threads = []
+for start in range(0, 400000, 100000):
+    threads.append(thread(Summer(start, start + 100000).run))
+
+total = 0
+for t in threads:
+    total += t.join()
+
+print total                             # 79999800000
+
+# Test a lock protecting a shared counter.
+
+class Counter:
+    def __init__(self):
+        self.lock = lock()
+        self.value = 0
+
+    def run(self):
+        i = 0
+        while i < 10000:
+            self.lock.acquire()
+            self.value += 1
+            self.lock.release()
+            i += 1
+
+counter = Counter()
+threads = []
+for i in range(0, 4):
+    threads.append(thread(counter.run))
+for t in threads:
+    t.join()
+
+print counter.value                     # 40000
+
+l = lock()
+print l.acquire()                       # True
+print l.acquire(False)                  # False
+l.release()
+
+# Test a condition passing values between threads.
+
+class Queue:
+    def __init__(self):
+        self.items = []
+        self.next = 0
+        self.cond = condition()
+
+    def put(self, item):
+        self.cond.acquire()
+        self.items.append(item)
+        self.cond.notify()
+        self.cond.release()
+
+    def get(self):
+        self.cond.acquire()
+        while self.next == len(self.items):
+            self.cond.wait()
+        item = self.take()
+        self.cond.release()
+        return item
+
+    def take(self):
+        item = self.items[self.next]
+        self.next += 1
+        return item
+
+queue = Queue()
+
+def consume():
+    total = 0
+    item = queue.get()
+    while item is not None:
+        total += item
+        item = queue.get()
+    return total
+
+consumer = thread(consume)
+for i in range(1, 101):
+    queue.put(i)
+queue.put(None)
+print consumer.join()                   # 5050
+
+# Test the propagation of exceptions.
+
+def fail():
+    raise ValueError(123)
+
+t = thread(fail)
+try:
+    t.join()
+except ValueError, exc:
+    print "Thread raised:", exc.value   # Thread raised: 123
@@ -206,6 +206,25 @@ print len(u[:2])                    # 2
 print u[-1::-1]                     # 
 print len(u[-1::-1])                # 3
 
+# Test character access in longer strings.
+
+ul = unicode(b"" * 50, "ISO-8859-15")
+print len(ul)                       # 150
+print ul[64]                        # 
+print ul[-1]                        # 
+print ul[60:70:3]                   # 
+print ul[149:0:-70]                 # 
+print len(ul[10:140])               # 130
+
+# Test character access in ASCII text.
+
+ua = unicode("hello", "ISO-8859-15")
+print ua[1]                         # e
+print ua[1:4]                       # ell
+print ua[::-1]                      # olleh
+print ua.replace(u"", u"-")         # -h-e-l-l-o-
+print ua.replace(u"", u"-", 2)      # -h-ello
+
 # Test character values.
 
 print ord(u[0])                     # 230
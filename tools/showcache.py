@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+"""
+Show the contents of module cache files in a textual form.
+
+Copyright (C) 2017 Paul Boddie <paul@boddie.org.uk>
+
+This program is free software; you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation; either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+details.
+
+You should have received a copy of the GNU General Public License along with
+this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from os.path import abspath, exists, join, split
+import sys
+
+# Find the modules.
+
+try:
+    import modules
+except ImportError:
+    parent = abspath(split(split(__file__)[0])[0])
+    if exists(join(parent, "lplc")):
+        sys.path.append(parent)
+
+from importer import Importer
+from modules import CacheWritingModule, CachedModule
+
+class ShownModule(CachedModule, CacheWritingModule):
+
+    "A cached module that can be shown in a textual form."
+
+    pass
+
+if len(sys.argv) < 2:
+    print >>sys.stderr, "Usage: %s <cache file>..." % sys.argv[0]
+    sys.exit(1)
+
+for filename in sys.argv[1:]:
+    if not exists(filename):
+        print >>sys.stderr, "File %s does not exist." % filename
+        sys.exit(1)
+
+    module_name = split(filename)[-1]
+    module = ShownModule(module_name, Importer([]))
+    module.from_cache(filename)
+    module.to_text(sys.stdout)
+
+# vim: tabstop=4 expandtab shiftwidth=4
@@ -20,15 +20,17 @@ this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from common import AccessLocation, CommonModule, CommonOutput, Location, \
-                   first, get_builtin_class, init_item, is_newer, \
-                   predefined_constants
+                   UpdatedFile, first, get_builtin_class, init_item, \
+                   is_newer, predefined_constants
 from encoders import encode_access_instruction, encode_access_instruction_arg, \
                      encode_function_pointer, encode_literal_instantiator, \
                      encode_instantiator_pointer, encode_path, encode_symbol, \
                      encode_type_attribute, is_type_attribute, \
                      type_ops, typename_ops
-from errors import InspectError, TranslateError
-from os.path import exists, join
+from errors import InspectError, ProcessingError, ProgramError, \
+                   TranslateError
+from multiprocessing import Pool
+from os.path import exists, getsize, join
 from os import makedirs
 from referencing import Reference, combine_types
 from results import Result
@@ -52,9 +54,14 @@ class Translator(CommonOutput):
         self.optimiser = optimiser
         self.output = output
 
-    def to_output(self, reset=False, debug=False, gc_sections=False):
+    def to_output(self, reset=False, debug=False, gc_sections=False, lto=False,
+                  pgo=False, compact_tables=False, processes=1):
 
-        "Write a program to the configured output directory."
+        """
+        Write a program to the configured output directory, using the given
+        number of 'processes' to translate modules concurrently if more than
+        one is indicated.
+        """
 
         # Make a directory for the final sources.
 
@@ -65,7 +72,12 @@ class Translator(CommonOutput):
 
         # Clean the output directory of irrelevant data.
 
-        self.check_output("debug=%r gc_sections=%r" % (debug, gc_sections))
+        self.check_output("debug=%r gc_sections=%r lto=%r pgo=%r compact_tables=%r" % (
+                          debug, gc_sections, lto, pgo, compact_tables))
+
+        # Identify the modules needing translation.
+
+        modules = []
 
         for module in self.importer.modules.values():
             output_filename = join(output, "%s.c" % module.name)
@@ -78,8 +90,88 @@ class Translator(CommonOutput):
             if parts[0] != "native" and \
                (reset or is_newer(module.filename, output_filename)):
 
-                tm = TranslatedModule(module.name, self.importer, self.deducer, self.optimiser)
-                tm.translate(module.filename, output_filename)
+                modules.append((module.name, module.filename, output_filename))
+
+        # Obtain deductions for any modules not deduced for this program.
+
+        self.deducer.deduce_modules([name for (name, filename, output_filename) in modules])
+
+        # Translate the modules in this process or in a pool of processes.
+
+        if processes > 1 and len(modules) > 1:
+            self.translate_modules_in_pool(modules, processes)
+        else:
+            for details in modules:
+                self.translate_module(*details)
+
+    def translate_module(self, name, filename, output_filename):
+
+        """
+        Translate the module with the given 'name' and source 'filename',
+        writing the translation to 'output_filename'.
+        """
+
+        tm = TranslatedModule(name, self.importer, self.deducer, self.optimiser)
+        tm.translate(filename, output_filename)
+
+    def translate_modules_in_pool(self, modules, processes):
+
+        """
+        Translate the given 'modules', each described by a tuple of the form
+        accepted by the translate_module method, using a pool of the given
+        number of 'processes'.
+
+        The worker processes are forked from this process and thus inherit the
+        importer, deducer and optimiser details as they are, only reading them
+        and writing a separate output file for each module. Consequently, the
+        output is the same as that produced by translating the modules in this
+        process.
+        """
+
+        global _translator
+
+        _translator = self
+        pool = Pool(min(processes, len(modules)))
+
+        try:
+            # Start with the largest modules so that they do not delay the
+            # completion of the pool.
+
+            modules = modules[:]
+            modules.sort(key=lambda details: getsize(details[1]), reverse=True)
+
+            # Report the first error produced by any of the processes. Errors
+            # are returned as messages since they may not be transferable
+            # between processes in their original form.
+
+            for error in pool.imap_unordered(_translate_module, modules):
+                if error:
+                    raise ProgramError(error)
+
+            pool.close()
+
+        finally:
+            pool.terminate()
+            pool.join()
+            _translator = None
+
+# The translator used by pool processes.
+
+_translator = None
+
+def _translate_module(details):
+
+    """
+    Translate the module with the given 'details' in a pool process, returning
+    any error message or None if the translation succeeded.
+    """
+
+    try:
+        _translator.translate_module(*details)
+    except ProcessingError, exc:
+        return str(exc)
+    else:
+        return None
 
 
 
@@ -156,7 +248,7 @@ class TranslatedModule(CommonModule):
 
         self.reset_lambdas()
 
-        self.out_toplevel = self.out = open(output_filename, "w")
+        self.out_toplevel = self.out = UpdatedFile(output_filename)
         try:
             self.start_output()
 
@@ -169,6 +261,9 @@ class TranslatedModule(CommonModule):
 
             self.process_namespace([], self.astnode)
 
+        except:
+            self.out.discard()
+            raise
         finally:
             self.out.close()
 
@@ -1212,6 +1307,14 @@ class TranslatedModule(CommonModule):
                                 num_parameters = first(max_params)
                                 num_defaults = first(max_params) - first(min_params)
 
+                            # Where all arguments are given for all targets, no
+                            # defaults are needed and the targets can be called
+                            # directly even if their defaults differ.
+
+                            elif len(max_params) == 1 and first(max_params) == len(n.args):
+                                num_parameters = len(n.args)
+                                num_defaults = 0
+
             # Some information about the target may be available and be used to
             # provide warnings about argument compatibility.
 